@@ -0,0 +1,54 @@
+import argparse
+import os
+
+import scripts.balance as bl
+import scripts.logs as lg
+
+
+# tune ai multipliers and stats of the catalog towards target win rates and move usage (see balance.py in scripts)
+# a run directory that already has a sweep in it is resumed with it's own settings
+def main():
+    parser = argparse.ArgumentParser(description="Search ai multipliers and stats for balanced AI vs AI matches.")
+    parser.add_argument("run_dir", type=str, help="directory of the sweep's checkpoint, results and catalogs")
+    parser.add_argument("--param", type=str, nargs="+", default=None, metavar="SPEC",
+                        help="multiplier:CREATURE:MOVE, creature:CREATURE:FIELD, move:MOVE:FIELD or "
+                             "status:STATUS:FIELD (the catalog's ai multipliers for all opponents by default)")
+    parser.add_argument("--catalog", type=str, default=None, help="catalog to start from (the game's by default)")
+    parser.add_argument("--creatures", type=int, nargs="+", default=None,
+                        help="creature indices, every pair of them is a matchup (all creatures by default)")
+    parser.add_argument("-n", "--matches", type=int, default=1000, help="matches of every matchup per candidate")
+    parser.add_argument("--ai", type=int, default=5, help="ai level of both players (0-10)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match of every matchup")
+    parser.add_argument("--win-rate", type=float, default=0.5, help="target win rate of every matchup")
+    parser.add_argument("--usage", type=str, nargs="+", default=[], metavar="MOVE=SHARE",
+                        help="target share of a move among all moves of creatures that have it")
+    parser.add_argument("--even-usage", action="store_true", help="aim for every creature using it's moves equally")
+    parser.add_argument("--usage-weight", type=float, default=1.0, help="weight of move usage against win rates")
+    parser.add_argument("--max-evaluations", type=int, default=None,
+                        help="stop once this many more candidates are played, checked after every step "
+                             "(until converged by default)")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (all cores by default)")
+    lg.add_arguments(parser)
+    args = parser.parse_args()
+    lg.configure(args)
+
+    usage = {}
+    for target in args.usage:
+        name, _, share = target.rpartition("=")
+        usage[name] = float(share)
+
+    settings = bl.SweepSettings(args.catalog, args.param, args.creatures, args.matches, args.ai, args.seed,
+                                win_rate=args.win_rate, usage=usage, even_usage=args.even_usage,
+                                usage_weight=args.usage_weight)
+    if os.path.exists(os.path.join(args.run_dir, "checkpoint.json")):
+        print(f"RESUMING THE SWEEP IN {args.run_dir} WITH IT'S OWN SETTINGS")
+    sweep = bl.BalanceSweep(args.run_dir, settings, args.workers)
+    try:
+        sweep.__run__(args.max_evaluations)
+    except KeyboardInterrupt:
+        print(f"INTERRUPTED, python balance.py {args.run_dir} resumes the sweep")
+        return
+    print(sweep.__report__())
+
+if __name__ == "__main__":
+    main()
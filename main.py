@@ -1,8 +1,25 @@
-import scripts.gui as g
+import argparse
+
+import scripts.logs as lg
+import scripts.startup as st
+# import scripts.gui as g #imported after the arguments, --help doesn't need pygame
 
 def main():
+    parser = argparse.ArgumentParser(description="Python Creature Arena")
+    parser.add_argument("--record", type=str, default=None, help="append every finished battle to this replay file")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="time every import and phase of starting the game, printed once the menu is up")
+    parser.add_argument("--startup-budget", type=float, default=st.budget, metavar="SECONDS",
+                        help="warn if the menu takes longer than this to show up (default %(default)s)")
+    lg.add_arguments(parser)
+    args = parser.parse_args()
+    lg.configure(args)
+    startup = st.StartupProfile(args.profile_startup, args.startup_budget)
 
-    gui = g.GUI()
+    import scripts.gui as g
+    startup.__mark__("imports")
+    gui = g.GUI(startup)
+    gui.replay_path = args.record
     while gui.running:
         gui.current_scene.__displayScene__()
 
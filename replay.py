@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import scripts.logs as lg
+import scripts.player as pl
+import scripts.recording as rec
+
+
+# list, check or watch matches of a replay file (recorded with simulate.py --record or main.py --record)
+def main():
+    parser = argparse.ArgumentParser(description="List, check or watch recorded matches.")
+    parser.add_argument("file", type=str, help="replay file")
+    parser.add_argument("--verify", action="store_true",
+                        help="play every match again without GUI and check it against the record")
+    parser.add_argument("--watch", type=int, default=None, metavar="INDEX", help="watch a match in the game window")
+    parser.add_argument("--catalog", type=str, default=None,
+                        help="catalog the matches were played with (simulate.py --catalog)")
+    lg.add_arguments(parser)
+    args = parser.parse_args()
+    lg.configure(args)
+    pl.use_catalog(args.catalog)
+
+    replays = rec.ReplayFile(args.file)
+
+    if args.watch is not None:
+        import scripts.gui as g  # only watching needs a window
+
+        record = replays.__getMatch__(args.watch)
+        gui = g.GUI()
+        p1, p2 = rec.build_players(record)
+        g.BattleScene(gui, p1, p2, False, record.seed, record)
+        gui.current_scene = gui.main_menu
+        while gui.running:
+            gui.current_scene.__displayScene__()
+        return
+
+    if args.verify:
+        start = time.perf_counter()
+        matches = 0
+        for record in replays:
+            engine = rec.replay_match(record)
+            if engine.__winner__() != record.winner:
+                raise ValueError(f"replay of seed {record.seed} has a different winner than the record")
+            matches += 1
+        print(f"{matches} matches replayed as recorded in {time.perf_counter() - start:.2f}s")
+        return
+
+    for i, (offset, seed, ai, winner, turns) in enumerate(replays.__scan__()):
+        print(f"{i}: seed {seed}, ai {ai[0]} vs {ai[1]}, {turns} turns, "
+              f"{'draw' if winner == 0 else f'player {winner} wins'}")
+
+if __name__ == "__main__":
+    main()
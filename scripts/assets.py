@@ -0,0 +1,187 @@
+import queue
+import threading
+from collections import OrderedDict
+from time import perf_counter
+
+import pygame
+
+import scripts.spritesheet as ss
+
+
+# decodes image files (and parses json of sprite sheets) in a thread of it's own, ahead of time, i.e. while menus are up
+# decoded images are handed over to the main thread to be converted for the display (see AssetStore.__convertLoaded__)
+# paths are keys of the store (see spritesheet.path_key)
+class AssetLoader:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.requested = set()  # every path asked for, so nothing is decoded twice
+        self.outstanding = set()  # paths not handed over yet
+        self.decoded = {}  # (image, sprite sheet data or None) by path, waiting to be handed over
+        self.thread = None
+
+    # queue files to decode, the thread is started with the first ones
+    def __request__(self, paths: list[str, ...]):
+        with self.lock:
+            for path in paths:
+                if path not in self.requested:
+                    self.requested.add(path)
+                    self.outstanding.add(path)
+                    self.queue.put(path)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.__run__, name="asset loader", daemon=True)
+            self.thread.start()
+
+    def __run__(self):
+        while True:
+            path = self.queue.get()
+            with self.lock:
+                # the main thread took it before it's turn came and loaded the file itself
+                taken = path not in self.outstanding
+            if not taken:
+                try:
+                    image = pygame.image.load(path)
+                    data = ss.load_data(path) if path.endswith("_sprite.png") else None
+                except (pygame.error, OSError, ValueError):
+                    # the main thread will try again and fail the usual way
+                    image, data = None, None
+                with self.lock:
+                    # a file taken while it was being decoded is loaded already, this copy would never be used
+                    if path in self.outstanding:
+                        self.decoded[path] = (image, data)
+            self.queue.task_done()
+
+    # decoded image and data of path, if the thread is done with it
+    # otherwise the caller loads the file itself and the thread skips it
+    def __take__(self, path: str) -> (pygame.Surface, dict):
+        with self.lock:
+            self.outstanding.discard(path)
+            return self.decoded.pop(path, (None, None))
+
+    # path, image and data of any decoded file, None if there's none
+    def __takeAny__(self) -> (str, pygame.Surface, dict):
+        with self.lock:
+            if len(self.decoded) == 0:
+                return None
+            path, (image, data) = self.decoded.popitem()
+            self.outstanding.discard(path)
+            return path, image, data
+
+    # (files handed over, files requested)
+    def __progress__(self) -> (int, int):
+        with self.lock:
+            return len(self.requested) - len(self.outstanding), len(self.requested)
+
+
+# process-wide cache of images - every file is decoded only once and every scaled (and flipped) variant
+# is made only once, so turns, creature swaps and resizes don't load the same art again and again
+# scaled variants are kept by (path, size, flip), sprite frames are kept in banks of the sprite atlas
+# max_bytes is an optional memory budget for scaled variants, least recently used are evicted when over it
+# files can be decoded ahead of time by the loader (see __preload__)
+class AssetStore:
+    def __init__(self, max_bytes: int = None):
+        self.images = {}  # decoded images by path
+        self.atlas = ss.SpriteAtlas()
+        self.loader = AssetLoader()
+        self.scaled = OrderedDict()
+        self.scaled_bytes = 0
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # decode image once, converted for fast blitting when there's a display to convert to
+    # image is the file decoded already, if it's at hand
+    def __loadImage__(self, path: str, image: pygame.Surface = None) -> pygame.Surface:
+        path = ss.path_key(path)
+        loaded = self.images.get(path)
+        if loaded is None:
+            if image is None:
+                image = self.loader.__take__(path)[0]
+            if image is None:
+                image = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self.images[path] = loaded = image
+        return loaded
+
+    # parse sprite sheet once, image and data are the decoded sheet and it's parsed json if they're at hand
+    def __loadSpriteSheet__(self, path: str, image: pygame.Surface = None, data: dict = None) -> ss.SpriteSheet:
+        path = ss.path_key(path)
+        if path not in self.atlas.sheets and image is None:
+            image, data = self.loader.__take__(path)
+        return self.atlas.__loadSheet__(path, image, data)
+
+    # decode files in the background (sprite sheets are told apart by their _sprite.png ending),
+    # they're converted by __convertLoaded__ later or whenever they're needed, whichever comes first
+    def __preload__(self, paths: list[str, ...]):
+        paths = [ss.path_key(path) for path in paths]
+        self.loader.__request__([path for path in paths if path not in self.images and path not in self.atlas.sheets])
+
+    # convert files decoded by the loader until budget (in seconds) runs out, on the main thread
+    # as converting needs the display
+    def __convertLoaded__(self, budget: float):
+        end = perf_counter() + budget
+        while perf_counter() < end:
+            loaded = self.loader.__takeAny__()
+            if loaded is None:
+                return
+            path, image, data = loaded
+            if image is None:
+                continue
+            if data is not None:
+                self.__loadSpriteSheet__(path, image, data)
+            else:
+                self.__loadImage__(path, image)
+
+    # image scaled to size (original size if None) and flipped horizontally if needed
+    def __getImage__(self, path: str, size: (float, float) = None, flip: bool = False) -> pygame.Surface:
+        path = ss.path_key(path)
+        return self.__getScaled__((path, self.__sizeKey__(size), flip), lambda: self.__loadImage__(path))
+
+    # sprite sheet frame scaled to size (original size if None) and flipped horizontally if needed
+    def __getSprite__(self, path: str, name: str, size: (float, float) = None,
+                      flip: bool = False) -> pygame.Surface:
+        return self.__getSprites__(path, size, flip)[name]
+
+    # all frames of a sprite sheet by name, scaled and flipped like by __getSprite__
+    def __getSprites__(self, path: str, size: (float, float) = None, flip: bool = False) -> dict:
+        self.__loadSpriteSheet__(path)
+        return self.atlas.__getBank__(path, self.__sizeKey__(size), flip)
+
+    # scaling is done to whole pixels anyway
+    @staticmethod
+    def __sizeKey__(size: (float, float)) -> (int, int):
+        if size is None:
+            return None
+        return int(size[0]), int(size[1])
+
+    def __getScaled__(self, key: tuple, get_source) -> pygame.Surface:
+        image = self.scaled.get(key)
+        if image is not None:
+            self.hits += 1
+            self.scaled.move_to_end(key)
+            return image
+
+        self.misses += 1
+        image = get_source()
+        # images already of the size are kept as they are, they're never drawn on
+        if key[1] is not None and key[1] != image.get_size():
+            image = pygame.transform.scale(image, key[1])
+        if key[2]:
+            image = pygame.transform.flip(image, True, False)
+        self.scaled[key] = image
+        self.scaled_bytes += image.get_width() * image.get_height() * image.get_bytesize()
+
+        # evict least recently used variants, but always keep the newest one
+        if self.max_bytes is not None:
+            while self.scaled_bytes > self.max_bytes and len(self.scaled) > 1:
+                old_key, old_image = self.scaled.popitem(last=False)
+                self.scaled_bytes -= old_image.get_width() * old_image.get_height() * old_image.get_bytesize()
+                self.evictions += 1
+
+        return image
+
+
+# shared by all scenes
+store = AssetStore()
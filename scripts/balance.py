@@ -0,0 +1,444 @@
+import concurrent.futures
+import copy
+import hashlib
+import json
+import os
+import time
+
+import scripts.catalog as ca
+import scripts.simulation as sim
+
+
+# balance sweeps - automatic tuning of ai multipliers and stats of a catalog (see catalog.py) towards target win rates
+# and move usage, instead of watching matches and changing them by hand
+# every candidate is a variant catalog played by ai vs ai in every matchup of the sweep's creatures, all with the same
+# seeds, so two candidates differ only by their values and not by luck - that's why only ai levels 0-10 can be used,
+# levels 11-15 search until a clock runs out and would play differently whenever the machine is busier
+# the values are searched by coordinate descent - each parameter in turn is moved a step up and down,
+# the better value is kept, a step that doesn't help is halved, until every step is below it's minimum
+#
+# a sweep lives in a run directory:
+#   checkpoint.json - settings and the state of the search, written after every step, so a run can be resumed
+#   results.jsonl - every evaluated candidate as a json line, written the moment it's done,
+#                   candidates already there aren't played again (i.e. after resuming)
+#   candidates/ - catalogs of the candidates, best.json - catalog of the best candidate so far
+CHECKPOINT_VERSION = 1
+
+# fields that can be swept by kind of parameter, with the lowest value they can have (None for no limit)
+int_fields = {
+    "creature": {"health": 1, "defense": None, "rage": 0},
+    "move": {"speed": None, "damage_low": None, "damage_high": None, "aim": 0, "hit_attempts": 1,
+             "status_chance": 0, "cooldown": 0, "rage_cost": 0},
+    "status": {"damage_low": None, "damage_high": None, "aim_mod": None, "defense_mod": None, "damage_mod": None,
+               "status_duration": None, "stun_duration": None, "thorn_damage_low": None, "thorn_damage_high": None},
+}
+multiplier_bounds = (0.05, 5.0)
+
+
+# one swept value of the catalog, given as a spec:
+#   multiplier:CREATURE:MOVE - ai multiplier of creature's move against all opponents
+#   creature:CREATURE:FIELD, move:MOVE:FIELD, status:STATUS EFFECT:FIELD - a stat (see int_fields)
+class Parameter:
+    def __init__(self, spec: str, data: dict):
+        self.spec = spec
+        parts = spec.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"parameter {spec!r} is not KIND:NAME:FIELD")
+        self.kind, self.name, self.field = parts
+
+        if self.kind == "multiplier":
+            creature = self.__findCreature__(data)
+            moves = creature["moves"] + list(ca.required_moves) + [creature["rage_move"]]
+            if self.field not in moves:
+                raise ValueError(f"parameter {spec!r}: {self.name} doesn't have move {self.field!r}")
+            self.is_int = False
+            self.low, self.high = multiplier_bounds
+            rule = self.__findRule__(data)
+            self.value = float(rule["multiplier"]) if rule is not None else 1.0
+            self.step = 0.2
+            self.min_step = 0.025
+            return
+
+        if self.kind not in int_fields or self.field not in int_fields[self.kind]:
+            raise ValueError(f"parameter {spec!r} can't be swept")
+        self.is_int = True
+        self.low, self.high = int_fields[self.kind][self.field], None
+        self.value = self.__entry__(data)[self.field]
+        self.step = max(2.0, round(abs(self.value) * 0.25))
+        self.min_step = 1.0
+
+    def __findCreature__(self, data: dict) -> dict:
+        for creature in data["creatures"]:
+            if creature["name"] == self.name:
+                return creature
+        raise ValueError(f"parameter {self.spec!r}: unknown creature {self.name!r}")
+
+    # the multiplier rule for all opponents, None if there isn't one
+    def __findRule__(self, data: dict) -> dict:
+        for rule in data["ai_multipliers"]:
+            if rule["creature"] == self.name and rule["move"] == self.field and rule.get("opponent") is None:
+                return rule
+        return None
+
+    def __entry__(self, data: dict) -> dict:
+        if self.kind == "creature":
+            return self.__findCreature__(data)
+        section = data["moves"] if self.kind == "move" else data["status_effects"]
+        if self.name not in section:
+            raise ValueError(f"parameter {self.spec!r}: unknown {self.kind} {self.name!r}")
+        return section[self.name]
+
+    # value moved by delta, None if it's out of bounds or doesn't change
+    def __moved__(self, value, delta: float):
+        moved = round(value + delta) if self.is_int else round(value + delta, 4)
+        if moved == value or (self.low is not None and moved < self.low) or (self.high is not None and moved > self.high):
+            return None
+        return moved
+
+    # set value in a catalog (as read from json)
+    def __apply__(self, data: dict, value):
+        if self.kind != "multiplier":
+            self.__entry__(data)[self.field] = value
+            return
+        rule = self.__findRule__(data)
+        if rule is not None:
+            rule["multiplier"] = value
+        else:
+            # before the other rules, so rules for single opponents still override it
+            data["ai_multipliers"].insert(0, {"creature": self.name, "move": self.field, "multiplier": value,
+                                              "note": "added by a balance sweep"})
+
+
+# what a sweep plays and what it aims for
+# matchups are every pair of creatures (by index), each played matches times by ai level ai (0-10)
+# win_rate is the target win rate of every matchup (draws count as half a win), usage are target shares of moves
+# (MOVE NAME: share of all moves made by creatures with that move), even_usage aims for the regular moves
+# of every creature being used equally, usage_weight is the weight of usage against win rates
+class SweepSettings:
+    def __init__(self, catalog_path: str = None, parameters: list[str, ...] = None, creatures: list[int, ...] = None,
+                 matches: int = 1000, ai: int = 5, seed: int = 0, chunk_size: int = 50, win_rate: float = 0.5,
+                 usage: dict = None, even_usage: bool = False, usage_weight: float = 1.0):
+        if not 0 <= ai <= 10:
+            raise ValueError(f"a sweep needs an ai level of 0-10, not {ai} (levels 11-15 depend on timing)")
+        self.catalog_path = os.path.abspath(catalog_path if catalog_path is not None else ca.default_path)
+        self.parameters = parameters
+        self.creatures = creatures
+        self.matches = matches
+        self.ai = ai
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.win_rate = win_rate
+        self.usage = usage if usage is not None else {}
+        self.even_usage = even_usage
+        self.usage_weight = usage_weight
+
+    def __toJson__(self) -> dict:
+        return dict(vars(self))
+
+    @staticmethod
+    def __fromJson__(data: dict):
+        return SweepSettings(**data)
+
+
+# results of one candidate, as written to results.jsonl
+class Evaluation:
+    def __init__(self, key: str, values: list, loss: float, win_rates: dict, usage: dict, matches: int,
+                 seconds: float):
+        self.key = key
+        self.values = values
+        self.loss = loss
+        self.win_rates = win_rates  # "FRAGONIRE VS SCHONIPS": win rate of the first one
+        self.usage = usage  # move name: share
+        self.matches = matches
+        self.seconds = seconds
+
+    def __toJson__(self) -> dict:
+        return dict(vars(self))
+
+    @staticmethod
+    def __fromJson__(data: dict):
+        return Evaluation(**data)
+
+
+# matches of one candidate, collected chunk by chunk as workers finish them
+class PendingCandidate:
+    def __init__(self, key: str, values: list, catalog_path: str, matchups: list[(int, int), ...], jobs: int):
+        self.key = key
+        self.values = values
+        self.catalog_path = catalog_path
+        self.results = {matchup: sim.SimulationResult() for matchup in matchups}
+        self.jobs_left = jobs
+        self.start = time.perf_counter()
+
+
+class BalanceSweep:
+    def __init__(self, run_dir: str, settings: SweepSettings = None, workers: int = None):
+        self.run_dir = run_dir
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        checkpoint = self.__readCheckpoint__()
+        if checkpoint is not None:
+            # a resumed sweep keeps it's settings, or it wouldn't be the same search
+            self.settings = SweepSettings.__fromJson__(checkpoint["settings"])
+        elif settings is not None:
+            self.settings = settings
+        else:
+            raise ValueError(f"{run_dir} has no sweep to resume")
+
+        with open(self.settings.catalog_path, "rb") as f:
+            self.base = ca.validate(json.loads(f.read()), self.settings.catalog_path)
+        if self.settings.parameters is None:
+            # the hand-tuned multipliers, if nothing else is asked for
+            self.settings.parameters = [f"multiplier:{rule['creature']}:{rule['move']}"
+                                        for rule in self.base["ai_multipliers"] if rule["opponent"] is None]
+        if not self.settings.parameters:
+            raise ValueError("a sweep needs at least one parameter")
+        self.parameters = [Parameter(spec, self.base) for spec in self.settings.parameters]
+        if self.settings.creatures is None:
+            self.settings.creatures = list(range(0, len(self.base["creatures"])))
+        names = [c["name"] for c in self.base["creatures"]]
+        for index in self.settings.creatures:
+            if not 0 <= index < len(names):
+                raise ValueError(f"there is no creature {index} in the catalog")
+        self.names = names
+        self.matchups = [(a, b) for i, a in enumerate(self.settings.creatures) for b in self.settings.creatures[i + 1:]]
+        if not self.matchups:
+            raise ValueError("a sweep needs at least two creatures")
+        for name in self.settings.usage:
+            if name not in self.base["moves"]:
+                raise ValueError(f"usage target of an unknown move {name!r}")
+
+        # state of the search
+        self.values = [p.value for p in self.parameters]
+        self.steps = [p.step for p in self.parameters]
+        self.index = 0
+        self.best = None  # best Evaluation
+        self.played = 0  # candidates played since the sweep was started or resumed
+        if checkpoint is not None:
+            self.values = checkpoint["values"]
+            self.steps = checkpoint["steps"]
+            self.index = checkpoint["index"]
+
+        os.makedirs(os.path.join(self.run_dir, "candidates"), exist_ok=True)
+        # evaluated candidates by key
+        self.known = self.__readResults__()
+        if checkpoint is not None and checkpoint["best"] in self.known:
+            self.best = self.known[checkpoint["best"]]
+
+    def __path__(self, name: str) -> str:
+        return os.path.join(self.run_dir, name)
+
+    def __readCheckpoint__(self) -> dict:
+        try:
+            with open(self.__path__("checkpoint.json")) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{self.run_dir} is a sweep of another version")
+        return checkpoint
+
+    # written to a temporary file first, a checkpoint is never half written
+    def __writeCheckpoint__(self):
+        checkpoint = {"version": CHECKPOINT_VERSION, "settings": self.settings.__toJson__(), "values": self.values,
+                      "steps": self.steps, "index": self.index,
+                      "best": self.best.key if self.best is not None else None}
+        temporary = self.__path__("checkpoint.json.tmp")
+        with open(temporary, "w") as f:
+            json.dump(checkpoint, f, indent=4)
+        os.replace(temporary, self.__path__("checkpoint.json"))
+
+    # a line cut off by a crash is dropped, it's candidate is played again
+    def __readResults__(self) -> dict:
+        known = {}
+        try:
+            with open(self.__path__("results.jsonl"), "r+b") as f:
+                content = f.read()
+                # so the next result starts on a line of it's own, instead of being glued to the cut off one
+                end = content.rfind(b"\n") + 1
+                if end < len(content):
+                    f.truncate(end)
+        except FileNotFoundError:
+            return known
+
+        for line in content[:end].splitlines():
+            try:
+                evaluation = Evaluation.__fromJson__(json.loads(line))
+            except (ValueError, TypeError):
+                continue
+            known[evaluation.key] = evaluation
+        return known
+
+    def __writeResult__(self, evaluation: Evaluation):
+        with open(self.__path__("results.jsonl"), "a") as f:
+            f.write(json.dumps(evaluation.__toJson__()) + "\n")
+
+    @staticmethod
+    def __key__(values: list) -> str:
+        return hashlib.sha256(json.dumps(values).encode()).hexdigest()[:16]
+
+    # catalog with values, None if it doesn't pass the checks (i.e. damage_low over damage_high)
+    def __catalog__(self, values: list) -> dict:
+        data = copy.deepcopy(self.base)
+        for parameter, value in zip(self.parameters, values):
+            parameter.__apply__(data, value)
+        try:
+            ca.validate(data, "candidate")
+        except ValueError:
+            return None
+        return data
+
+    def __writeCatalog__(self, data: dict, path: str):
+        temporary = path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temporary, path)
+
+    # play every candidate (lists of values) not known yet, all of them at once on all workers
+    # returns evaluations of the candidates, None for the ones that don't make a valid catalog
+    def __evaluate__(self, candidates: list[list, ...], executor) -> list[Evaluation, ...]:
+        pending = {}
+        for values in candidates:
+            key = self.__key__(values)
+            if key in self.known or key in pending:
+                continue
+            data = self.__catalog__(values)
+            if data is None:
+                continue
+            path = self.__path__(os.path.join("candidates", key + ".json"))
+            self.__writeCatalog__(data, path)
+            chunks = range(0, self.settings.matches, self.settings.chunk_size)
+            pending[key] = PendingCandidate(key, values, path, self.matchups, len(chunks) * len(self.matchups))
+
+        jobs = []
+        for candidate in pending.values():
+            for matchup in self.matchups:
+                for first in range(0, self.settings.matches, self.settings.chunk_size):
+                    n = min(self.settings.chunk_size, self.settings.matches - first)
+                    jobs.append((candidate, matchup, (self.settings.seed + first, n, [matchup[0]], [matchup[1]],
+                                                      self.settings.ai, self.settings.ai, None, None, False,
+                                                      candidate.catalog_path)))
+
+        def collect(candidate: PendingCandidate, matchup: (int, int), result: sim.SimulationResult):
+            candidate.results[matchup].__merge__(result)
+            candidate.jobs_left -= 1
+            if candidate.jobs_left == 0:
+                evaluation = self.__score__(candidate)
+                self.known[candidate.key] = evaluation
+                self.played += 1
+                self.__writeResult__(evaluation)
+                print(f"EVALUATION {len(self.known)}: LOSS {evaluation.loss:.5f} "
+                      f"({self.__describe__(candidate.values)}) IN {evaluation.seconds:.1f}s", flush=True)
+
+        if executor is None:
+            for candidate, matchup, args in jobs:
+                collect(candidate, matchup, sim.simulate_chunk(*args))
+        else:
+            futures = {executor.submit(sim.simulate_chunk, *args): (candidate, matchup)
+                       for candidate, matchup, args in jobs}
+            for future in concurrent.futures.as_completed(futures):
+                collect(*futures[future], future.result())
+
+        return [self.known.get(self.__key__(values)) for values in candidates]
+
+    # the loss of a candidate - mean squared error of matchup win rates, plus usage_weight times
+    # mean squared error of move usage shares
+    def __score__(self, candidate: PendingCandidate) -> Evaluation:
+        win_rates = {}
+        counts = {}  # move name: times used
+        creature_moves = [0] * len(self.names)  # moves made by each creature
+        creature_usage = [{} for c in self.names]
+        matches = 0
+        for (a, b), result in candidate.results.items():
+            matches += result.matches
+            win_rates[f"{self.names[a]} VS {self.names[b]}"] = (result.wins[1] + result.wins[0] / 2) / result.matches
+            for creature, usage in ((a, result.move_usage[0]), (b, result.move_usage[1])):
+                for name, count in usage.items():
+                    counts[name] = counts.get(name, 0) + count
+                    creature_usage[creature][name] = creature_usage[creature].get(name, 0) + count
+                    creature_moves[creature] += count
+
+        # a move's share is of all moves of creatures that have it (the health kit is everyone's)
+        usage = {}
+        for name, count in counts.items():
+            total = sum(creature_moves[c] for c in range(0, len(self.names)) if name in creature_usage[c])
+            usage[name] = count / total
+
+        errors = [(rate - self.settings.win_rate) ** 2 for rate in win_rates.values()]
+        loss = sum(errors) / len(errors)
+
+        usage_errors = [(usage.get(name, 0) - share) ** 2 for name, share in self.settings.usage.items()]
+        if self.settings.even_usage:
+            for c in self.settings.creatures:
+                creature = self.base["creatures"][c]
+                shares = [creature_usage[c].get(name, 0) / max(1, creature_moves[c]) for name in creature["moves"]]
+                mean = sum(shares) / len(shares)
+                usage_errors += [(share - mean) ** 2 for share in shares]
+        if usage_errors:
+            loss += self.settings.usage_weight * sum(usage_errors) / len(usage_errors)
+
+        return Evaluation(candidate.key, candidate.values, loss, win_rates, usage, matches,
+                          time.perf_counter() - candidate.start)
+
+    def __describe__(self, values: list) -> str:
+        return ", ".join(f"{p.spec}={value}" for p, value in zip(self.parameters, values))
+
+    def __isDone__(self) -> bool:
+        return all(step < p.min_step for p, step in zip(self.parameters, self.steps))
+
+    # a candidate better than the best one so far becomes the best one, it's catalog is copied to best.json
+    def __consider__(self, evaluation: Evaluation) -> bool:
+        if evaluation is None or (self.best is not None and evaluation.loss >= self.best.loss):
+            return False
+        self.best = evaluation
+        self.__writeCatalog__(self.__catalog__(evaluation.values), self.__path__("best.json"))
+        return True
+
+    # search until every step is below it's minimum or max_evaluations more candidates have been played
+    def __run__(self, max_evaluations: int = None) -> Evaluation:
+        executor = None
+        if self.workers > 1:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            if self.best is None:
+                self.__consider__(self.__evaluate__([self.values], executor)[0])
+                if self.best is None:
+                    raise ValueError("the starting catalog of the sweep doesn't pass the checks")
+                self.__writeCheckpoint__()
+
+            while not self.__isDone__() and (max_evaluations is None or self.played < max_evaluations):
+                i = self.index
+                p = self.parameters[i]
+                if self.steps[i] >= p.min_step:
+                    candidates = []
+                    for direction in (1, -1):
+                        moved = p.__moved__(self.values[i], direction * self.steps[i])
+                        if moved is not None:
+                            candidates.append(self.values[:i] + [moved] + self.values[i + 1:])
+                    improved = False
+                    for evaluation in self.__evaluate__(candidates, executor):
+                        improved = self.__consider__(evaluation) or improved
+                    if improved:
+                        self.values = list(self.best.values)
+                    else:
+                        self.steps[i] /= 2
+                self.index = (i + 1) % len(self.parameters)
+                self.__writeCheckpoint__()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return self.best
+
+    def __report__(self) -> str:
+        lines = [f"BEST LOSS: {self.best.loss:.5f} AFTER {len(self.known)} CANDIDATES"
+                 f"{' (CONVERGED)' if self.__isDone__() else ''}"]
+        for p, value in zip(self.parameters, self.best.values):
+            lines.append(f"    {p.spec}: {p.value} -> {value}")
+        lines.append("WIN RATES:")
+        for matchup, rate in self.best.win_rates.items():
+            lines.append(f"    {matchup}: {rate:.3f}")
+        lines.append("MOVE USAGE:")
+        for name, share in sorted(self.best.usage.items(), key=lambda item: -item[1]):
+            lines.append(f"    {name}: {share:.3f}")
+        lines.append(f"CATALOG: {self.__path__('best.json')}")
+        return "\n".join(lines)
@@ -0,0 +1,257 @@
+import hashlib
+import os
+import pickle
+# import json, tempfile #imported when a catalog is built, loading a cache doesn't need them
+
+
+# catalogs - the content of the game (types, status effects, moves, creatures and ai multipliers) declared in a json file,
+# checked here and built into objects by creatures.build_catalog
+# a built catalog is pickled to a cache in __pycache__ next to the catalog file, later loads unpickle the cache
+# as long as it's digest matches - a hash of the catalog and of the code building it, so editing either rebuilds it
+#
+# cache:  magic b"PCAC", sha256 digest (32 bytes), pickled catalog
+default_path = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets", "data", "catalog.json"))
+MAGIC = b"PCAC"
+
+# fields of entries in each section - name: (allowed json types, default), fields without a default are required
+required = object()
+type_fields = {
+    "color": (list, required),
+    # some types cannot extinguish, even though they may have types that are weak against it
+    "extinguisher": (bool, True),
+    "weaknesses": (list, []),
+    "resistances": (list, []),
+    "immunities": (list, []),
+}
+status_effect_fields = {
+    "type": (str, required),
+    "damage_low": (int, 0),
+    "damage_high": (int, 0),
+    "aim_mod": (int, 0),
+    "defense_mod": (int, 0),
+    "damage_mod": (int, 0),
+    "damage_mod_type": ((str, type(None)), None),
+    "status_duration": (int, 0),
+    "stun_duration": (int, -1),
+    "thorn_damage_low": (int, 0),
+    "thorn_damage_high": (int, 0),
+    "extinguish_scoring": (int, 30),
+}
+move_fields = {
+    "type": (str, required),
+    "speed": (int, 3),
+    "target_self": (bool, False),
+    "damage_low": (int, 0),
+    "damage_high": (int, 0),
+    "aim": (int, 90),
+    "hit_attempts": (int, 1),
+    "status_effect": ((str, type(None)), None),
+    "status_chance": (int, 0),
+    "cooldown": (int, 0),
+    "rage_cost": (int, 0),
+}
+creature_fields = {
+    "name": (str, required),
+    "desc": (str, ""),
+    "health": (int, required),
+    "defense": (int, 0),
+    "types": (list, required),
+    "moves": (list, required),
+    "rage": (int, required),
+    "rage_move": (str, required),
+}
+# multiplier of ai's score of creature's move, against one opponent or all of them if opponent is None
+# rules are applied in order, so a later rule for one opponent can override an earlier one for all
+multiplier_fields = {
+    "creature": (str, required),
+    "move": (str, required),
+    "opponent": ((str, type(None)), None),
+    "multiplier": ((int, float), required),
+    "note": (str, ""),
+}
+# entries the game can't do without
+required_moves = ("HEALTH KIT",)
+required_status_effects = ("AI MODIFIER 1", "AI MODIFIER 2")
+
+
+# entry with defaults filled in, where is the entry's place in the catalog for error messages
+def check_fields(entry, fields: dict, where: str) -> dict:
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where} is not an object")
+    for name in entry:
+        if name not in fields:
+            raise ValueError(f"{where} has an unknown field {name!r}")
+
+    checked = {}
+    for name, (json_types, default) in fields.items():
+        if name not in entry:
+            if default is required:
+                raise ValueError(f"{where} is missing {name!r}")
+            checked[name] = list(default) if isinstance(default, list) else default
+            continue
+        value = entry[name]
+        # true and false are ints to python
+        if not isinstance(value, json_types) or (isinstance(value, bool) and json_types is not bool):
+            raise ValueError(f"{where}: {name!r} has a wrong type ({type(value).__name__})")
+        checked[name] = value
+    return checked
+
+
+def check_name(name, names, kind: str, where: str):
+    if not isinstance(name, str) or name not in names:
+        raise ValueError(f"{where}: unknown {kind} {name!r}")
+
+
+def check_range(entry: dict, low: str, high: str, where: str):
+    if entry[low] > entry[high]:
+        raise ValueError(f"{where}: {low!r} is higher than {high!r}")
+
+
+# check the catalog read from path, returns it with every default filled in
+def validate(data, path: str) -> dict:
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} is not a catalog")
+    sections = ("types", "status_effects", "moves", "creatures", "ai_multipliers")
+    for name in data:
+        if name not in sections:
+            raise ValueError(f"{path} has an unknown section {name!r}")
+    for name in sections[:-1]:
+        if name not in data:
+            raise ValueError(f"{path} is missing {name!r}")
+
+    checked = {"types": {}, "status_effects": {}, "moves": {}, "creatures": [], "ai_multipliers": []}
+    for section in ("types", "status_effects", "moves"):
+        if not isinstance(data[section], dict):
+            raise ValueError(f"{path}: {section!r} is not an object")
+
+    for name, entry in data["types"].items():
+        where = f"{path}: type {name!r}"
+        t = check_fields(entry, type_fields, where)
+        if len(t["color"]) != 3 or not all(isinstance(c, int) and 0 <= c <= 255 for c in t["color"]):
+            raise ValueError(f"{where}: color is not [r, g, b]")
+        checked["types"][name] = t
+    for name, t in checked["types"].items():
+        where = f"{path}: type {name!r}"
+        related = t["weaknesses"] + t["resistances"] + t["immunities"]
+        for other in related:
+            check_name(other, checked["types"], "type", where)
+        # a type can't be i.e. weak and immune to another one at once
+        if len(set(related)) != len(related):
+            raise ValueError(f"{where} has more than one relationship with a type")
+
+    for name, entry in data["status_effects"].items():
+        where = f"{path}: status effect {name!r}"
+        se = check_fields(entry, status_effect_fields, where)
+        check_name(se["type"], checked["types"], "type", where)
+        if se["damage_mod_type"] is not None:
+            check_name(se["damage_mod_type"], checked["types"], "type", where)
+        check_range(se, "damage_low", "damage_high", where)
+        check_range(se, "thorn_damage_low", "thorn_damage_high", where)
+        checked["status_effects"][name] = se
+
+    for name, entry in data["moves"].items():
+        where = f"{path}: move {name!r}"
+        move = check_fields(entry, move_fields, where)
+        check_name(move["type"], checked["types"], "type", where)
+        if move["status_effect"] is not None:
+            check_name(move["status_effect"], checked["status_effects"], "status effect", where)
+        check_range(move, "damage_low", "damage_high", where)
+        if move["hit_attempts"] < 1 or move["cooldown"] < 0 or move["rage_cost"] < 0:
+            raise ValueError(f"{where}: hit attempts have to be at least 1, cooldown and rage cost can't be negative")
+        checked["moves"][name] = move
+
+    for name in required_moves:
+        check_name(name, checked["moves"], "move", f"{path} is missing a required move")
+    for name in required_status_effects:
+        check_name(name, checked["status_effects"], "status effect", f"{path} is missing a required status effect")
+
+    if not isinstance(data["creatures"], list) or not data["creatures"]:
+        raise ValueError(f"{path}: 'creatures' is not a list of at least one creature")
+    names = set()
+    for i, entry in enumerate(data["creatures"]):
+        where = f"{path}: creature {i}"
+        c = check_fields(entry, creature_fields, where)
+        if c["name"] in names:
+            raise ValueError(f"{where}: there is another creature named {c['name']!r}")
+        names.add(c["name"])
+        if not c["types"]:
+            raise ValueError(f"{where} has no types")
+        for t in c["types"]:
+            check_name(t, checked["types"], "type", where)
+        if len(c["moves"]) != 5:
+            raise ValueError(f"{where} doesn't have 5 moves (health kit and rage move are added to them)")
+        for move in c["moves"] + [c["rage_move"]]:
+            check_name(move, checked["moves"], "move", where)
+        checked["creatures"].append(c)
+
+    creature_moves = {c["name"]: c["moves"] + list(required_moves) + [c["rage_move"]] for c in checked["creatures"]}
+    if not isinstance(data.get("ai_multipliers", []), list):
+        raise ValueError(f"{path}: 'ai_multipliers' is not a list")
+    for i, entry in enumerate(data.get("ai_multipliers", [])):
+        where = f"{path}: ai multiplier {i}"
+        rule = check_fields(entry, multiplier_fields, where)
+        check_name(rule["creature"], creature_moves, "creature", where)
+        check_name(rule["move"], creature_moves[rule["creature"]], f"move of {rule['creature']}", where)
+        if rule["opponent"] is not None:
+            check_name(rule["opponent"], creature_moves, "creature", where)
+        checked["ai_multipliers"].append(rule)
+
+    return checked
+
+
+# catalog's cache, i.e. assets/data/__pycache__/catalog.pickle
+def cache_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, "__pycache__", os.path.splitext(name)[0] + ".pickle")
+
+
+# hash of the catalog and of the code building it
+def digest(content: bytes, build) -> bytes:
+    h = hashlib.sha256(content)
+    for code_path in (__file__, build.__code__.co_filename):
+        with open(code_path, "rb") as f:
+            h.update(f.read())
+    return h.digest()
+
+
+# catalog at path built by build(checked catalog), from the cache if it's up to date
+def load(path: str, build):
+    with open(path, "rb") as f:
+        content = f.read()
+    key = digest(content, build)
+    cache = cache_path(path)
+
+    try:
+        with open(cache, "rb") as f:
+            if f.read(len(MAGIC) + len(key)) == MAGIC + key:
+                return pickle.load(f)
+    except Exception:  # no cache yet, or a broken one, is built again
+        pass
+
+    import json
+    try:
+        data = json.loads(content)
+    except ValueError as error:
+        raise ValueError(f"{path} is not valid json: {error}")
+    catalog = build(validate(data, path))
+    write_cache(cache, key, catalog)
+    return catalog
+
+
+# written to a temporary file first, workers building the same catalog at once don't read each other's halves
+# without a writable directory the catalog is just built every time
+def write_cache(cache: str, key: bytes, catalog):
+    import tempfile
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(cache), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC + key)
+                pickle.dump(catalog, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, cache)
+        except BaseException:
+            os.remove(temporary)
+            raise
+    except OSError:
+        pass
@@ -1,9 +1,19 @@
 from __future__ import annotations  # type hinting instance of class to it's own functions
+import copy
+import itertools
+import os
 import random  # random damage, status chance and hit chance
-import scripts.gui as g
+import scripts.catalog as ca
+import scripts.events as ev
+import scripts.logs as lg
 
 testing_wout_type = False  # testing balance w/out type relationships
 
+# every status effect gets a new id, so a status effect can be told apart by id alone
+status_effect_ids = itertools.count()
+# copies made by StatusEffect.__modified__ by (status effect, changed stats), for the catalog in use
+modified_status_effects = {}
+
 
 # type of move's initial damage or status effect
 # creature's types might be different to types of moves it has
@@ -17,6 +27,7 @@ class Type:
         self.weaknesses = []
         self.resistances = []
         self.immunities = []
+        self.index = None  # position in types and in type_matrix
 
     # checks if type relationships don't already exist or if they exclude each other
     # this should prevent situations like element X is weak to Y and also immune to Y
@@ -35,16 +46,56 @@ class Type:
     def __addWeakness__(self, weakness: Type):
         if self.__isNewTypeRelationship__(weakness):
             self.weaknesses.append(weakness)
+            invalidate_type_matrix()
 
     # a type this type of creature is resilient to - deals less damage, extra status chance
     def __addResistances__(self, resistance: Type):
         if self.__isNewTypeRelationship__(resistance):
             self.resistances.append(resistance)
+            invalidate_type_matrix()
 
     # a type this type of creature is immune to - deals no damage, does not proc status
     def __addImmunities__(self, immunity: Type):
         if self.__isNewTypeRelationship__(immunity):
             self.immunities.append(immunity)
+            invalidate_type_matrix()
+
+    # damage multiplier of type against this type alone
+    def __getMultiplier__(self, type: Type) -> float:
+        if type in self.weaknesses:
+            return 1.2
+        if type in self.resistances:
+            return 0.8
+        if type in self.immunities:
+            return 0
+        return 1
+
+
+# damage multipliers of every type against every type - type_matrix[defending type index][attacking type index]
+# it's built from relationships of all types on first use and built again after any relationship is added
+type_matrix: list[list[float, ...], ...]
+type_matrix = None
+type_matrix_version = 0  # changes with every build, so vectors made from an older matrix can be recognised
+
+
+def get_type_matrix() -> list[list[float, ...], ...]:
+    global type_matrix, type_matrix_version
+    if type_matrix is None or len(type_matrix) != len(types):
+        # built aside and then swapped in, a battle in another thread never sees half of it
+        matrix = []
+        for defending in types:
+            row = []
+            for attacking in types:
+                row.append(defending.__getMultiplier__(attacking))
+            matrix.append(row)
+        type_matrix_version += 1
+        type_matrix = matrix
+    return type_matrix
+
+
+def invalidate_type_matrix():
+    global type_matrix
+    type_matrix = None
 
 
 # a status effect is an affliction or a buff applied over time to a creature
@@ -55,6 +106,8 @@ class StatusEffect:
                  status_duration: int = 0, stun_duration: int = -1,
                  thorn_damage_low: int = 0, thorn_damage_high: int = 0,
                  extinguish_scoring: int = 30):
+        # status effects are shared by all battles and never changed after they are made (see __modified__)
+        self.id = next(status_effect_ids)
         self.name = name
         self.type = type
         # damage has a range, with negative values, damage can heal back health permanently over time
@@ -88,15 +141,44 @@ class StatusEffect:
         # self-inflicted status effects will have negative score
         self.extinguish_scoring = extinguish_scoring
 
+    # copy with some stats changed (i.e. damage_mod=1) and with it's own id, this status effect stays as it is
+    # the same changes always give the same copy, so battles of the same ai levels share scores memoized by it's id
+    def __modified__(self, **stats) -> StatusEffect:
+        key = (self, tuple(sorted(stats.items())))
+        se = modified_status_effects.get(key)
+        if se is None:
+            se = copy.copy(self)
+            se.id = next(status_effect_ids)
+            for name, value in stats.items():
+                setattr(se, name, value)
+            # battles in other threads may have made one meanwhile, all of them get the first one stored
+            se = modified_status_effects.setdefault(key, se)
+        return se
+
 
 # applied status copy and damage_modifier reflecting weakness/resistance/immunity
+# slotted, it's copied a lot by ai search
 class StatusOccurrence:
+    __slots__ = ("se", "status_d", "stun_d", "damage_modifier")
+
     def __init__(self, se: StatusEffect):
         self.se = se
         self.status_d = se.status_duration
         self.stun_d = se.stun_duration
         self.damage_modifier = 1
 
+    def __clone__(self) -> StatusOccurrence:
+        clone = StatusOccurrence.__new__(StatusOccurrence)
+        clone.se = self.se
+        clone.status_d = self.status_d
+        clone.stun_d = self.stun_d
+        clone.damage_modifier = self.damage_modifier
+        return clone
+
+    # everything about the status the rest of the battle depends on
+    def __fingerprint__(self) -> tuple:
+        return self.se.id, self.status_d, self.stun_d, self.damage_modifier
+
 
 class Move:
 
@@ -131,7 +213,7 @@ class Creature:
     def __init__(self, id: int, name: str, desc: str, health: int, defense: int,
                  move1: Move, move2: Move, move3: Move, move4: Move, move5: Move,
                  types: tuple[Type, ...],
-                 rage: int, rage_move: Move):
+                 rage: int, rage_move: Move, health_kit: Move = None):
         self.id = id
         self.name = name
         self.desc = desc
@@ -143,15 +225,41 @@ class Creature:
         self.moves.append(move3)
         self.moves.append(move4)
         self.moves.append(move5)
-        self.moves.append(all_moves["HEALTH KIT"])
+        # every creature has the health kit of it's catalog
+        self.moves.append(health_kit if health_kit is not None else all_moves["HEALTH KIT"])
         self.types = []
         for t in types:
             self.types.append(t)
         self.rage = rage
         self.moves.append(rage_move)
 
-
+        # damage multipliers of every type against this creature, see __getTypeEffectiveness__
+        self.type_effectiveness = None
+        self.type_effectiveness_version = -1
+
+    # damage multipliers of every type (by type index) against this creature
+    # the first of creature's types with a relationship to the attacking type decides the multiplier
+    def __getTypeEffectiveness__(self) -> list[float, ...]:
+        matrix = get_type_matrix()
+        if self.type_effectiveness_version != type_matrix_version:
+            type_effectiveness = []
+            for attacking in types:
+                multiplier = 1
+                for t in self.types:
+                    if matrix[t.index][attacking.index] != 1:
+                        multiplier = matrix[t.index][attacking.index]
+                        break
+                type_effectiveness.append(multiplier)
+            self.type_effectiveness = type_effectiveness
+            self.type_effectiveness_version = type_matrix_version
+        return self.type_effectiveness
+
+
+# state of a creature in battle
+# slotted, it's copied and fingerprinted a lot by ai search
 class CreatureOccurrence:
+    __slots__ = ("c", "health", "rage", "active_statuses", "isStunned", "cooldowns", "total_damage_healed", "engine",
+                 "rng")
 
     def __init__(self, c: Creature):
         self.c = c
@@ -160,57 +268,56 @@ class CreatureOccurrence:
         self.active_statuses: list[StatusOccurrence, ...]
         self.active_statuses = []
         self.isStunned = False
-        self.cooldowns = [0, 0, 0, 0, 0, all_moves["HEALTH KIT"].cooldown, 0]
+        self.cooldowns = [0, 0, 0, 0, 0, c.moves[5].cooldown, 0]
         self.total_damage_healed = 0  # for statistics
-
-    def __joinBattleScene__(self, battle_scene: g.BattleScene):
-        self.bs = battle_scene
+        self.engine = None  # battle engine receiving this creature's events
+        self.rng = random  # random numbers of the battle, the global ones until it joins one
+
+    def __joinBattle__(self, engine):
+        self.engine = engine
+        self.rng = engine.rng
+
+    # copy to play turns out on, it reports to no engine
+    def __clone__(self) -> CreatureOccurrence:
+        clone = CreatureOccurrence.__new__(CreatureOccurrence)
+        clone.c = self.c
+        clone.health = self.health
+        clone.rage = self.rage
+        clone.active_statuses = [so.__clone__() for so in self.active_statuses]
+        clone.isStunned = self.isStunned
+        clone.cooldowns = self.cooldowns[:]
+        clone.total_damage_healed = self.total_damage_healed
+        clone.engine = None
+        clone.rng = self.rng
+        return clone
+
+    # everything about the creature that move scoring depends on (cooldowns and rage only make moves legal)
+    def __fingerprint__(self) -> tuple:
+        return self.c.id, self.health, self.isStunned, tuple(so.__fingerprint__() for so in self.active_statuses)
+
+    # report what happened to the battle engine, if there is one
+    def __emit__(self, event: ev.BattleEvent):
+        if self.engine is not None:
+            self.engine.__emit__(event)
 
     def __tickCooldowns__(self):
-        print(f"Cooldowns of {self.c.name}: ")
         for i in range(0, 7):
             if self.cooldowns[i] >= 1:
                 self.cooldowns[i] -= 1
-            print(self.cooldowns[i], end=", ")
-        print()
+        lg.engine.debug("cooldowns of %s: %s", self.c.name, self.cooldowns)
 
     # check if creature is weak, resistant or immune to type of status or attack
     # returned damage modifier will reflect the result
     def __checkTypeRelationship__(self, type: Type) -> float:
-
-        # break out of checks if confirmed weakness/resistance/immunity
-        damage_modifier = 1
-        modifier = False
-        for t in self.c.types:
-            for w in t.weaknesses:
-                if type == w:
-                    modifier = True
-                    damage_modifier = 1.2
-                    break
-            if modifier: break
-            for r in t.resistances:
-                if type == r:
-                    modifier = True
-                    damage_modifier = 0.8
-                    break
-            if modifier: break
-            for i in t.immunities:
-                if type == i:
-                    modifier = True
-                    damage_modifier = 0
-                    break
-            if modifier: break
         if not testing_wout_type:
-            return damage_modifier  # normal
+            return self.c.__getTypeEffectiveness__()[type.index]  # normal
         else:
             return 1  # testing balance w/out type relationships
 
+    # is type1 weak to type2
     @staticmethod
     def __checkTypesWeakness__(type1: Type, type2: Type) -> bool:
-        for w in type1.weaknesses:
-            if w == type2:
-                return True
-        return False
+        return get_type_matrix()[type1.index][type2.index] > 1
 
     # extinguishes effects
     def __checkForExtinguishing__(self, type: Type):
@@ -228,8 +335,8 @@ class CreatureOccurrence:
 
                 # check for weakness
                 if self.__checkTypesWeakness__(so.se.type, type):
-                    print(f"Status {so.se.name} extinguished for {self.c.name}")
-                    self.bs.__animateBattleText__(f'EFFECT {so.se.name}', f'EXTINGUISHED FOR {self.c.name}')
+                    lg.engine.debug("status %s extinguished for %s", so.se.name, self.c.name)
+                    self.__emit__(ev.StatusExtinguishedEvent(self, so))
                     self.active_statuses.remove(so)
                     i -= 1
                     num_of_statuses -= 1
@@ -238,15 +345,15 @@ class CreatureOccurrence:
     def __takeDamage__(self, damage: int):
 
         if damage > 0:
-            print(f"{self.c.name} takes {damage} damage!")
-            self.bs.__animateBattleText__(f"{self.c.name} TAKES {damage} DAMAGE!")
+            lg.engine.debug("%s takes %d damage", self.c.name, damage)
+            self.__emit__(ev.DamageEvent(self, damage))
             # add rage and cap it
             self.rage += damage
             if self.rage > self.c.rage:
                 self.rage = self.c.rage
         elif damage < 0:
-            print(f"{self.c.name} regains {-damage} health!")
-            self.bs.__animateBattleText__(f"{self.c.name} REGAINS {-damage} HEALTH!")
+            lg.engine.debug("%s regains %d health", self.c.name, -damage)
+            self.__emit__(ev.DamageEvent(self, damage))
             self.total_damage_healed -= damage
 
         prev_health = self.health
@@ -265,9 +372,8 @@ class CreatureOccurrence:
         # if self.health <= 0:
             # todo: death animation
 
-        # animate health bar and numbers
-        if self.bs is not None:
-            self.bs.__animateHealth__(self, prev_health)
+        # health bar and numbers
+        self.__emit__(ev.HealthChangedEvent(self, prev_health))
 
     def __applyStatus__(self, status_effect: StatusEffect):
 
@@ -275,16 +381,9 @@ class CreatureOccurrence:
         so = StatusOccurrence(status_effect)
         so.damage_modifier = self.__checkTypeRelationship__(so.se.type)
 
-        print(f"Applied status effect {so.se.name} to {self.c.name}!")
+        lg.engine.debug("applied status effect %s to %s", so.se.name, self.c.name)
 
-        if so.status_d == 0:
-            self.bs.__animateBattleText__(f'{so.se.name} APPLIED', f"TO {self.c.name} FOR THIS TURN!")
-        else:
-            self.bs.__animateBattleText__(f'{so.se.name} APPLIED', f"TO {self.c.name} FOR {so.status_d} TURN(S)!")
-        if so.stun_d == 0:
-            self.bs.__animateBattleText__(f'{so.se.name} STUNS', f"{self.c.name} FOR THIS TURN!")
-        elif so.stun_d > 0:
-            self.bs.__animateBattleText__(f'{so.se.name} STUNS', f"{self.c.name} FOR THE NEXT {so.stun_d} TURN(S)!")
+        self.__emit__(ev.StatusAppliedEvent(self, so))
 
         # actually activate the status
         self.active_statuses.append(so)
@@ -298,7 +397,8 @@ class CreatureOccurrence:
 
     def __tickStatus__(self):
 
-        print(f"tickStatus for {self.c.name}:")
+        lg.engine.debug("ticking statuses of %s", self.c.name)
+        self.__emit__(ev.TickStartEvent(self))
         num_of_statuses = len(self.active_statuses)
         n = num_of_statuses  # for blit
         i = 0
@@ -307,20 +407,18 @@ class CreatureOccurrence:
         # for element in list doesn't work here properly
         # list is dynamically modified when status is expired
         while i < num_of_statuses:
-            if not self.bs.textbox_up:  # introduce the textbox
-                self.bs.__animateTextbox__(True)
-
             so = self.active_statuses[i]
             # check for end of status
             if so.status_d <= 0:
-                print(f"Status {so.se.name} expired for {self.c.name}")
-                self.bs.__animateBattleText__(f'STATUS {so.se.name} ', f"EXPIRED FOR {self.c.name} ({j}/{n})")
+                lg.engine.debug("status %s expired for %s", so.se.name, self.c.name)
+                self.__emit__(ev.StatusExpiredEvent(self, so, j, n))
                 self.active_statuses.remove(so)
                 i -= 1
                 num_of_statuses -= 1
             else:
-                print(f"Ticking status {so.se.name} (turns before expired: {so.status_d}|{so.stun_d}) for {self.c.name}...")
-                self.bs.__animateBattleText__(f'{so.se.name} IS STILL ', f'APPLIED TO {self.c.name} ({j}/{n})')
+                lg.engine.debug("ticking status %s (turns before expired: %d|%d) for %s",
+                                so.se.name, so.status_d, so.stun_d, self.c.name)
+                self.__emit__(ev.StatusTickEvent(self, so, j, n))
                 so.status_d -= 1
 
                 # activate/deactivate stun
@@ -328,7 +426,7 @@ class CreatureOccurrence:
                     so.stun_d -= 1
 
                 if so.se.damage_low < so.se.damage_high:
-                    tick_damage = random.randrange(so.se.damage_low, so.se.damage_high + 1)
+                    tick_damage = self.rng.randrange(so.se.damage_low, so.se.damage_high + 1)
                 else:
                     tick_damage = so.se.damage_high
 
@@ -344,25 +442,19 @@ class CreatureOccurrence:
             i += 1
             j += 1
 
-        # get rid of the textbox
-        if self.bs.textbox_up:
-            self.bs.__animateTextbox__(False)
-
-        # re-calculate bonuses for gui after all effects are settled or extinguished
-        self.bs.__calculateModifiers__()
+        # all effects are settled or extinguished
+        self.__emit__(ev.TickEndEvent(self))
 
     def __makeMove__(self, opponent: CreatureOccurrence, move: Move):
 
-        self.bs.__animateTextbox__(True)
+        self.__emit__(ev.MoveStartEvent(self, move))
 
         hit_roll = 0
-        print(f"{self.c.name} USES {move.name}!")
+        lg.engine.debug("%s uses %s", self.c.name, move.name)
 
         # rage cost
         if move.rage_cost > 0:
-            rage_text = f'{self.c.name} IS CONSUMED BY RAGE!'
-            rage_text_2 = f'RAGE POINTS DECREASED BY {move.rage_cost}!'
-            self.bs.__animateBattleText__(rage_text, rage_text_2)
+            self.__emit__(ev.RageSpentEvent(self, move.rage_cost))
             self.rage -= move.rage_cost
 
         # creature targets self
@@ -378,14 +470,10 @@ class CreatureOccurrence:
                     elif move.type == so.se.damage_mod_type:
                         damage_mod -= so.se.damage_mod
 
-                if move.hit_attempts > 1:
-                    move_text = f'{self.c.name} USES {move.name} ({i + 1}/{move.hit_attempts})!'
-                else:
-                    move_text = f'{self.c.name} USES {move.name}!'
-                self.bs.__animateBattleText__(move_text)
+                self.__emit__(ev.MoveAttemptEvent(self, move, i + 1, move.hit_attempts))
 
                 if move.damage_low < move.damage_high:
-                    damage = random.randrange(move.damage_low, move.damage_high + 1)
+                    damage = self.rng.randrange(move.damage_low, move.damage_high + 1)
                 else:
                     damage = move.damage_high
 
@@ -400,15 +488,14 @@ class CreatureOccurrence:
                 # if move deals no damage, damage_mod is not applied
 
                 status_chance = move.status_chance
-                status_roll = random.randrange(0, 100)
+                status_roll = self.rng.randrange(0, 100)
 
-                hit_text = "MOVE CONNECTED!"
-                print(f"{hit_text}")
-                self.bs.__animateBattleText__(f"{hit_text}")
+                lg.engine.debug("move connected")
+                self.__emit__(ev.HitEvent(self, self, "CONNECTED"))
 
                 # status proc
                 if move.status_effect is not None:
-                    self.bs.__animateRoll__(status_roll, status_chance, True)
+                    self.__emit__(ev.RollEvent(self, status_roll, status_chance, True))
                     if status_roll > 100 - status_chance:
                         self.__applyStatus__(move.status_effect)
                         self.__checkForExtinguishing__(move.status_effect.type)
@@ -439,7 +526,8 @@ class CreatureOccurrence:
                 thorn_mod_high += so.se.thorn_damage_high
 
             hit_chance = move.aim + aim_mod - opponent.c.defense - defense_mod
-            print(f"aim {move.aim}, aim mod {aim_mod}, defense {opponent.c.defense}, defense mod {defense_mod}, hit chance {hit_chance}")
+            lg.engine.debug("aim %d, aim mod %d, defense %d, defense mod %d, hit chance %d",
+                            move.aim, aim_mod, opponent.c.defense, defense_mod, hit_chance)
             if hit_chance < 0: # fix for double negative
                 hit_chance = 0
 
@@ -447,28 +535,15 @@ class CreatureOccurrence:
             number_of_not_missed = 0
 
             for i in range(0, move.hit_attempts):
-                hit_roll = random.randrange(0, 100)
+                hit_roll = self.rng.randrange(0, 100)
 
-                if move.hit_attempts > 1:
-                    move_text = f'{self.c.name} USES {move.name} ({i + 1}/{move.hit_attempts})!'
-                else:
-                    move_text = f'{self.c.name} USES {move.name}!'
-                self.bs.__animateBattleText__(move_text)
-
-                if damage_multiplier == 0:
-                    effectiveness_text = "IT HAD NO EFFECT!"
-                elif damage_multiplier < 1:
-                    effectiveness_text = "IT'S NOT VERY EFFECTIVE!"
-                elif damage_multiplier > 1:
-                    effectiveness_text = "IT'S SUPER EFFECTIVE!"
-                else:
-                    effectiveness_text = "IT'S EFFECTIVE!"
+                self.__emit__(ev.MoveAttemptEvent(self, move, i + 1, move.hit_attempts))
 
                 # move connects
                 if hit_roll > 100 - hit_chance:
                     number_of_not_missed += 1
                     if move.damage_low < move.damage_high: # if damage low is NOT less than damage high, simply apply damage high (bug prevention for random.randrange)
-                        damage = int(random.randrange(move.damage_low, move.damage_high + 1))
+                        damage = int(self.rng.randrange(move.damage_low, move.damage_high + 1))
                     else:
                         damage = int(move.damage_high)
 
@@ -483,12 +558,12 @@ class CreatureOccurrence:
                     # if move deals no damage, damage_mod is not applied
                     damage = int(damage * damage_multiplier)
 
-                    hit_text = f"TARGET HIT!"
+                    hit_result = "HIT"
 
                 # graze or miss
                 else:
                     if move.damage_low < move.damage_high:
-                        damage = int(random.randrange(move.damage_low,
+                        damage = int(self.rng.randrange(move.damage_low,
                                       move.damage_high + 1) - move.damage_low)
 
                         if damage < 0:  # if move is healing enemy, positive damage_mod weakens it by increasing the dmg
@@ -512,10 +587,10 @@ class CreatureOccurrence:
                         damage += 1
 
                     if damage != 0:
-                        hit_text = f"TARGET GRAZED!"
+                        hit_result = "GRAZED"
                         number_of_not_missed += 1
                     else:
-                        hit_text = f"TARGET MISSED!"
+                        hit_result = "MISSED"
 
                 # this code is commented out as it shouldn't be needed now:
                 # prevent being healed by an enemy when he shoots fire at you (yeah, that happened)
@@ -523,13 +598,9 @@ class CreatureOccurrence:
                 # if damage < 0 and move.damage_low >= 0:
                 #    damage = 0
 
-                self.bs.__animateRoll__(hit_roll, hit_chance, False)
-                if hit_roll > 100 - hit_chance:
-                    print(f"{hit_text} ({hit_roll}|{hit_chance})\n{effectiveness_text}")
-                    self.bs.__animateBattleText__(f"{hit_text}", f"{effectiveness_text}")
-                else:
-                    print(f"{hit_text} ({hit_roll}|{hit_chance})")
-                    self.bs.__animateBattleText__(f"{hit_text}")
+                self.__emit__(ev.RollEvent(self, hit_roll, hit_chance, False))
+                lg.engine.debug("target %s (%d|%d) x%s", hit_result, hit_roll, hit_chance, damage_multiplier)
+                self.__emit__(ev.HitEvent(self, opponent, hit_result, damage_multiplier))
 
                 opponent.__takeDamage__(damage)
                 if hit_roll > 100 - hit_chance:
@@ -538,415 +609,133 @@ class CreatureOccurrence:
                 if hit_roll > 100 - hit_chance and move.status_effect is not None:
                     status_multiplier = opponent.__checkTypeRelationship__(move.status_effect.type)
                     status_chance = int(move.status_chance * status_multiplier)
-                    status_roll = random.randrange(0, 100)
+                    status_roll = self.rng.randrange(0, 100)
 
                     # status proc
-                    self.bs.__animateRoll__(status_roll, status_chance, True)
+                    self.__emit__(ev.RollEvent(self, status_roll, status_chance, True))
                     if status_roll > 100 - status_chance:
                         opponent.__applyStatus__(move.status_effect)
                         opponent.__checkForExtinguishing__(move.status_effect.type)
                     else:
-                        print(f"Missed status effect {move.status_effect.name}!")
+                        lg.engine.debug("missed status effect %s", move.status_effect.name)
+                        self.__emit__(ev.StatusMissedEvent(opponent, move.status_effect))
 
             # thorn calculations and appliance
             if thorn_mod_low < thorn_mod_high:
-                thorn_damage = random.randrange(thorn_mod_low, thorn_mod_high + 1)
+                thorn_damage = self.rng.randrange(thorn_mod_low, thorn_mod_high + 1)
             else:
                 thorn_damage = thorn_mod_high
 
             if thorn_damage > 0:  # take damage
-                print(f"{opponent.c.name} retaliates!")
-                self.bs.__animateBattleText__(f"{opponent.c.name} RETALIATES!")
+                lg.engine.debug("%s retaliates", opponent.c.name)
+                self.__emit__(ev.ThornEvent(self, opponent, thorn_damage))
                 self.__takeDamage__(thorn_damage)
             elif thorn_damage < 0 and number_of_not_missed > 0:  # heal yourself if you got a hit or a graze
                 # thorn_damage *= number_of_hits # uncomment for higher leech with more hits
-                print(f"{self.c.name} leeches health from it's opponent!")
-                self.bs.__animateBattleText__(f"{self.c.name} LEECHES HEALTH!")
+                lg.engine.debug("%s leeches health from it's opponent", self.c.name)
+                self.__emit__(ev.ThornEvent(self, opponent, thorn_damage))
                 self.__takeDamage__(thorn_damage)
 
-        # textbox out
-        self.bs.__animateTextbox__(False)
-
-
-# dictionaries of content
-all_types = {
-    "PERMANENT": Type("PERMANENT", (0, 0, 0)),
-    "FIRE": Type("FIRE", (255, 62, 10)),
-    "PHYSICAL": Type("PHYSICAL", (107, 115, 90)),
-    "FLYING": Type("FLYING", (47, 8, 122)),
-    "ELECTRIC": Type("ELECTRIC", (255, 228, 0)),
-    "WATER": Type("WATER", (0, 129, 255)),
-    "PSYCHIC": Type("PSYCHIC", (152, 2, 248)),
-    "GHOST": Type("GHOST", (0, 132, 112)),
-    "WIND": Type("WIND", (142, 125, 86)),
-    "NULLIFY": Type("NULLIFY", (48, 48, 48)),
-    "VAMPIRIC": Type("VAMPIRIC", (96, 0, 0)),
-    "MAGIC": Type("MAGIC", (17, 188, 212)),
-    "GRASS": Type("GRASS", (0, 255, 0))
-}
+        self.__emit__(ev.MoveEndEvent(self, move))
+
 
+# content of the game, built from a catalog (see catalog.py and assets/data/catalog.json)
+# use_catalog switches to another catalog, so these are always read from the module (cr.all_moves)
+all_types: dict[str, Type]
 # doubling information in gui.py for browsing via index
-types = []
-for t in all_types.values():
-    types.append(t)
-
-all_types["FIRE"].__addResistances__(all_types["FIRE"])
-all_types["FIRE"].__addWeakness__(all_types["WATER"])
-all_types["FIRE"].__addResistances__(all_types["GRASS"])
-
-all_types["PERMANENT"].isAnExtinguisher = False
-all_types["PHYSICAL"].isAnExtinguisher = False
-all_types["FLYING"].isAnExtinguisher = False
-all_types["VAMPIRIC"].isAnExtinguisher = False
-
-all_types["ELECTRIC"].__addResistances__(all_types["ELECTRIC"])
-all_types["ELECTRIC"].__addResistances__(all_types["WATER"])
-
-all_types["WATER"].__addResistances__(all_types["WATER"])
-all_types["WATER"].__addResistances__(all_types["FIRE"])
-all_types["WATER"].__addWeakness__(all_types["ELECTRIC"])
-all_types["WATER"].__addWeakness__(all_types["GRASS"])
-
-all_types["PSYCHIC"].__addResistances__(all_types["PSYCHIC"])
-
-all_types["GHOST"].__addImmunities__(all_types["PHYSICAL"])
-all_types["GHOST"].__addWeakness__(all_types["PSYCHIC"])
-
-all_types["WIND"].__addResistances__(all_types["WIND"])
-
-all_types["VAMPIRIC"].__addResistances__(all_types["VAMPIRIC"])
-all_types["VAMPIRIC"].__addResistances__(all_types["MAGIC"])
-
-all_types["MAGIC"].__addResistances__(all_types["MAGIC"])
-all_types["MAGIC"].__addResistances__(all_types["FIRE"])
-all_types["MAGIC"].__addResistances__(all_types["WATER"])
-all_types["MAGIC"].__addResistances__(all_types["ELECTRIC"])
-all_types["MAGIC"].__addResistances__(all_types["GRASS"])
-all_types["MAGIC"].__addResistances__(all_types["WIND"])
-all_types["MAGIC"].__addWeakness__(all_types["PHYSICAL"])
-
-all_types["GRASS"].__addResistances__(all_types["GRASS"])
-all_types["GRASS"].__addWeakness__(all_types["FIRE"])
-all_types["GRASS"].__addResistances__(all_types["WATER"])
-
-all_types["FIRE"].__addWeakness__(all_types["NULLIFY"])
-all_types["PHYSICAL"].__addWeakness__(all_types["NULLIFY"])
-all_types["FLYING"].__addWeakness__(all_types["NULLIFY"])
-all_types["ELECTRIC"].__addWeakness__(all_types["NULLIFY"])
-all_types["WATER"].__addWeakness__(all_types["NULLIFY"])
-all_types["PSYCHIC"].__addWeakness__(all_types["NULLIFY"])
-all_types["GHOST"].__addWeakness__(all_types["NULLIFY"])
-all_types["WIND"].__addWeakness__(all_types["NULLIFY"])
-all_types["VAMPIRIC"].__addWeakness__(all_types["NULLIFY"])
-all_types["MAGIC"].__addWeakness__(all_types["NULLIFY"])
-all_types["GRASS"].__addWeakness__(all_types["NULLIFY"])
-
-all_status_effects = {
-    # UNIVERSAL
-    "AI MODIFIER 1":
-        StatusEffect(name="AI MODIFIER 1", type=all_types["PERMANENT"], damage_low=0, damage_high=0,
-                     aim_mod=-3, defense_mod=-3, damage_mod=0, damage_mod_type=None,
-                     status_duration=999, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=0),
-    "AI MODIFIER 2":
-        StatusEffect(name="AI MODIFIER 2", type=all_types["PERMANENT"], damage_low=0, damage_high=0,
-                     aim_mod=-3, defense_mod=-3, damage_mod=0, damage_mod_type=None,
-                     status_duration=999, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=0),
-
-    # FRAGONITE THE FIRE DRAGON
-    "BURNING":
-        StatusEffect(name="BURNING", type=all_types["FIRE"], damage_low=2, damage_high=2,
-                     aim_mod=-4, defense_mod=0, damage_mod=0, damage_mod_type=None,
-                     status_duration=3, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=5),
-    "WARMING":
-        StatusEffect(name="WARMING", type=all_types["FIRE"], damage_low=-4, damage_high=-3,
-                     aim_mod=0, defense_mod=0, damage_mod=0, damage_mod_type=None,
-                     status_duration=4, stun_duration=-1,
-                     thorn_damage_low=-1, thorn_damage_high=0, extinguish_scoring=-9),
-    "AIRBORNE":
-        StatusEffect(name="AIRBORNE", type=all_types["FLYING"], damage_low=0, damage_high=0,
-                     aim_mod=20, defense_mod=40, damage_mod=1, damage_mod_type=all_types["FIRE"],
-                     status_duration=1, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=-20),
-    "BITING FLAMES":
-        StatusEffect(name="BITING FLAMES", type=all_types["FIRE"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=10, damage_mod=0, damage_mod_type=None,
-                     status_duration=0, stun_duration=-1,
-                     thorn_damage_low=16, thorn_damage_high=20, extinguish_scoring=0),
-
-    # SCHONIPS THE SHOCK SNAKE
-    "ELECTRIC FORTIFICATION":
-        StatusEffect(name="ELECTRIC FORTIFICATION", type=all_types["ELECTRIC"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=0, damage_mod=1, damage_mod_type=None,
-                     status_duration=4, stun_duration=-1,
-                     thorn_damage_low=3, thorn_damage_high=4, extinguish_scoring=-8),
-    "SHOCKED":
-        StatusEffect(name="SHOCKED", type=all_types["ELECTRIC"], damage_low=1, damage_high=1,
-                     aim_mod=-5, defense_mod=-5, damage_mod=-1, damage_mod_type=None,
-                     status_duration=3, stun_duration=0,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=6),
-    "SNAKE REGENERATION":
-        StatusEffect(name="SNAKE REGENERATION", type=all_types["NULLIFY"], damage_low=-3, damage_high=-1,
-                     aim_mod=0, defense_mod=3, damage_mod=0, damage_mod_type=None,
-                     status_duration=5, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=-5),
-    "SHOCK FENCE":
-        StatusEffect(name="SHOCK FENCE", type=all_types["ELECTRIC"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=30, damage_mod=0, damage_mod_type=None,
-                     status_duration=0, stun_duration=-1,
-                     thorn_damage_low=12, thorn_damage_high=16, extinguish_scoring=0),
-
-    # PSAWARCA THE PSYCHIC WATER ORCA
-    "MENTAL IMPAIRMENT":
-        StatusEffect(name="MENTAL IMPAIRMENT", type=all_types["PSYCHIC"], damage_low=0, damage_high=0,
-                     aim_mod=-10, defense_mod=-5, damage_mod=-1, damage_mod_type=None,
-                     status_duration=1, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=10),
-    "WET":
-        StatusEffect(name="WET", type=all_types["WATER"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=-5, damage_mod=-2, damage_mod_type=all_types["FIRE"],
-                     status_duration=2, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=3),
-    "PSYCHIC SHIELD":
-        StatusEffect(name="PSYCHIC SHIELD", type=all_types["PSYCHIC"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=25, damage_mod=0, damage_mod_type=None,
-                     status_duration=3, stun_duration=-1,
-                     thorn_damage_low=2, thorn_damage_high=3, extinguish_scoring=-10),
-    "CONTROL":
-        StatusEffect(name="CONTROL", type=all_types["PSYCHIC"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=-20, damage_mod=0, damage_mod_type=None,
-                     status_duration=1, stun_duration=1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=10),
-
-    # SHIGOWI THE WIND SHAPESHIFTER
-    "HIDDEN BY VOID":
-        StatusEffect(name="HIDDEN BY VOID", type=all_types["GHOST"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=400, damage_mod=0, damage_mod_type=None,
-                     status_duration=0, stun_duration=-1,
-                     thorn_damage_low=4, thorn_damage_high=8, extinguish_scoring=0),
-    "TRIPPED":
-        StatusEffect(name="TRIPPED", type=all_types["WIND"], damage_low=0, damage_high=0,
-                     aim_mod=-10, defense_mod=-10, damage_mod=0, damage_mod_type=None,
-                     status_duration=1, stun_duration=0,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=5),
-    "NULLIFICATION":
-        StatusEffect(name="NULLIFICATION", type=all_types["NULLIFY"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=10, damage_mod=0, damage_mod_type=None,
-                     status_duration=1, stun_duration=1,
-                     thorn_damage_low=18, thorn_damage_high=24, extinguish_scoring=-5),
-
-    # BAMAT THE LARGE MAGICAL BAT
-    "VAMPIRIC PHEROMONES":
-        StatusEffect(name="VAMPIRIC PHEROMONES", type=all_types["VAMPIRIC"], damage_low=0, damage_high=0,
-                     aim_mod=0, defense_mod=-10, damage_mod=0, damage_mod_type=None,
-                     status_duration=3, stun_duration=-1,
-                     thorn_damage_low=-4, thorn_damage_high=-4, extinguish_scoring=10),
-    "HUNGER":
-        StatusEffect(name="HUNGER", type=all_types["VAMPIRIC"], damage_low=1, damage_high=1,
-                     aim_mod=-5, defense_mod=-5, damage_mod=0, damage_mod_type=None,
-                     status_duration=7, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=5),
-    "BLIND":
-        StatusEffect(name="BLIND", type=all_types["MAGIC"], damage_low=0, damage_high=0,
-                     aim_mod=-20, defense_mod=-10, damage_mod=-1, damage_mod_type=None,
-                     status_duration=2, stun_duration=1,
-                     thorn_damage_low=0, thorn_damage_high=0, extinguish_scoring=10),
-    "MAGIC SHIELD":
-        StatusEffect(name="MAGIC SHIELD", type=all_types["MAGIC"], damage_low=-2, damage_high=0,
-                     aim_mod=0, defense_mod=5, damage_mod=1, damage_mod_type=None,
-                     status_duration=3, stun_duration=-1,
-                     thorn_damage_low=0, thorn_damage_high=3, extinguish_scoring=-5),
-}
-
-all_moves = {
-    # UNIVERSAL
-    "HEALTH KIT":
-        Move(name="HEALTH KIT",
-             type=all_types["NULLIFY"], speed=1, target_self=True,
-             damage_low=-8, damage_high=-4, aim=200, hit_attempts=1,
-             status_effect=None, status_chance=0, cooldown=7),
-
-    # FRAGONIRE THE FIRE DRAGON
-    "FIRE BREATH":
-        Move(name="FIRE BREATH",
-             type=all_types["FIRE"], speed=3, target_self=False,
-             damage_low=3, damage_high=6, aim=80, hit_attempts=3,
-             status_effect=all_status_effects["BURNING"], status_chance=75, cooldown=2),
-
-    "DRAGON CLAW":
-        Move(name="DRAGON CLAW",
-             type=all_types["PHYSICAL"], speed=3, target_self=False,
-             damage_low=12, damage_high=16, aim=100, hit_attempts=1,
-             status_effect=None, status_chance=0, cooldown=1),
-    "WARMTH":
-        Move(name="WARMTH",
-             type=all_types["FIRE"], speed=1, target_self=True,
-             damage_low=-4, damage_high=-3, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["WARMING"], status_chance=200, cooldown=4),
-    "FLIGHT":
-        Move(name="FLIGHT",
-             type=all_types["FLYING"], speed=4, target_self=True,
-             damage_low=0, damage_high=0, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["AIRBORNE"], status_chance=200, cooldown=3),
-    "FIREWALL":
-        Move(name="FIREWALL",
-             type=all_types["FIRE"], speed=5, target_self=True,
-             damage_low=0, damage_high=0, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["BITING FLAMES"], status_chance=200, cooldown=6),
-    "CLEANSING FLAMES":
-        Move(name="CLEANSING FLAMES",
-             type=all_types["FIRE"], speed=2, target_self=False,
-             damage_low=8, damage_high=16, aim=120, hit_attempts=1,
-             status_effect=all_status_effects["BURNING"], status_chance=100, rage_cost=30),
-
-    # SCHONIPS THE SHOCK SNAKE
-    "SNAKE BITE":
-        Move(name="SNAKE BITE",
-             type=all_types["PHYSICAL"], speed=5, target_self=False,
-             damage_low=10, damage_high=12, aim=115, hit_attempts=1,
-             status_effect=None, status_chance=0, cooldown=2),
-    "ELECTRIFICATION":
-        Move(name="ELECTRIFICATION",
-             type=all_types["ELECTRIC"], speed=4, target_self=True,
-             damage_low=0, damage_high=0, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["ELECTRIC FORTIFICATION"], status_chance=200, cooldown=2),
-    "ELECTRIC DISCHARGE":
-        Move(name="ELECTRIC DISCHARGE",
-             type=all_types["ELECTRIC"], speed=4, target_self=False,
-             damage_low=6, damage_high=8, aim=90, hit_attempts=1,
-             status_effect=all_status_effects["SHOCKED"], status_chance=100, cooldown=5),
-    "SHED SKIN":
-        Move(name="SHED SKIN",
-             type=all_types["NULLIFY"], speed=1, target_self=True,
-             damage_low=1, damage_high=1, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["SNAKE REGENERATION"], status_chance=200, cooldown=6),
-    "SHOCK SCREAM":
-        Move(name="SHOCK SCREAM",
-             type=all_types["ELECTRIC"], speed=3, target_self=False,
-             damage_low=8, damage_high=10, aim=90, hit_attempts=2,
-             status_effect=None, status_chance=0, cooldown=1),
-    "DODGE AND SHOCK":
-        Move(name="DODGE AND SHOCK",
-             type=all_types["PHYSICAL"], speed=5, target_self=True,
-             damage_low=0, damage_high=0, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["SHOCK FENCE"], status_chance=100, rage_cost=25),
-
-
-    # PSAWARCA THE PSYCHIC WATER ORCA
-    "PSYCHIC CHALLENGE":
-        Move(name="PSYCHIC CHALLENGE",
-             type=all_types["PSYCHIC"], speed=3, target_self=False,
-             damage_low=4, damage_high=4, aim=75, hit_attempts=3,
-             status_effect=all_status_effects["MENTAL IMPAIRMENT"], status_chance=100, cooldown=2),
-    "WATER CANNON":
-        Move(name="WATER CANNON",
-             type=all_types["WATER"], speed=3, target_self=False,
-             damage_low=12, damage_high=12, aim=95, hit_attempts=1,
-             status_effect=all_status_effects["WET"], status_chance=100, cooldown=2),
-    "ILLUSORY SHIELDING":
-        Move(name="ILLUSORY SHIELDING",
-             type=all_types["PSYCHIC"], speed=4, target_self=True,
-             damage_low=0, damage_high=0, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["PSYCHIC SHIELD"], status_chance=100, cooldown=5),
-    "MIRACLE REGEN":
-        Move(name="MIRACLE REGEN",
-             type=all_types["PSYCHIC"], speed=2, target_self=True,
-             damage_low=-20, damage_high=-12, aim=200, hit_attempts=1,
-             status_effect=None, status_chance=0, cooldown=4),
-    "WATER WAVE":
-        Move(name="WATER WAVE",
-             type=all_types["WATER"], speed=2, target_self=False,
-             damage_low=12, damage_high=18, aim=85, hit_attempts=1,
-             status_effect=all_status_effects["WET"], status_chance=100, cooldown=2),
-    "MIND CONTROL":
-        Move(name="MIND CONTROL",
-             type=all_types["PSYCHIC"], speed=2, target_self=False,
-             damage_low=8, damage_high=8, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["CONTROL"], status_chance=90, rage_cost=50),
-
-    # SHIGOWI THE WIND GHOST SHAPESHIFTER
-    "PHANTOM JAVELINS":
-        Move(name="PHANTOM JAVELINS", type=all_types["GHOST"], speed=3, target_self=False,
-             damage_low=4, damage_high=8, aim=70, hit_attempts=3,
-             status_effect=None, status_chance=0, cooldown=1),
-    "ESCAPE TO VOID":
-        Move(name="ESCAPE TO VOID", type=all_types["GHOST"], speed=5, target_self=True,
-             damage_low=-3, damage_high=-3, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["HIDDEN BY VOID"], status_chance=200, cooldown=3),
-    "TRIP OVER":
-        Move(name="TRIP OVER", type=all_types["WIND"], speed=4, target_self=False,
-             damage_low=2, damage_high=6, aim=110, hit_attempts=1,
-             status_effect=all_status_effects["TRIPPED"], status_chance=90, cooldown=3),
-    "HURRICANE":
-        Move(name="HURRICANE", type=all_types["WIND"], speed=1, target_self=False,
-             damage_low=12, damage_high=18, aim=85, hit_attempts=1,
-             status_effect=all_status_effects["TRIPPED"], status_chance=100, cooldown=3),
-    "RESET VOID":
-        Move(name="RESET VOID", type=all_types["NULLIFY"], speed=5, target_self=True,
-             damage_low=3, damage_high=3, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["NULLIFICATION"], status_chance=200, cooldown=5),
-    "VOID BLAST":
-        Move(name="VOID BLAST", type=all_types["NULLIFY"], speed=3, target_self=False,
-             damage_low=10, damage_high=10, aim=95, hit_attempts=1,
-             status_effect=None, status_chance=0, rage_cost=20),
-
-    # BAMAT THE LARGE MAGICAL BAT
-    "BAT BITE":
-        Move(name="BAT BITE", type=all_types["PHYSICAL"], speed=2, target_self=False,
-             damage_low=12, damage_high=18, aim=95, hit_attempts=1,
-             status_effect=None, status_chance=0, cooldown=1),
-    "DROP OF BLOOD":
-        Move(name="DROP OF BLOOD", type=all_types["VAMPIRIC"], speed=5, target_self=False,
-             damage_low=1, damage_high=1, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["VAMPIRIC PHEROMONES"], status_chance=200, cooldown=5),
-    "STARVE OPPONENT":
-        Move(name="STARVE OPPONENT", type=all_types["VAMPIRIC"], speed=3, target_self=False,
-             damage_low=4, damage_high=4, aim=115, hit_attempts=1,
-             status_effect=all_status_effects["HUNGER"], status_chance=100, cooldown=2),
-    "BLINDING LIGHT":
-        Move(name="BLINDING LIGHT", type=all_types["MAGIC"], speed=2, target_self=False,
-             damage_low=4, damage_high=8, aim=105, hit_attempts=1,
-             status_effect=all_status_effects["BLIND"], status_chance=80, cooldown=7),
-    "MAGICAL REINFORCEMENT":
-        Move(name="MAGICAL REINFORCEMENT", type=all_types["MAGIC"], speed=5, target_self=True,
-             damage_low=0, damage_high=0, aim=200, hit_attempts=1,
-             status_effect=all_status_effects["MAGIC SHIELD"], status_chance=200, cooldown=0),
-    "MAGIC BOLTS":
-        Move(name="MAGIC BOLTS", type=all_types["MAGIC"], speed=2, target_self=False,
-             damage_low=8, damage_high=8, aim=95, hit_attempts=2,
-             status_effect=None, status_chance=0, rage_cost=30),
-
-}
-
-all_creatures = [
-
-        Creature(id=0, name="FRAGONIRE", desc="The Mighty Fire Dragon Fragonire",
-                 health=60, defense=0, move1=all_moves["FIRE BREATH"], move2=all_moves["DRAGON CLAW"],
-                 move3=all_moves["WARMTH"], move4=all_moves["FLIGHT"], move5=all_moves["FIREWALL"],
-                 types=(all_types["FIRE"], all_types["PHYSICAL"]), rage=40, rage_move=all_moves["CLEANSING FLAMES"]),
-
-        Creature(id=1, name="SCHONIPS", desc="The Agile Shock Snake Schonips",
-                 health=45, defense=20, move1=all_moves["SNAKE BITE"], move2=all_moves["ELECTRIFICATION"],
-                 move3=all_moves["ELECTRIC DISCHARGE"], move4=all_moves["SHED SKIN"], move5=all_moves["SHOCK SCREAM"],
-                 types=(all_types["ELECTRIC"], all_types["PHYSICAL"]), rage=25, rage_move=all_moves["DODGE AND SHOCK"]),
-
-        Creature(id=2, name="PSAWARCA", desc="The Psychic Water-Bending Orca Psawarca",
-                 health=65, defense=0, move1=all_moves["PSYCHIC CHALLENGE"], move2=all_moves["WATER CANNON"],
-                 move3=all_moves["ILLUSORY SHIELDING"], move4=all_moves["MIRACLE REGEN"], move5=all_moves["WATER WAVE"],
-                 types=(all_types["PSYCHIC"], all_types["WATER"], all_types["PHYSICAL"]), rage=60, rage_move=all_moves["MIND CONTROL"]),
-
-
-        Creature(id=3, name="SHIGOWI", desc="The Ghost of Wind Shapeshifter Shigowi",
-                 health=35, defense=25, move1=all_moves["PHANTOM JAVELINS"], move2=all_moves["ESCAPE TO VOID"],
-                 move3=all_moves["TRIP OVER"], move4=all_moves["HURRICANE"], move5=all_moves["RESET VOID"],
-                 types=(all_types["GHOST"], all_types["WIND"]), rage=35, rage_move=all_moves["VOID BLAST"]),
-
-
-        Creature(id=4, name="BAMAT", desc="The Large Magical Amputee Bat Bamat",
-                 health=70, defense=-10, move1=all_moves["BAT BITE"], move2=all_moves["DROP OF BLOOD"],
-                 move3=all_moves["STARVE OPPONENT"], move4=all_moves["BLINDING LIGHT"],
-                 move5=all_moves["MAGICAL REINFORCEMENT"],
-                 types=(all_types["VAMPIRIC"], all_types["MAGIC"], all_types["PHYSICAL"]), rage=60, rage_move=all_moves["MAGIC BOLTS"])
-]
+types: list[Type, ...]
+all_status_effects: dict[str, StatusEffect]
+all_moves: dict[str, Move]
+all_creatures: list[Creature, ...]
+# ai's scoring multipliers of moves - ai_multipliers[creature id][move index][opponent creature id]
+# they allow better score interpretation of moves when the score may be misleading
+ai_multipliers: list[list[list[float, ...], ...], ...]
+catalog_path = None  # the catalog in use
+
+
+# objects of a checked catalog (see catalog.validate), the same catalog is always built the same
+# building one doesn't touch the catalog in use (until use_catalog switches to it)
+def build_catalog(data: dict) -> dict:
+    catalog_types = {}
+    for name, entry in data["types"].items():
+        t = Type(name, tuple(entry["color"]))
+        t.isAnExtinguisher = entry["extinguisher"]
+        t.index = len(catalog_types)
+        catalog_types[name] = t
+    # relationships were checked already, adding them one by one would throw away the type matrix in use
+    for name, entry in data["types"].items():
+        catalog_types[name].weaknesses = [catalog_types[other] for other in entry["weaknesses"]]
+        catalog_types[name].resistances = [catalog_types[other] for other in entry["resistances"]]
+        catalog_types[name].immunities = [catalog_types[other] for other in entry["immunities"]]
+
+    status_effects = {}
+    for name, entry in data["status_effects"].items():
+        stats = dict(entry)
+        stats["type"] = catalog_types[entry["type"]]
+        if entry["damage_mod_type"] is not None:
+            stats["damage_mod_type"] = catalog_types[entry["damage_mod_type"]]
+        status_effects[name] = StatusEffect(name=name, **stats)
+        # ids by order in the catalog, use_catalog makes sure later status effects don't get them
+        status_effects[name].id = len(status_effects) - 1
+
+    moves = {}
+    for name, entry in data["moves"].items():
+        stats = dict(entry)
+        stats["type"] = catalog_types[entry["type"]]
+        if entry["status_effect"] is not None:
+            stats["status_effect"] = status_effects[entry["status_effect"]]
+        moves[name] = Move(name=name, **stats)
+
+    creatures = []
+    for entry in data["creatures"]:
+        m = [moves[name] for name in entry["moves"]]
+        creatures.append(Creature(id=len(creatures), name=entry["name"], desc=entry["desc"],
+                                  health=entry["health"], defense=entry["defense"],
+                                  move1=m[0], move2=m[1], move3=m[2], move4=m[3], move5=m[4],
+                                  types=tuple(catalog_types[t] for t in entry["types"]),
+                                  rage=entry["rage"], rage_move=moves[entry["rage_move"]],
+                                  health_kit=moves["HEALTH KIT"]))
+
+    multipliers = [[[1.0 for x in creatures] for y in range(7)] for z in creatures]
+    ids = {c.name: c.id for c in creatures}
+    for rule in data["ai_multipliers"]:
+        c = creatures[ids[rule["creature"]]]
+        move_index = [move.name for move in c.moves].index(rule["move"])
+        opponents = range(0, len(creatures)) if rule["opponent"] is None else [ids[rule["opponent"]]]
+        for opponent in opponents:
+            multipliers[c.id][move_index][opponent] = float(rule["multiplier"])
+
+    return {"types": catalog_types, "status_effects": status_effects, "moves": moves, "creatures": creatures,
+            "ai_multipliers": multipliers}
+
+
+# use the catalog at path (the default one if None) from now on, returns whether it's a different one
+# built only the first time, after that it's cache is loaded (see catalog.load)
+# creature occurrences of the old catalog shouldn't be used with the new one
+def use_catalog(path: str = None) -> bool:
+    global all_types, types, all_status_effects, all_moves, all_creatures, ai_multipliers, catalog_path
+    global status_effect_ids
+    path = os.path.abspath(path if path is not None else ca.default_path)
+    if path == catalog_path:
+        return False
+
+    catalog = ca.load(path, build_catalog)
+    all_types = catalog["types"]
+    types = list(all_types.values())
+    all_status_effects = catalog["status_effects"]
+    all_moves = catalog["moves"]
+    all_creatures = catalog["creatures"]
+    ai_multipliers = catalog["ai_multipliers"]
+    catalog_path = path
+
+    # status effects made from now on (i.e. modified ones) don't share ids with the catalog's
+    status_effect_ids = itertools.count(max(se.id for se in all_status_effects.values()) + 1)
+    modified_status_effects.clear()
+    invalidate_type_matrix()
+    # built now rather than on first use, so battles only ever read creatures of the catalog
+    for c in all_creatures:
+        c.__getTypeEffectiveness__()
+    return True
+
+
+use_catalog()
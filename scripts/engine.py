@@ -0,0 +1,266 @@
+import math
+import random
+
+import scripts.creatures as cr
+import scripts.events as ev
+import scripts.logs as lg
+import scripts.player as pl
+
+
+# headless battle engine - resolves turns without any gui
+# all battle state lives in the players and their creature occurrences, which are changed in place,
+# everything that happens is reported as typed events (see events.py)
+# a listener (i.e. BattleScene.__animateEvent__) gets every event the moment it happens,
+# so it can animate the battle with the state matching the event
+# without a listener, the events are just collected and returned by each phase of a turn
+# every roll of the battle comes from one stream seeded with seed (a random one if None), which creatures are given,
+# players choose moves with streams of their own - so the same seed and moves play the same battle (see recording.py)
+class Engine:
+    def __init__(self, p1: pl.Player, p2: pl.Player, listener=None, seed: int = None):
+        self.p1 = p1
+        self.p2 = p2
+        self.listener = listener
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.turn_counter = 1
+
+        # every resolved turn as (p1 move, p1's guess, p1's guess mode, p2 move, p2's guess, p2's guess mode,
+        # p1 health, p2 health) - moves and guesses like in __resolveTurn__, health of active creatures after the moves
+        self.history = []
+
+        # events of the current phase
+        self.events: list[ev.BattleEvent, ...]
+        self.events = []
+
+        # how many times each move was used by each player (for statistics)
+        self.move_count = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0]]
+        # the same by move name, moves of different creatures share indices
+        self.move_usage = [{}, {}]
+
+        for p in (self.p1, self.p2):
+            p.ac = p.creatures[p.ac_index]
+            p.__joinBattle__(random.Random(self.rng.getrandbits(64)))
+            co: cr.CreatureOccurrence
+            for co in p.creatures:
+                co.__joinBattle__(self)
+
+    def __emit__(self, event: ev.BattleEvent):
+        self.events.append(event)
+        if self.listener is not None:
+            self.listener(event)
+
+    def __applyAIModifier__(self, p: pl.Player):
+        # searching ai levels (11-15) have the stats of level 10, they are better at choosing moves only
+        range_top = 5 - min(p.ai, 10)
+        health_penalty_mult = range_top - 1
+        if health_penalty_mult < 0:
+            health_penalty_mult = 0
+        for co in p.creatures:
+            co.health -= math.ceil(0.04 * p.ac.c.health * health_penalty_mult)
+
+        # modify ai damage for different difficulties
+        if range_top > 3:
+            ai_damage_mod = -1
+        elif range_top > -3:
+            ai_damage_mod = 0
+        else:
+            ai_damage_mod = 1
+
+        # modify ai stats for different difficulties
+        ai_stat_mod = 0
+        if range_top > 0:
+            for i in range(0, range_top):
+                ai_stat_mod -= 3
+        elif range_top < 0:
+            for i in range(range_top, 0):
+                ai_stat_mod += 3
+        else:
+            ai_stat_mod = 0
+
+        # hardcore ai regen
+        if range_top < -3:
+            if range_top < -4:
+                ai_hp_regen = 2
+            else:
+                ai_hp_regen = 1
+        else:
+            ai_hp_regen = 0
+
+        # every battle gets it's own modifier, the one in the catalog is shared by all battles
+        modifier = cr.all_status_effects[f"AI MODIFIER {p.id}"].__modified__(
+            aim_mod=ai_stat_mod, defense_mod=ai_stat_mod, damage_mod=ai_damage_mod, damage_low=-ai_hp_regen)
+        for co in p.creatures:
+            co.active_statuses.append(cr.StatusOccurrence(modifier))
+
+    # different ai stats
+    def __startBattle__(self):
+        for p in (self.p1, self.p2):
+            if p.ai >= 0:
+                self.__applyAIModifier__(p)
+
+    def __isOver__(self) -> bool:
+        return self.p1.ac.health <= 0 or self.p2.ac.health <= 0
+
+    # 1 or 2 for the winning player, 0 for a draw or a battle that isn't over
+    def __winner__(self) -> int:
+        if self.p1.ac.health <= 0 and self.p2.ac.health > 0:
+            return 2
+        elif self.p1.ac.health > 0 and self.p2.ac.health <= 0:
+            return 1
+        return 0
+
+    # tick statuses and cooldowns, figure out who's stunned
+    def __startTurn__(self) -> list[ev.BattleEvent, ...]:
+        self.events = []
+
+        self.p1.ac.__tickStatus__()
+        self.p2.ac.__tickStatus__()
+        self.p1.ac.__checkIfStunned__()
+        self.p2.ac.__checkIfStunned__()
+        self.p1.ac.__tickCooldowns__()
+        self.p2.ac.__tickCooldowns__()
+
+        return self.events
+
+    # make chosen moves (-2 for stunned), assumed moves are ai guesses of it's opponent's move
+    # p2_assumed is player 1's guess of player 2's move and vice versa (see Player.__calculateMove__)
+    def __resolveTurn__(self, p1_move_roll: int, p2_move_roll: int,
+                        p2_assumed: int = -1, p2_assumed_mode: str = "",
+                        p1_assumed: int = -1, p1_assumed_mode: str = "") -> list[ev.BattleEvent, ...]:
+        self.events = []
+
+        lg.engine.info("turn %d starts, player 1 health: %d, player 2 health: %d",
+                       self.turn_counter, self.p1.ac.health, self.p2.ac.health)
+
+        p1_move_speed = self.p1.ac.c.moves[p1_move_roll].speed
+        p2_move_speed = self.p2.ac.c.moves[p2_move_roll].speed
+
+        # move order
+        if self.p2.ac.isStunned and not self.p1.ac.isStunned:
+            moves_first = 1
+            moves_second = 0
+        elif not self.p2.ac.isStunned and self.p1.ac.isStunned:
+            moves_first = 2
+            moves_second = 0
+        elif self.p2.ac.isStunned and self.p1.ac.isStunned:
+            moves_first = 0
+            moves_second = 0
+        elif p2_move_speed > p1_move_speed:
+            moves_first = 2
+            moves_second = 1
+        elif p2_move_speed < p1_move_speed:
+            moves_first = 1
+            moves_second = 2
+        else:
+            roll = self.rng.randrange(0, 101)
+            if roll <= 49:
+                moves_first = 1
+                moves_second = 2
+            else:
+                moves_first = 2
+                moves_second = 1
+
+        if not self.p1.ac.isStunned and not self.p2.ac.isStunned:
+            self.__emit__(ev.MovePriorityEvent(p1_move_speed, p2_move_speed, moves_first))
+
+        for p in (self.p1, self.p2):
+            if p.ac.isStunned:
+                lg.engine.debug("player %d is stunned and skips the turn", p.id)
+                self.__emit__(ev.StunnedEvent(p.ac))
+
+        # moves
+        if moves_first == 2:
+            self.__useMove__(self.p2, self.p1, p2_move_roll, p2_assumed, p2_assumed_mode, False)
+
+        if moves_first == 1 or moves_second == 1:
+            self.__useMove__(self.p1, self.p2, p1_move_roll, p1_assumed, p1_assumed_mode, moves_second == 1)
+
+        if moves_second == 2:
+            self.__useMove__(self.p2, self.p1, p2_move_roll, p2_assumed, p2_assumed_mode, True)
+
+        lg.engine.info("turn %d ends, player 1 health: %d, player 2 health: %d",
+                       self.turn_counter, self.p1.ac.health, self.p2.ac.health)
+        self.history.append((p1_move_roll, p2_assumed, p2_assumed_mode, p2_move_roll, p1_assumed, p1_assumed_mode,
+                             self.p1.ac.health, self.p2.ac.health))
+
+        return self.events
+
+    # p makes a move against op, then op checks it's guess of the move (if op is ai)
+    # op_assumed is op's guess of p's move, moving second means p could have been stunned out of it's move
+    def __useMove__(self, p: pl.Player, op: pl.Player, move_roll: int,
+                    op_assumed: int, op_assumed_mode: str, moves_second: bool):
+        if moves_second:
+            p.ac.__checkIfStunned__()
+            if p.ac.isStunned:
+                lg.engine.debug("player %d is stunned out of his move and skips the turn", p.id)
+                self.__emit__(ev.StunnedEvent(p.ac))
+                return
+
+        p.ac.__makeMove__(op.ac, p.ac.c.moves[move_roll])
+        p.ac.cooldowns[move_roll] = p.ac.c.moves[move_roll].cooldown + 1
+        self.move_count[p.id - 1][move_roll] += 1
+        move_name = p.ac.c.moves[move_roll].name
+        self.move_usage[p.id - 1][move_name] = self.move_usage[p.id - 1].get(move_name, 0) + 1
+
+        if op.ai >= 0:
+            op.risk_evaluation(op_assumed, p.ac.c.moves[op_assumed].name, move_roll, op_assumed_mode)
+
+    # fainted creatures are replaced if possible
+    def __endTurn__(self) -> list[ev.BattleEvent, ...]:
+        self.events = []
+
+        for p in (self.p1, self.p2):
+            if p.ac.health <= 0:
+                has_replacement = len(p.creatures) > p.ac_index + 1
+                self.__emit__(ev.FaintEvent(p.ac, has_replacement))
+                if has_replacement:
+                    p.ac_index += 1
+                    p.ac = p.creatures[p.ac_index]
+                    self.__emit__(ev.JoinEvent(p.ac))
+                    lg.engine.info("player %d switches to %s", p.id, p.ac.c.name)
+
+        self.turn_counter += 1
+
+        return self.events
+
+    # play the whole battle out with both players controlled by ai, returns the winner
+    def __playAIBattle__(self) -> int:
+        self.__startBattle__()
+
+        while not self.__isOver__():
+            self.__playAITurn__()
+
+        self.__finishBattle__()
+        return self.__winner__()
+
+    # play one whole turn with both players controlled by ai
+    def __playAITurn__(self):
+        self.__startTurn__()
+
+        moves = []
+        for p, op in ((self.p1, self.p2), (self.p2, self.p1)):
+            if p.ac.isStunned:
+                moves.append((-2, -1, ""))
+            else:
+                moves.append(p.__calculateMove__(op.ac))
+
+        self.__resolveTurn__(moves[0][0], moves[1][0], moves[0][1], moves[0][2], moves[1][1], moves[1][2])
+        self.__endTurn__()
+
+    # announce the winner
+    def __finishBattle__(self) -> list[ev.BattleEvent, ...]:
+        self.events = []
+
+        winner = self.__winner__()
+        if winner == 0:
+            lg.engine.info("draw, no one wins")
+        else:
+            lg.engine.info("player %d wins", winner)
+        self.__emit__(ev.BattleEndEvent(winner))
+
+        lg.engine.info("player 1 health: %d, player 2 health: %d", self.p1.ac.health, self.p2.ac.health)
+        for p in (self.p1, self.p2):
+            lg.engine.info("player %d move count & health healed: %s & %d",
+                           p.id, self.move_count[p.id - 1], p.ac.total_damage_healed)
+
+        return self.events
@@ -0,0 +1,179 @@
+from __future__ import annotations  # type hinting without importing creatures (no circular imports)
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import scripts.creatures as cr
+
+
+# battle events are emitted by the battle engine (and creatures inside it) whenever something happens
+# they carry everything needed to describe what happened, so anything can listen:
+# BattleScene animates them, simulations count them or simply ignore them
+# events are emitted BEFORE the state changes they describe, unless stated otherwise,
+# so a listener reacting immediately still sees the state from before the change
+class BattleEvent:
+    pass
+
+
+# a creature's statuses start ticking at the start of a turn
+class TickStartEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence):
+        self.co = co
+
+
+# a status ran out and is about to be removed (index out of count is for display)
+class StatusExpiredEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, so: cr.StatusOccurrence, index: int, count: int):
+        self.co = co
+        self.so = so
+        self.index = index
+        self.count = count
+
+
+# a status is still active and is about to tick (index out of count is for display)
+class StatusTickEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, so: cr.StatusOccurrence, index: int, count: int):
+        self.co = co
+        self.so = so
+        self.index = index
+        self.count = count
+
+
+# all statuses of a creature were ticked, emitted after all changes
+class TickEndEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence):
+        self.co = co
+
+
+# creature is stunned and skips it's move
+class StunnedEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence):
+        self.co = co
+
+
+# who moves first - only emitted when neither creature is stunned
+class MovePriorityEvent(BattleEvent):
+    def __init__(self, p1_move_speed: int, p2_move_speed: int, moves_first: int):
+        self.p1_move_speed = p1_move_speed
+        self.p2_move_speed = p2_move_speed
+        self.moves_first = moves_first
+
+
+# creature starts making a move
+class MoveStartEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, move: cr.Move):
+        self.co = co
+        self.move = move
+
+
+# creature spends rage on a move
+class RageSpentEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, rage_cost: int):
+        self.co = co
+        self.rage_cost = rage_cost
+
+
+# one of the move's hit attempts (attempt counts from 1)
+class MoveAttemptEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, move: cr.Move, attempt: int, attempts: int):
+        self.co = co
+        self.move = move
+        self.attempt = attempt
+        self.attempts = attempts
+
+
+# a roll for hit or for status against a chance
+class RollEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, roll: int, chance: int, for_status: bool = False):
+        self.co = co
+        self.roll = roll
+        self.chance = chance
+        self.for_status = for_status
+
+
+# result of a hit attempt
+# result is one of "CONNECTED" (self-targeting moves), "HIT", "GRAZED" or "MISSED"
+# effectiveness is the damage multiplier of target's types against the move's type
+class HitEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, target: cr.CreatureOccurrence, result: str,
+                 effectiveness: float = 1):
+        self.co = co
+        self.target = target
+        self.result = result
+        self.effectiveness = effectiveness
+
+
+# creature is about to take damage (negative damage heals)
+class DamageEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, damage: int):
+        self.co = co
+        self.damage = damage
+
+
+# creature's health was changed, emitted after the change
+class HealthChangedEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, prev_health: int):
+        self.co = co
+        self.prev_health = prev_health
+
+
+# status occurrence is about to be applied to creature
+class StatusAppliedEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, so: cr.StatusOccurrence):
+        self.co = co
+        self.so = so
+
+
+# status roll failed
+class StatusMissedEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, se: cr.StatusEffect):
+        self.co = co
+        self.se = se
+
+
+# status occurrence is about to be extinguished from creature
+class StatusExtinguishedEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, so: cr.StatusOccurrence):
+        self.co = co
+        self.so = so
+
+
+# attacker is about to take thorn damage from target (negative damage means leeching health)
+class ThornEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, target: cr.CreatureOccurrence, damage: int):
+        self.co = co
+        self.target = target
+        self.damage = damage
+
+
+# creature finished making a move
+class MoveEndEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, move: cr.Move):
+        self.co = co
+        self.move = move
+
+
+# ai player checked whether it guessed opponent's move correctly
+# text holds four lines describing the guess and the outcome
+class RiskEvaluationEvent(BattleEvent):
+    def __init__(self, player_id: int, text: list[str, str, str, str]):
+        self.player_id = player_id
+        self.text = text
+
+
+# creature fainted, emitted before it's replaced
+class FaintEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence, has_replacement: bool):
+        self.co = co
+        self.has_replacement = has_replacement
+
+
+# creature joined the battle to replace a fainted one, emitted after the switch
+class JoinEvent(BattleEvent):
+    def __init__(self, co: cr.CreatureOccurrence):
+        self.co = co
+
+
+# battle is over, winner is 1 or 2 (0 means draw)
+class BattleEndEvent(BattleEvent):
+    def __init__(self, winner: int):
+        self.winner = winner
@@ -1,14 +1,22 @@
+from __future__ import annotations  # type hinting players without importing them (see below)
 import math
 import random
 import sys
+from collections import OrderedDict
+from time import perf_counter, sleep
 
 import pygame
 import os  # os.path.join
 
+import scripts.assets as assets
 import scripts.creatures as cr
+import scripts.events as ev
+import scripts.logs as lg
+from typing import TYPE_CHECKING
 # import scripts.battle as sb #imported through BattleScene constructor
-import scripts.player as pl
-import scripts.spritesheet as ss
+# import scripts.player as pl #imported when players are made, ai tables aren't needed to show the menus
+if TYPE_CHECKING:
+    import scripts.player as pl
 
 # some color presets
 class Color:
@@ -36,6 +44,8 @@ class Keys:
         # pygame keycodes of all pressed down keys
         keys_down: list[int, ...]
         self.keys_down = []
+        # keys pressed during delays, handed over with the next frame
+        self.keys_delayed = []
 
         # changeable key definitions for menu traversal and playing, for both players
         self.Q, self.W, self.E, self.A, self.S, self.D = [pygame.K_q, pygame.K_KP4], [pygame.K_w, pygame.K_KP5], [
@@ -53,16 +63,23 @@ class Keys:
 
     def __clearKeys__(self):
         self.keys_down.clear()
+        self.keys_down.extend(self.keys_delayed)
+        self.keys_delayed.clear()
 
 
 # the base for user interface
 class GUI:
-    def __init__(self):
-        pygame.init()
+    # startup (see startup.py) is told about the window and the first frame
+    def __init__(self, startup=None):
+        # only the parts of pygame the game uses, the rest (i.e. mixer looking for audio devices) slows down starting
+        pygame.display.init()
+        pygame.font.init()
+        self.startup = startup
         self.running = True
         self.paused = False
         self.return_to_menu = False
         self.skip_animations = False
+        self.replay_path = None  # finished battles are recorded to this replay file if it's set (see recording.py)
 
         pygame.display.set_caption('PYTHON CREATURE ARENA - Dawid Leszczynski WCY19IJ1S1')
         self.DISPLAY_W, self.DISPLAY_H = 1920, 1080
@@ -70,37 +87,115 @@ class GUI:
         self.display_paused = pygame.Surface((self.DISPLAY_W, self.DISPLAY_H)) # semi-transparent display
         self.display_paused_text = pygame.Surface((self.DISPLAY_W, self.DISPLAY_H)) # to be displayed on top of display_paused
         self.window = pygame.display.set_mode((self.DISPLAY_W, self.DISPLAY_H), pygame.RESIZABLE)
+        if self.startup is not None:
+            self.startup.__mark__("window")
 
         dirname = os.path.dirname(__file__)
         self.font_path = os.path.join(dirname, '../assets/art/fonts/GOODTIME.ttf')
+        # fonts by scaled pixel size, parsing the font file for every text is slow
+        self.fonts = {}
+        self.font_cache_hits = 0
+        self.font_cache_misses = 0
+        # rendered text surfaces, least recently used are evicted when over memory cap (in bytes)
+        self.text_cache = OrderedDict()
+        self.text_cache_bytes = 0
+        self.text_cache_max_bytes = 32 * 1024 * 1024
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+        self.text_cache_evictions = 0
         self.colors = Color()
         self.keys = Keys()
         self.allowed_speed = [0.5, 1, 1.5, 2, 3, 4, 6, 50]
         self.current_speed_index = 2
         self.speed = self.allowed_speed[self.current_speed_index]
-        self.delay_clock = pygame.time.Clock()
+        # frame scheduler - waiting sleeps instead of spinning, idle screens are capped at fps
+        self.fps = 60
+        self.frame_clock = pygame.time.Clock()
+        # whether the whole window has to be updated with the next frame, even if the scene gives dirty rects
+        # (at the start, after a resize and after the pause menu covered everything)
+        self.full_update = True
 
         self.main_menu = self.current_scene = MainMenuScene(self)
 
     # delay a certain amount of milliseconds
+    # sleeps at most a frame at a time and handles events in between, so the game can be paused during delays
     def __delay__(self, time: int):
-        time = time / self.speed
-        before = now = self.delay_clock.tick()
-        while now <= before + time:
-            now += self.delay_clock.tick()
+        time_left = time / self.speed
+        before = perf_counter()
+        while True:
+            sleep(max(0, min(time_left, 1000 / self.fps)) / 1000)
+            now = perf_counter()
+            time_left -= (now - before) * 1000
+            before = now
+
+            # pressed keys are kept for the next frame, like they would be without the delay
+            self.__checkEvents__(self.keys.keys_delayed)
 
             if self.paused: # pause the delay
-                dt = 0
-                while self.paused: # if paused, keep "pausing" the clock
-                    dt += self.delay_clock.tick()
-                    now += dt
-                    before += dt
-                    self.__blitScreen__() # to be able to unpause at all during delay and display pause menu - event handling and all those good things
-                time = time / self.speed # update time, as speed could have been altered
+                speed = self.speed
+                while self.paused:
+                    self.__blitScreen__() # display pause menu and handle events until unpaused
+                    self.frame_clock.tick(self.fps)
+                before = perf_counter() # time spent paused doesn't count
+                time_left = time_left * speed / self.speed # update time, as speed could have been altered
                 self.__blitScreen__()
-            if self.return_to_menu:
+            if self.return_to_menu or time_left <= 0:
                 return
 
+    # sleep until perf_counter() reaches end (in seconds), events are not handled
+    def __sleepUntil__(self, end: float):
+        now = perf_counter()
+        if now < end:
+            sleep(end - now)
+
+    # end an idle frame (menus), sleeping so it doesn't run faster than fps
+    # part of the frame converts art decoded in the background, so battles don't have to load it
+    def __nextFrame__(self):
+        assets.store.__convertLoaded__(0.5 / self.fps)
+        self.frame_clock.tick(self.fps)
+        if self.startup is not None:
+            self.startup.__finish__()
+            self.startup = None
+
+    # how much of the art requested in the background is ready, shown in a corner until all of it is
+    def __blitLoadingProgress__(self):
+        done, requested = assets.store.loader.__progress__()
+        if done < requested:
+            self.__blitText__(f"LOADING ART {done}/{requested}", 20, 1780, 1050, self.colors.LIGHT_GRAY)
+
+    # get font of scaled pixel size, loading it only the first time
+    def __getFont__(self, size: int) -> pygame.font.Font:
+        font = self.fonts.get(size)
+        if font is None:
+            self.font_cache_misses += 1
+            font = pygame.font.Font(self.font_path, size)
+            self.fonts[size] = font
+        else:
+            self.font_cache_hits += 1
+        return font
+
+    # get rendered text of scaled pixel size, rendering it only if it isn't cached
+    def __renderText__(self, text: str, size: int, color: tuple[int, int, int]) -> pygame.Surface:
+        key = (text, size, color, self.DISPLAY_W)
+        text_surface = self.text_cache.get(key)
+        if text_surface is not None:
+            self.text_cache_hits += 1
+            self.text_cache.move_to_end(key)
+            return text_surface
+
+        self.text_cache_misses += 1
+        text_surface = self.__getFont__(size).render(text, True, color)
+        self.text_cache[key] = text_surface
+        self.text_cache_bytes += text_surface.get_width() * text_surface.get_height() * text_surface.get_bytesize()
+
+        # evict least recently used text, but always keep the newest one
+        while self.text_cache_bytes > self.text_cache_max_bytes and len(self.text_cache) > 1:
+            old_key, old_surface = self.text_cache.popitem(last=False)
+            self.text_cache_bytes -= old_surface.get_width() * old_surface.get_height() * old_surface.get_bytesize()
+            self.text_cache_evictions += 1
+
+        return text_surface
+
     # draw text centered around x and y coordinates
     def __blitText__(self, text: str, size: int, x: float, y: float, color: tuple[int, int, int], display: pygame.Surface = None):
 
@@ -114,8 +209,7 @@ class GUI:
         x *= res_mp
         y *= res_mp
 
-        font = pygame.font.Font(self.font_path, size)
-        text_surface = font.render(text, True, color)
+        text_surface = self.__renderText__(text, size, color)
         text_rect = text_surface.get_rect()
         text_rect.center = (x, y)
         if display is None:
@@ -123,8 +217,17 @@ class GUI:
         else:
             display.blit(text_surface, text_rect)
 
-    # update game based on events
-    def __checkEvents__(self):
+    # where text centered around x and y coordinates would be drawn
+    def __textRect__(self, text: str, size: int, x: float, y: float) -> pygame.Rect:
+        res_mp = self.DISPLAY_W / 1920
+        text_rect = pygame.Rect((0, 0), self.__getFont__(int(size * res_mp)).size(text))
+        text_rect.center = (x * res_mp, y * res_mp)
+        return text_rect
+
+    # update game based on events, pressed keys are added to keys_down (keys.keys_down if None)
+    def __checkEvents__(self, keys_down: list[int, ...] = None):
+        if keys_down is None:
+            keys_down = self.keys.keys_down
 
         # check all pending events
         for event in pygame.event.get():
@@ -150,9 +253,15 @@ class GUI:
                 self.display_paused = pygame.Surface((self.DISPLAY_W, self.DISPLAY_H))
                 self.display_paused_text = pygame.Surface((self.DISPLAY_W, self.DISPLAY_H))
                 self.window = pygame.display.set_mode((self.DISPLAY_W, self.DISPLAY_H), pygame.RESIZABLE)
+                self.full_update = True
+
+                # fonts and texts of old sizes won't be needed anymore
+                self.fonts.clear()
+                self.text_cache.clear()
+                self.text_cache_bytes = 0
 
                 # rescale images
-                print(f"current_scene {self.current_scene.__class__.__name__}")
+                lg.gui.debug("current_scene %s", self.current_scene.__class__.__name__)
                 self.current_scene.__rescaleEvent__()
 
             # check keys
@@ -179,16 +288,25 @@ class GUI:
                     if event.key == self.keys.INFO[0] or event.key == self.keys.INFO[1]:
                         self.skip_animations = not self.skip_animations
                 else:
-                    self.keys.keys_down.append(event.key)
+                    keys_down.append(event.key)
 
     # blit screen, clear keys and check events
-    def __blitScreen__(self):
-        self.window.blit(self.display, (0, 0))
+    # with dirty rects given, only those regions of the window are updated
+    def __blitScreen__(self, rects: list[pygame.Rect, ...] = None):
+        if rects is None or self.full_update or self.paused:
+            self.window.blit(self.display, (0, 0))
+
+            if self.paused:
+                self.__blitPaused__()
 
-        if self.paused:
-            self.__blitPaused__()
+            pygame.display.update()
+            # pause menu covers the whole window, so it has to be updated whole again after unpausing
+            self.full_update = self.paused
+        else:
+            for rect in rects:
+                self.window.blit(self.display, rect, rect)
+            pygame.display.update(rects)
 
-        pygame.display.update()
         self.keys.__clearKeys__()
         self.__checkEvents__()
 
@@ -231,17 +349,47 @@ class Scene:
     def __rescaleEvent__(self):
         pass
 
+# art of battles that doesn't depend on creatures - hud, boxes, battle textbox, universal abilities and statuses
+# (the same files BattleScene loads)
+def interface_asset_paths() -> list[str, ...]:
+    art = os.path.join(os.path.dirname(__file__), '../assets/art')
+    paths = [os.path.join(art, 'interface/textbox_battle_sprite.png'), os.path.join(art, 'interface/hud.png'),
+             os.path.join(art, 'interface/selected_ability.png'), os.path.join(art, 'interface/selected_status.png'),
+             os.path.join(art, 'interface/abilities/universal/5.png'),
+             os.path.join(art, 'interface/abilities/universal/6.png')]
+    for p_id in (1, 2):
+        for box in ('infobox', 'typebox', 'creaturebox'):
+            paths.append(os.path.join(art, f'interface/p{p_id}_{box}.png'))
+    for name in cr.all_status_effects:
+        paths.append(os.path.join(art, f'interface/statuses/{name}.png'))
+    return paths
+
+
+# art of a creature - idle sprite sheet and abilities
+def creature_asset_paths(c: cr.Creature) -> list[str, ...]:
+    art = os.path.join(os.path.dirname(__file__), '../assets/art')
+    paths = [os.path.join(art, f'creatures/{c.name}/{c.name}_idle_sprite.png')]
+    for j in range(0, 5):
+        paths.append(os.path.join(art, f'interface/abilities/{c.name}/{j}.png'))
+    return paths
+
+
 class MatchSettingsScene(Scene):
     def __init__(self, gui):
         Scene.__init__(self, gui)
-        self.text = ['START MATCH', 'PLAYER', 'CREATURE 1', 'CREATURE 2', 'CREATURE 3']
-        self.text_offset_mp = [-150, 100, 200, 300, 400]
+        self.text = ['START MATCH', 'PLAYER', 'CREATURE 1', 'CREATURE 2', 'CREATURE 3', 'FAST FORWARD']
+        self.text_offset_mp = [-150, 100, 200, 300, 400, 500]
         self.selected_x = 0
         self.selected_y = 0
         self.max_x = 1
-        self.max_y = 5
+        self.max_y = 6
         self.player_ai = [-1, -1]
         self.player_creatures = [[-1, -2, -2], [-1, -2, -2]]
+        # fast forward of ai vs ai battles - None is off, 0 shows the result only, n shows every n-th turn
+        self.fast_forward_options = [None, 0, 1, 5, 10]
+        self.fast_forward_index = 0
+        # creature selection the art was requested for
+        self.preloaded = None
 
     def __updateSelected__(self):
         for k in self.gui.keys.keys_down:
@@ -268,11 +416,13 @@ class MatchSettingsScene(Scene):
                     if len(player1_creatures) <= 0 or len(player2_creatures) <= 0:
                         return
 
+                    import scripts.player as pl
                     player1 = pl.Player(1, player1_creatures, self.player_ai[0])
                     player2 = pl.Player(2, player2_creatures, self.player_ai[1])
 
                     self.run_display = False
-                    self.gui.current_scene = BattleScene(self.gui, player1, player2, False)
+                    self.gui.current_scene = BattleScene(self.gui, player1, player2, False,
+                                                         fast_forward=self.fast_forward_options[self.fast_forward_index])
 
             if k == self.gui.keys.DOWN or k == self.gui.keys.S[0] or k == self.gui.keys.S[1]: # one down
                 self.selected_y = (self.selected_y + 1) % self.max_y
@@ -283,8 +433,10 @@ class MatchSettingsScene(Scene):
             if k == self.gui.keys.LEFT or k == self.gui.keys.A[0] or k == self.gui.keys.A[1]: # change left side
                 if self.selected_y == 1: # ai
                     self.player_ai[0] += 1
-                    if self.player_ai[0] > 10:
+                    if self.player_ai[0] > 15:
                         self.player_ai[0] = -1
+                elif self.selected_y == 5: # fast forward
+                    self.fast_forward_index = (self.fast_forward_index - 1) % len(self.fast_forward_options)
                 elif self.selected_y >= 2: # creature
                     self.player_creatures[0][self.selected_y - 2] += 1
                     if self.player_creatures[0][self.selected_y - 2] >= len(cr.all_creatures):
@@ -293,19 +445,37 @@ class MatchSettingsScene(Scene):
             if k == self.gui.keys.RIGHT or k == self.gui.keys.D[0] or k == self.gui.keys.D[1]: # change right side
                 if self.selected_y == 1: # ai
                     self.player_ai[1] += 1
-                    if self.player_ai[1] > 10:
+                    if self.player_ai[1] > 15:
                         self.player_ai[1] = -1
+                elif self.selected_y == 5: # fast forward
+                    self.fast_forward_index = (self.fast_forward_index + 1) % len(self.fast_forward_options)
                 elif self.selected_y >= 2: # creature
                     self.player_creatures[1][self.selected_y - 2] += 1
                     if self.player_creatures[1][self.selected_y - 2] >= len(cr.all_creatures):
                         self.player_creatures[1][self.selected_y - 2] = -2
 
+    # art of the selected creatures (all of them for a random one) is loaded in the background
+    def __preloadSelected__(self):
+        selected = [list(creatures) for creatures in self.player_creatures]
+        if selected == self.preloaded:
+            return
+        self.preloaded = selected
+
+        paths = interface_asset_paths()
+        indices = set(index for creatures in self.player_creatures for index in creatures if index != -2)
+        if -1 in indices:
+            indices = range(0, len(cr.all_creatures))
+        for index in indices:
+            paths += creature_asset_paths(cr.all_creatures[index])
+        assets.store.__preload__(paths)
+
     def __displayScene__(self):
         while self.run_display:
             self.gui.return_to_menu = False
             self.gui.display.fill(self.gui.colors.GRAY)
             self.__updateSelected__()
-            for i in range(0, 5):
+            self.__preloadSelected__()
+            for i in range(0, self.max_y):
                 if i == self.selected_y:
                     color = self.color_text_selected
                 else:
@@ -314,7 +484,7 @@ class MatchSettingsScene(Scene):
                 text_size_2 = 30
                 text_size_3 = 90
                 text_x = 960
-                text_y = 300
+                text_y = 260
 
                 if i == 0:
                     size = text_size_3
@@ -343,6 +513,21 @@ class MatchSettingsScene(Scene):
                     self.gui.__blitText__(player_text, text_size_2, text_x + 400,
                                             text_y + self.text_offset_mp[i], self.gui.colors.BLEEDING_WHITE)
 
+                elif i == 5:
+                    fast_forward = self.fast_forward_options[self.fast_forward_index]
+                    if fast_forward is None:
+                        fast_forward_text = "OFF"
+                    elif fast_forward == 0:
+                        fast_forward_text = "RESULT ONLY"
+                    elif fast_forward == 1:
+                        fast_forward_text = "SHOW EVERY TURN"
+                    else:
+                        fast_forward_text = f"SHOW EVERY {fast_forward} TURNS"
+                    if fast_forward is not None and (self.player_ai[0] == -1 or self.player_ai[1] == -1):
+                        fast_forward_text += " (AI VS AI ONLY)"
+                    self.gui.__blitText__(f"< {fast_forward_text} >", text_size_2, text_x,
+                                          text_y + self.text_offset_mp[i] + 55, self.gui.colors.NEARLY_WHITE)
+
                 elif i >= 2:
                     if self.player_creatures[0][i - 2] == -2:
                         p1_creature_name = "NONE"
@@ -371,14 +556,16 @@ class MatchSettingsScene(Scene):
 
                     if i == 2:
                         self.gui.__blitText__(p1_creature_description, text_size_2, text_x,
-                                              text_y + self.text_offset_mp[i] + 350, self.gui.colors.CYANISH_WHITE)
+                                              text_y + self.text_offset_mp[i] + 400, self.gui.colors.CYANISH_WHITE)
                         self.gui.__blitText__("--- VS ---", text_size, text_x,
-                                              text_y + self.text_offset_mp[i] + 410, self.gui.colors.WHITE)
+                                              text_y + self.text_offset_mp[i] + 460, self.gui.colors.WHITE)
                         self.gui.__blitText__(p2_creature_description, text_size_2, text_x,
-                                              text_y + self.text_offset_mp[i] + 470, self.gui.colors.BLEEDING_WHITE)
+                                              text_y + self.text_offset_mp[i] + 520, self.gui.colors.BLEEDING_WHITE)
 
 
+            self.gui.__blitLoadingProgress__()
             self.gui.__blitScreen__()
+            self.gui.__nextFrame__()
 
 
 # main menu of the game
@@ -428,6 +615,7 @@ class MainMenuScene(Scene):
                     random_creature_index = random.randrange(0, len(cr.all_creatures))
                     player2_creatures.append(cr.CreatureOccurrence(cr.all_creatures[random_creature_index]))
 
+                    import scripts.player as pl
                     player1 = pl.Player(1, player1_creatures, -1)
                     player2 = pl.Player(2, player2_creatures, -1)
 
@@ -441,6 +629,8 @@ class MainMenuScene(Scene):
 
     # blit menu
     def __displayScene__(self):
+        # art every battle needs starts loading right away
+        assets.store.__preload__(interface_asset_paths())
         while self.run_display:
             self.gui.return_to_menu = False
             self.__updateSelected__()
@@ -456,11 +646,16 @@ class MainMenuScene(Scene):
                 text_x = 960
                 text_y = 540
                 self.gui.__blitText__(self.text[i], text_size, text_x, text_y + self.text_offset_mp[i], color)
+            self.gui.__blitLoadingProgress__()
             self.gui.__blitScreen__()
+            self.gui.__nextFrame__()
 
 
 class BattleScene(Scene):
-    def __init__(self, gui: GUI, p1: pl.Player, p2: pl.Player, testing: bool = False):
+    # seed of the battle's rolls, a random one if None, replay is a recorded match to play again,
+    # fast_forward skips the animations of an ai vs ai battle (see Battle)
+    def __init__(self, gui: GUI, p1: pl.Player, p2: pl.Player, testing: bool = False, seed: int = None,
+                 replay=None, fast_forward: int = None):
         Scene.__init__(self, gui)
         self.health_color = gui.colors.RED
         self.background_color = self.gui.colors.GRAY
@@ -498,7 +693,9 @@ class BattleScene(Scene):
         self.player_selected_z = [1, 1]
 
         self.testing = testing # whether to load battle or creature index
-        self.hud_clock = pygame.time.Clock() # for hud hotfix
+
+        # random numbers for looks only (sprite timing, suspense numbers), apart from the battle's rolls
+        self.cosmetic_rng = random.Random()
 
         # creature animations are on separate clocks so they are not synchronized
         self.animation_clock = [pygame.time.Clock(), pygame.time.Clock()]
@@ -526,6 +723,10 @@ class BattleScene(Scene):
         self.creature_abilities_mini_images = [[], []]
         self.creature_active_statuses_images = [[], []]
 
+        # static part of the hud (ability backgrounds and icons, hud frame) pre-composited into one image,
+        # built for current creatures and resolution when needed
+        self.hud_layer = None
+
         # open images
         self.__rescaleEvent__()
 
@@ -534,15 +735,17 @@ class BattleScene(Scene):
             for p_id in (0, 1):
                 self.animation_now[p_id] = self.animation_before[p_id] = self.animation_clock[p_id].tick()
             import scripts.battle as sb
-            sb.Battle(self, p1, p2)
+            sb.Battle(self, p1, p2, seed, replay, fast_forward)
 
-    def __cyclePrimarySprites__(self):
+    # returns ids of players whose creature sprites changed
+    def __cyclePrimarySprites__(self) -> list[int, ...]:
+        changed = []
         # for each player
         for p_id in (0, 1):
             self.animation_now[p_id] += self.animation_clock[p_id].tick() # clock goes tick-tock
 
             # should you cycle? with minimal random time to spice things up
-            random_time = random.randrange(100, 200)
+            random_time = self.cosmetic_rng.randrange(100, 200)
             if self.animation_now[p_id] > self.animation_before[p_id] + random_time:
 
                 # constraints
@@ -556,10 +759,13 @@ class BattleScene(Scene):
                     self.creature_idle_images_index[p_id] += 1
                 else:
                     self.creature_idle_images_index[p_id] -= 1
+                changed.append(p_id)
 
                 # new time
                 self.animation_now[p_id] = self.animation_before[p_id] = self.animation_clock[p_id].tick()
 
+        return changed
+
     # blits creatures and shows textbox over them if needed
     def __blitPrimarySprites__(self):
         # resolution scaling multiplier
@@ -574,8 +780,37 @@ class BattleScene(Scene):
         # textbox comes second
         self.__keepTextboxText__()
 
+    # draw a frame with draw() and show it
+    # with dirty rects given, only those regions are drawn (everything else is clipped) and updated on the window,
+    # so the first frame of an animation should be drawn whole and the following ones only where they change
+    def __drawFrame__(self, draw, rects: list[pygame.Rect, ...] = None):
+        if rects is None or self.gui.full_update:
+            draw()
+            self.gui.__blitScreen__()
+            return
+
+        # draw is still called when nothing changed, hud keeps the pace of the frames
+        if len(rects) > 0:
+            self.gui.display.set_clip(rects[0].unionall(rects[1:]))
+        else:
+            self.gui.display.set_clip(pygame.Rect(0, 0, 0, 0))
+        draw()
+        self.gui.display.set_clip(None)
+        self.gui.__blitScreen__(rects)
+
+    # regions of the screen for dirty rects
+    def __spriteRect__(self, p_id: int) -> pygame.Rect:
+        res_mp = self.gui.DISPLAY_W / 1920
+        rect = self.creature_idle_images[p_id][self.creature_idle_images_index[p_id]].get_rect()
+        return rect.move((180 + 960 * p_id) * res_mp, 240 * res_mp)
+
+    def __textboxRect__(self) -> pygame.Rect:
+        res_mp = self.gui.DISPLAY_W / 1920
+        return self.textbox_images[9].get_rect().move((230 * res_mp, 679 * res_mp))
+
     def __rescaleEvent__(self):
-        print(f"rescale {self.gui.DISPLAY_W}x{self.gui.DISPLAY_H}")
+        lg.gui.debug("rescale %dx%d", self.gui.DISPLAY_W, self.gui.DISPLAY_H)
+        self.hud_layer = None
         self.__updateHUDImages__()
         self.__updateCreatureImages__()
         self.__updateStatusImages__()
@@ -718,9 +953,6 @@ class BattleScene(Scene):
             self.p1.ac = self.p1.creatures[0]
             self.p2.ac = self.p2.creatures[0]
 
-            self.p1.ac.__joinBattleScene__(self)
-            self.p2.ac.__joinBattleScene__(self)
-
             self.__updateCreatureImages__()
 
             while self.testing:
@@ -741,6 +973,7 @@ class BattleScene(Scene):
 
     def __updateHUDImages__(self):
         res_mp = self.gui.DISPLAY_W / 1920
+        display_size = (self.gui.DISPLAY_W, self.gui.DISPLAY_H)
 
         # clears
         self.textbox_images.clear()
@@ -752,47 +985,33 @@ class BattleScene(Scene):
 
         # get animated textbox
         textbox_sprite_path = os.path.join(self.dirname, f'../assets/art/interface/textbox_battle_sprite.png')
-        textbox_sprite_sheet = ss.SpriteSheet(textbox_sprite_path)
         textbox_sprite_name = 'textbox_battle'
+        textbox_sprites = assets.store.__getSprites__(textbox_sprite_path, (1460 * res_mp, 140 * res_mp))
         for i in range(1, 11):
-            image = textbox_sprite_sheet.parse_sprite(f'{textbox_sprite_name}{i}')
-            image = pygame.transform.scale(image, (1460 * res_mp, 140 * res_mp))
-            self.textbox_images.append(image)
+            self.textbox_images.append(textbox_sprites[f'{textbox_sprite_name}{i}'])
 
         # get hud
         hud_path = os.path.join(self.dirname, f'../assets/art/interface/hud.png')
-        image = pygame.image.load(hud_path)
-        image = pygame.transform.scale(image, (self.gui.DISPLAY_W, self.gui.DISPLAY_H))
-        self.player_hud_images.append(image)
+        self.player_hud_images.append(assets.store.__getImage__(hud_path, display_size))
 
         for p_id in (1, 2):
             # get infoboxes
             infobox_path = os.path.join(self.dirname, f'../assets/art/interface/p{p_id}_infobox.png')
-            image = pygame.image.load(infobox_path)
-            image = pygame.transform.scale(image, (self.gui.DISPLAY_W, self.gui.DISPLAY_H))
-            self.player_infobox_images.append(image)
+            self.player_infobox_images.append(assets.store.__getImage__(infobox_path, display_size))
 
             # get typeboxes
             typebox_path = os.path.join(self.dirname, f'../assets/art/interface/p{p_id}_typebox.png')
-            image = pygame.image.load(typebox_path)
-            image = pygame.transform.scale(image, (self.gui.DISPLAY_W, self.gui.DISPLAY_H))
-            self.player_typebox_images.append(image)
+            self.player_typebox_images.append(assets.store.__getImage__(typebox_path, display_size))
 
             # get creatureboxes
             creaturebox_path = os.path.join(self.dirname, f'../assets/art/interface/p{p_id}_creaturebox.png')
-            image = pygame.image.load(creaturebox_path)
-            image = pygame.transform.scale(image, (self.gui.DISPLAY_W, self.gui.DISPLAY_H))
-            self.player_creaturebox_images.append(image)
+            self.player_creaturebox_images.append(assets.store.__getImage__(creaturebox_path, display_size))
 
         # get infobox selected ability and status
         selected_path = os.path.join(self.dirname, f'../assets/art/interface/selected_ability.png')
-        image = pygame.image.load(selected_path)
-        image = pygame.transform.scale(image, (85 * res_mp, 46 * res_mp))
-        self.selected_images.append(image)
+        self.selected_images.append(assets.store.__getImage__(selected_path, (85 * res_mp, 46 * res_mp)))
         selected_path = os.path.join(self.dirname, f'../assets/art/interface/selected_status.png')
-        image = pygame.image.load(selected_path)
-        image = pygame.transform.scale(image, (65 * res_mp, 26 * res_mp))
-        self.selected_images.append(image)
+        self.selected_images.append(assets.store.__getImage__(selected_path, (65 * res_mp, 26 * res_mp)))
 
     def __updateStatusImages__(self):
         res_mp = self.gui.DISPLAY_W / 1920
@@ -803,12 +1022,12 @@ class BattleScene(Scene):
 
             for so in p.ac.active_statuses:
                 path = os.path.join(self.dirname, f'../assets/art/interface/statuses/{so.se.name}.png')
-                image = pygame.image.load(path)
-                image = pygame.transform.scale(image, (54 * res_mp, 15 * res_mp))
+                image = assets.store.__getImage__(path, (54 * res_mp, 15 * res_mp))
                 self.creature_active_statuses_images[i].append(image)
 
     def __updateCreatureImages__(self):
         res_mp = self.gui.DISPLAY_W / 1920
+        self.hud_layer = None
 
         # creature specific - do one player after another
         for p in (self.p1, self.p2):
@@ -819,39 +1038,31 @@ class BattleScene(Scene):
 
             # creatures
             creature_idle_path = os.path.join(self.dirname, f'../assets/art/creatures/{p.ac.c.name}/{p.ac.c.name}_idle_sprite.png')
-            creature_idle_sprite_sheet = ss.SpriteSheet(creature_idle_path)
             sprite_name = 'idle_'
+            # flip the images for player 1
+            idle_sprites = assets.store.__getSprites__(creature_idle_path, (600 * res_mp, 600 * res_mp), i == 0)
             for j in range(0, 5):
-                image = creature_idle_sprite_sheet.parse_sprite(f'{sprite_name}{j + 1}')
-                image = pygame.transform.scale(image, (600 * res_mp, 600 * res_mp))
-                if i == 0: # flip the image for player 1
-                    image = pygame.transform.flip(image, True, False)
-                self.creature_idle_images[i].append(image)
+                self.creature_idle_images[i].append(idle_sprites[f'{sprite_name}{j + 1}'])
 
             for j in range(0, 5):
                 path = os.path.join(self.dirname, f'../assets/art/interface/abilities/{p.ac.c.name}/{j}.png')
-                image = pygame.image.load(path)
-                image = pygame.transform.scale(image, (138 * res_mp, 64 * res_mp))
-                self.creature_abilities_images[i].append(image)
-                image = pygame.transform.scale(image, (69 * res_mp, 32 * res_mp))
-                self.creature_abilities_mini_images[i].append(image)
+                self.creature_abilities_images[i].append(assets.store.__getImage__(path, (138 * res_mp, 64 * res_mp)))
+                self.creature_abilities_mini_images[i].append(assets.store.__getImage__(path, (69 * res_mp, 32 * res_mp)))
 
-        # universal - don't open the same images twice!
+        # universal
         # info
         path = os.path.join(self.dirname, f'../assets/art/interface/abilities/universal/5.png')
-        image = pygame.image.load(path)
-        image = pygame.transform.scale(image, (138 * res_mp, 64 * res_mp))
+        image = assets.store.__getImage__(path, (138 * res_mp, 64 * res_mp))
         self.creature_abilities_images[0].append(image)
         self.creature_abilities_images[1].append(image)
-        image = pygame.transform.scale(image, (69 * res_mp, 32 * res_mp))
+        image = assets.store.__getImage__(path, (69 * res_mp, 32 * res_mp))
         self.creature_abilities_mini_images[i].append(image)
         self.creature_abilities_mini_images[0].append(image)
         self.creature_abilities_mini_images[1].append(image)
 
         # ?
         path = os.path.join(self.dirname, f'../assets/art/interface/abilities/universal/6.png')
-        image = pygame.image.load(path)
-        image = pygame.transform.scale(image, (71 * res_mp, 64 * res_mp))
+        image = assets.store.__getImage__(path, (71 * res_mp, 64 * res_mp))
         self.creature_abilities_images[0].append(image)
         self.creature_abilities_images[1].append(image)
 
@@ -919,20 +1130,25 @@ class BattleScene(Scene):
             x = lambda index: True if index >= 0 else False
             y = lambda index: index - 1
 
-        while x(i):
-            if self.gui.return_to_menu or self.gui.skip_animations:
-                return
-
+        def draw():
             self.gui.display.fill(self.background_color)
             self.__blitHealth__()
             self.__blitHUD__()
-            self.gui.__delay__(10)
 
             textbox = self.textbox_images[i]
             rect = self.textbox_images[i].get_rect()
             rect = rect.move((230 * res_mp, 679 * res_mp))
             self.gui.display.blit(textbox, rect)
-            self.gui.__blitScreen__()
+
+        # only the textbox changes after the first frame
+        dirty_rects = None
+        while x(i):
+            if self.gui.return_to_menu or self.gui.skip_animations:
+                return
+
+            self.gui.__delay__(10)
+            self.__drawFrame__(draw, dirty_rects)
+            dirty_rects = [self.__textboxRect__()]
             i = y(i)
 
         if not zoom_in:
@@ -964,17 +1180,24 @@ class BattleScene(Scene):
             y = 720
             font_size = 45
 
+        def draw():
+            self.gui.display.fill(self.background_color)
+            self.__blitHealth__()
+            self.__blitTextbox__()
+            self.__blitHUD__()
+            self.gui.__blitText__(message, font_size, 960, message_y, self.gui.colors.BLACK)
+
+        # only the text in the textbox changes after the first frame
+        dirty_rects = None
+
         message = ''
+        message_y = y
         for c in line1:
             if self.gui.return_to_menu or self.gui.skip_animations:
                 return
             message += c
-            self.gui.display.fill(self.background_color)
-            self.__blitHealth__()
-            self.__blitTextbox__()
-            self.__blitHUD__()
-            self.gui.__blitText__(message, font_size, 960, y, self.gui.colors.BLACK)
-            self.gui.__blitScreen__()
+            self.__drawFrame__(draw, dirty_rects)
+            dirty_rects = [self.__textboxRect__().union(self.gui.__textRect__(line1, font_size, 960, message_y))]
             if c == '!' or c == '?':
                 self.gui.__delay__(500)  # 500ms delay with ! or ?
             elif c == '.':
@@ -986,17 +1209,13 @@ class BattleScene(Scene):
         if line2 is not None:
             self.last_battle_text[1] = ""
             message = ""
+            message_y = y + 60
             for c in line2:
                 if self.gui.return_to_menu or self.gui.skip_animations:
                     return
                 message += c
-                self.gui.display.fill(self.background_color)
-                self.__blitHealth__()
-                self.__blitTextbox__()
-                self.__blitHUD__()
-                #self.__keepTextboxText__()
-                self.gui.__blitText__(message, font_size, 960, y + 60, self.gui.colors.BLACK)
-                self.gui.__blitScreen__()
+                self.__drawFrame__(draw, dirty_rects)
+                dirty_rects = [self.__textboxRect__().union(self.gui.__textRect__(line2, font_size, 960, message_y))]
                 if c == '!' or c == '?':
                     self.gui.__delay__(500)  # 500ms delay with ! or ?
                 elif c == '.':
@@ -1069,13 +1288,17 @@ class BattleScene(Scene):
             update_health = lambda hp: hp + 1
             should_update = lambda hp: True if hp < ac.health else False
 
-        while should_update(prev_health):
-            if self.gui.return_to_menu or self.gui.skip_animations:
-                return
-
-            # update health by 1 point
-            prev_health = update_health(prev_health)
+        # change text color
+        if active and is_healing:
+            color = self.gui.colors.GREEN
+        elif active and not is_healing:
+            color = self.gui.colors.RED
+        elif not active and is_healing:
+            color = self.gui.colors.GREENING_WHITE
+        else:
+            color = self.gui.colors.BLEEDING_WHITE
 
+        def draw():
             # redraw background
             self.gui.display.fill(self.background_color)
 
@@ -1099,22 +1322,28 @@ class BattleScene(Scene):
 
             # finish up hud
             self.__blitHUD__()
+            self.gui.__blitText__(f"{ac.c.name}", 80, name_x, 65, color)
 
-            # change text color
-            # p1
-            if active and is_healing:
-                color = self.gui.colors.GREEN
-            elif active and not is_healing:
-                color = self.gui.colors.RED
-            elif not active and is_healing:
-                color = self.gui.colors.GREENING_WHITE
-            else:
-                color = self.gui.colors.BLEEDING_WHITE
+        # only the health bar and text of the creature change after the first frame
+        health_bar_rect = pygame.Rect((res_mp * hbar_x, res_mp * 138, res_mp * 906, res_mp * 28))
+        health_text_rect = self.gui.__textRect__(f"-- {prev_health}/{ac.c.health} --", 45, htext_x, 210)
+        first_frame = True
+        while should_update(prev_health):
+            if self.gui.return_to_menu or self.gui.skip_animations:
+                return
 
-            self.gui.__blitText__(f"{ac.c.name}", 80, name_x, 65, color)
+            # update health by 1 point
+            prev_health = update_health(prev_health)
+
+            # the old text has to be covered too
+            new_health_text_rect = self.gui.__textRect__(f"-- {prev_health}/{ac.c.health} --", 45, htext_x, 210)
+            if first_frame:
+                self.__drawFrame__(draw)
+                first_frame = False
+            else:
+                self.__drawFrame__(draw, [health_bar_rect, health_text_rect.union(new_health_text_rect)])
+            health_text_rect = new_health_text_rect
 
-            # blit screen
-            self.gui.__blitScreen__()
             self.gui.__delay__(15)
 
         self.gui.__delay__(500)
@@ -1231,7 +1460,7 @@ class BattleScene(Scene):
 
     def __blitHUD__(self):
         # make sure the hud doesn't blit too fast in lower resolutions
-        now = before = self.hud_clock.tick()
+        hud_start = perf_counter()
 
         # resolution scaling multiplier
         res_mp = self.gui.DISPLAY_W / 1920
@@ -1239,56 +1468,12 @@ class BattleScene(Scene):
         # creatures come first, then textbox with it
         self.__blitPrimarySprites__()
 
-        # abilities black background
-        if not self.testing:
-            for i in (0, 1):
-                p_ability_background = pygame.Rect((res_mp * (34 + 948 * i), res_mp * 860, res_mp * 904, res_mp * 180))
-                self.gui.display.fill(self.gui.colors.BLACK, p_ability_background)
-
-        # abilities
-        for p_id in (0, 1):  # for players
-            if not self.testing:
-                for i in range(0, 6):  # for abilities
-
-                    # get coordinate modifiers
-                    if i > 2:
-                        j = 1
-                        k = i - 3
-                    else:
-                        j = 0
-                        k = i
-
-                    # get base x coordinate
-                    if p_id == 0:
-                        base_x = 147
-                    else:
-                        base_x = 1155
-
-                    # get image
-                    ability = self.creature_abilities_images[p_id][i]
-
-                    # blit ability
-                    rect = ability.get_rect()
-                    rect = rect.move(((base_x + 242 * k) * res_mp, (875 + 90 * j) * res_mp))
-                    self.gui.display.blit(ability, rect)
-            ability = self.creature_abilities_images[p_id][6]
-            rect = ability.get_rect()
-            rect = rect.move(((813 + 227 * p_id) * res_mp, 965 * res_mp))
-            self.gui.display.blit(ability, rect)
+        # abilities and hud
+        if self.hud_layer is None:
+            self.__buildHUDLayer__()
+        self.gui.display.blit(self.hud_layer, (0, 0))
 
-        # hud
-        for hud_image in self.player_hud_images:
-            hud = hud_image
-            rect = hud.get_rect()
-            rect = rect.move((0, 0))
-            self.gui.display.blit(hud, rect)
-
-        # if testing, blit a white box over abilities' spots
         if self.testing:
-            for i in (0, 1):
-                p_ability_background = pygame.Rect((res_mp * (34 + 1092 * i), res_mp * 864, res_mp * 750, res_mp * 172))
-                self.gui.display.fill(self.gui.colors.WHITE, p_ability_background)
-
             # new tooltips
             for p_id in (0, 1):  # for players
                 if p_id == 0:
@@ -1608,9 +1793,67 @@ class BattleScene(Scene):
                                       self.gui.colors.BLACK)
 
         # again, make sure it isn't so fast you can't see stuff when game is faster due to lower res
-        now += self.hud_clock.tick()
-        while now < before + 40 / self.gui.speed:
-            now += self.hud_clock.tick()
+        self.gui.__sleepUntil__(hud_start + 0.04 / self.gui.speed)
+
+    # composite everything in the hud that only changes with creatures or resolution
+    def __buildHUDLayer__(self):
+        res_mp = self.gui.DISPLAY_W / 1920
+        layer = pygame.Surface((self.gui.DISPLAY_W, self.gui.DISPLAY_H), pygame.SRCALPHA)
+
+        # abilities black background
+        if not self.testing:
+            for i in (0, 1):
+                p_ability_background = pygame.Rect((res_mp * (34 + 948 * i), res_mp * 860, res_mp * 904, res_mp * 180))
+                layer.fill(self.gui.colors.BLACK, p_ability_background)
+
+        # abilities
+        for p_id in (0, 1):  # for players
+            if not self.testing:
+                for i in range(0, 6):  # for abilities
+
+                    # get coordinate modifiers
+                    if i > 2:
+                        j = 1
+                        k = i - 3
+                    else:
+                        j = 0
+                        k = i
+
+                    # get base x coordinate
+                    if p_id == 0:
+                        base_x = 147
+                    else:
+                        base_x = 1155
+
+                    # get image
+                    ability = self.creature_abilities_images[p_id][i]
+
+                    # blit ability
+                    rect = ability.get_rect()
+                    rect = rect.move(((base_x + 242 * k) * res_mp, (875 + 90 * j) * res_mp))
+                    layer.blit(ability, rect)
+            ability = self.creature_abilities_images[p_id][6]
+            rect = ability.get_rect()
+            rect = rect.move(((813 + 227 * p_id) * res_mp, 965 * res_mp))
+            layer.blit(ability, rect)
+
+        # hud
+        for hud_image in self.player_hud_images:
+            hud = hud_image
+            rect = hud.get_rect()
+            rect = rect.move((0, 0))
+            layer.blit(hud, rect)
+
+        # if testing, blit a white box over abilities' spots
+        if self.testing:
+            for i in (0, 1):
+                p_ability_background = pygame.Rect((res_mp * (34 + 1092 * i), res_mp * 864, res_mp * 750, res_mp * 172))
+                layer.fill(self.gui.colors.WHITE, p_ability_background)
+
+        # the art has no half-transparent pixels, so the layer is either see-through or opaque -
+        # run-length encoding lets blits skip see-through runs
+        self.hud_layer = layer.convert_alpha()
+        self.hud_layer.set_alpha(255, pygame.RLEACCEL)
 
     def __animateRoll__(self, roll: int, chance: int, for_status: bool = False):
         # only animate when chances are uncertain
@@ -1631,6 +1874,39 @@ class BattleScene(Scene):
             else:
                 text[3] = "FAILURE!"
 
+            def draw():
+                self.gui.display.fill(self.background_color)
+                self.__blitHealth__()
+                self.__blitTextbox__()
+                self.__blitHUD__()
+
+                # keep text when going to new line
+                if i > 0:
+                    self.gui.__blitText__(text[0], 30, 960, 220, self.gui.colors.WHITE)
+                    if i > 1:
+                        self.gui.__blitText__(text[1], 30, 960, 250, self.gui.colors.WHITE)
+                        if i == 3:
+                            self.gui.__blitText__("-- " + str(roll) + " --", 30, 960, 280, self.gui.colors.WHITE)
+
+                if i == 0:  # 1st line - what is this roll for?
+                    self.gui.__blitText__(message, 30, 960, 220, self.gui.colors.WHITE)
+
+                elif i == 1:  # 2nd line - roll to beat?
+                    self.gui.__blitText__(message, 30, 960, 250, self.gui.colors.WHITE)
+
+                elif i == 2:  # 3rd line - random number rolling
+                    self.gui.__blitText__(number, 30, 960, 280, self.gui.colors.WHITE)
+
+                else:  # 5th line - draw out success message
+                    self.gui.__blitText__(message, 30, 960, 340, self.gui.colors.WHITE)
+
+            # only the lines of text change after the first frame, rolled numbers can be a bit wider or narrower
+            res_mp = self.gui.DISPLAY_W / 1920
+            text_rect = self.gui.__textRect__(text[0], 30, 960, 220).unionall(
+                [self.gui.__textRect__(text[1], 30, 960, 250), self.gui.__textRect__("-- 100 --", 30, 960, 280),
+                 self.gui.__textRect__(text[3], 30, 960, 340)]).inflate(40 * res_mp, 0)
+            dirty_rects = None
+
             for i in range(0, 4):
                 message = ''
                 self.gui.__delay__(200)  # 200ms delay between lines
@@ -1639,39 +1915,16 @@ class BattleScene(Scene):
                         return
 
                     message += c
-                    self.gui.display.fill(self.background_color)
-                    self.__blitHealth__()
-                    self.__blitTextbox__()
-                    self.__blitHUD__()
-
-                    # keep text when going to new line
-                    if i > 0:
-                        self.gui.__blitText__(text[0], 30, 960, 220, self.gui.colors.WHITE)
-                        if i > 1:
-                            self.gui.__blitText__(text[1], 30, 960, 250, self.gui.colors.WHITE)
-                            if i == 3:
-                                number = "-- " + str(roll) + " --"
-                                self.gui.__blitText__(number, 30, 960, 280, self.gui.colors.WHITE)
-
-                    if i == 0:  # 1st line - what is this roll for?
-                        self.gui.__blitText__(message, 30, 960, 220, self.gui.colors.WHITE)
-
-                    elif i == 1:  # 2nd line - roll to beat?
-                        self.gui.__blitText__(message, 30, 960, 250, self.gui.colors.WHITE)
-
-                    elif i == 2:  # 3rd line - random number rolling
+                    if i == 2:
                         if c == 'x':  # do the correct number, this is the last iteration
                             number = "-- " + str(roll) + " --"
                             self.gui.__delay__(30 * 9)
                         else:  # random number for SUSPENSE!
-                            number = "-- " + str(random.randrange(0, 100)) + " --"
+                            number = "-- " + str(self.cosmetic_rng.randrange(0, 100)) + " --"
                             self.gui.__delay__(30 * int(c))
-                        self.gui.__blitText__(number, 30, 960, 280, self.gui.colors.WHITE)
-
-                    else:  # 5th line - draw out success message
-                        self.gui.__blitText__(message, 30, 960, 340, self.gui.colors.WHITE)
 
-                    self.gui.__blitScreen__()
+                    self.__drawFrame__(draw, dirty_rects)
+                    dirty_rects = [text_rect]
                     if c == '!' or c == '?':
                         self.gui.__delay__(500)  # 500ms delay with ! or ?
                     elif c == '.':
@@ -1696,6 +1949,37 @@ class BattleScene(Scene):
         else:
             text[3] = "PLAYER 2 MOVES FIRST!"
 
+        def draw():
+            self.gui.display.fill(self.background_color)
+            self.__blitHealth__()
+            self.__blitHUD__()
+
+            # keep text when going to new line
+            if i > 0:
+                self.gui.__blitText__(text[0], 30, 960, 220, self.gui.colors.WHITE)
+                if i > 1:
+                    self.gui.__blitText__(text[1], 30, 960, 250, self.gui.colors.WHITE)
+                    if i > 2:
+                        self.gui.__blitText__(text[2], 30, 960, 310, self.gui.colors.WHITE)
+
+            if i == 0:  # 1st line - question
+                self.gui.__blitText__(message, 30, 960, 220, self.gui.colors.WHITE)
+
+            elif i == 1:  # 2nd line - speed comparison
+                self.gui.__blitText__(message, 30, 960, 250, self.gui.colors.WHITE)
+
+            elif i == 2:  # 4th line - IS IT DECIDED WITHOUT CHANCE?
+                self.gui.__blitText__(message, 30, 960, 310, self.gui.colors.WHITE)
+
+            else:  # 5th line - who moves first though?
+                self.gui.__blitText__(message, 30, 960, 340, self.gui.colors.WHITE)
+
+        # only the lines of text change after the first frame
+        text_rect = self.gui.__textRect__(text[0], 30, 960, 220).unionall(
+            [self.gui.__textRect__(text[1], 30, 960, 250), self.gui.__textRect__(text[2], 30, 960, 310),
+             self.gui.__textRect__(text[3], 30, 960, 340)])
+        dirty_rects = None
+
         for i in range(0, 4):
             message = ''
             self.gui.__delay__(200)  # 200ms delay between lines
@@ -1704,31 +1988,8 @@ class BattleScene(Scene):
                     return
 
                 message += c
-                self.gui.display.fill(self.background_color)
-                self.__blitHealth__()
-                self.__blitHUD__()
-
-                # keep text when going to new line
-                if i > 0:
-                    self.gui.__blitText__(text[0], 30, 960, 220, self.gui.colors.WHITE)
-                    if i > 1:
-                        self.gui.__blitText__(text[1], 30, 960, 250, self.gui.colors.WHITE)
-                        if i > 2:
-                            self.gui.__blitText__(text[2], 30, 960, 310, self.gui.colors.WHITE)
-
-                if i == 0:  # 1st line - question
-                    self.gui.__blitText__(message, 30, 960, 220, self.gui.colors.WHITE)
-
-                elif i == 1:  # 2nd line - speed comparison
-                    self.gui.__blitText__(message, 30, 960, 250, self.gui.colors.WHITE)
-
-                elif i == 2:  # 4th line - IS IT DECIDED WITHOUT CHANCE?
-                    self.gui.__blitText__(message, 30, 960, 310, self.gui.colors.WHITE)
-
-                else:  # 5th line - who moves first though?
-                    self.gui.__blitText__(message, 30, 960, 340, self.gui.colors.WHITE)
-
-                self.gui.__blitScreen__()
+                self.__drawFrame__(draw, dirty_rects)
+                dirty_rects = [text_rect]
                 if c == '!' or c == '?':
                     self.gui.__delay__(500)  # 500ms delay with ! or ?
                 elif c == '.':
@@ -1738,6 +1999,155 @@ class BattleScene(Scene):
 
         self.gui.__delay__(500)  # 500ms delay
 
+    # which player the creature occurrence belongs to right now
+    def __getPlayerId__(self, co: cr.CreatureOccurrence) -> int:
+        if co is self.p1.ac:
+            return 1
+        return 2
+
+    # battle engine listener - animates events the moment the engine emits them
+    def __animateEvent__(self, event: ev.BattleEvent):
+
+        # statuses ticking at the start of a turn
+        if isinstance(event, ev.TickStartEvent):
+            self.active_player = self.__getPlayerId__(event.co)
+
+        elif isinstance(event, ev.StatusExpiredEvent):
+            if not self.textbox_up:  # introduce the textbox
+                self.__animateTextbox__(True)
+            self.__animateBattleText__(f'STATUS {event.so.se.name} ',
+                                       f"EXPIRED FOR {event.co.c.name} ({event.index}/{event.count})")
+
+        elif isinstance(event, ev.StatusTickEvent):
+            if not self.textbox_up:  # introduce the textbox
+                self.__animateTextbox__(True)
+            self.__animateBattleText__(f'{event.so.se.name} IS STILL ',
+                                       f'APPLIED TO {event.co.c.name} ({event.index}/{event.count})')
+
+        elif isinstance(event, ev.TickEndEvent):
+            # get rid of the textbox
+            if self.textbox_up:
+                self.__animateTextbox__(False)
+            self.active_player = -1
+
+            # re-calculate bonuses for gui after all effects are settled or extinguished
+            self.__calculateModifiers__()
+
+        # move order and stuns
+        elif isinstance(event, ev.MovePriorityEvent):
+            self.__animateMovePriority__(event.p1_move_speed, event.p2_move_speed, event.moves_first)
+
+        elif isinstance(event, ev.StunnedEvent):
+            self.gui.__delay__(500)
+
+            self.gui.display.fill(self.background_color)
+            self.__blitHealth__()
+            self.__blitHUD__()
+            self.gui.__blitScreen__()
+
+            self.active_player = self.__getPlayerId__(event.co)
+            self.__animateTextbox__(True)
+            self.__animateBattleText__(f"{event.co.c.name} IS STUNNED AND SKIPS THE TURN!")
+            self.__animateTextbox__(False)
+            self.active_player = -1
+
+        # moves
+        elif isinstance(event, ev.MoveStartEvent):
+            self.gui.__delay__(500)
+
+            # mark beginning of turn
+            self.active_player = self.__getPlayerId__(event.co)
+            self.__animateTextbox__(True)
+
+        elif isinstance(event, ev.RageSpentEvent):
+            self.__animateBattleText__(f'{event.co.c.name} IS CONSUMED BY RAGE!',
+                                       f'RAGE POINTS DECREASED BY {event.rage_cost}!')
+
+        elif isinstance(event, ev.MoveAttemptEvent):
+            if event.attempts > 1:
+                self.__animateBattleText__(f'{event.co.c.name} USES {event.move.name} ({event.attempt}/{event.attempts})!')
+            else:
+                self.__animateBattleText__(f'{event.co.c.name} USES {event.move.name}!')
+
+        elif isinstance(event, ev.RollEvent):
+            self.__animateRoll__(event.roll, event.chance, event.for_status)
+
+        elif isinstance(event, ev.HitEvent):
+            if event.result == "CONNECTED":
+                self.__animateBattleText__("MOVE CONNECTED!")
+            elif event.result == "HIT":
+                if event.effectiveness == 0:
+                    effectiveness_text = "IT HAD NO EFFECT!"
+                elif event.effectiveness < 1:
+                    effectiveness_text = "IT'S NOT VERY EFFECTIVE!"
+                elif event.effectiveness > 1:
+                    effectiveness_text = "IT'S SUPER EFFECTIVE!"
+                else:
+                    effectiveness_text = "IT'S EFFECTIVE!"
+                self.__animateBattleText__("TARGET HIT!", effectiveness_text)
+            else:
+                self.__animateBattleText__(f"TARGET {event.result}!")
+
+        elif isinstance(event, ev.DamageEvent):
+            if event.damage > 0:
+                self.__animateBattleText__(f"{event.co.c.name} TAKES {event.damage} DAMAGE!")
+            elif event.damage < 0:
+                self.__animateBattleText__(f"{event.co.c.name} REGAINS {-event.damage} HEALTH!")
+
+        elif isinstance(event, ev.HealthChangedEvent):
+            # animate health bar and numbers
+            self.__animateHealth__(event.co, event.prev_health)
+
+        elif isinstance(event, ev.StatusAppliedEvent):
+            so = event.so
+            if so.status_d == 0:
+                self.__animateBattleText__(f'{so.se.name} APPLIED', f"TO {event.co.c.name} FOR THIS TURN!")
+            else:
+                self.__animateBattleText__(f'{so.se.name} APPLIED', f"TO {event.co.c.name} FOR {so.status_d} TURN(S)!")
+            if so.stun_d == 0:
+                self.__animateBattleText__(f'{so.se.name} STUNS', f"{event.co.c.name} FOR THIS TURN!")
+            elif so.stun_d > 0:
+                self.__animateBattleText__(f'{so.se.name} STUNS', f"{event.co.c.name} FOR THE NEXT {so.stun_d} TURN(S)!")
+
+        elif isinstance(event, ev.StatusExtinguishedEvent):
+            self.__animateBattleText__(f'EFFECT {event.so.se.name}', f'EXTINGUISHED FOR {event.co.c.name}')
+
+        elif isinstance(event, ev.ThornEvent):
+            if event.damage > 0:
+                self.__animateBattleText__(f"{event.target.c.name} RETALIATES!")
+            else:
+                self.__animateBattleText__(f"{event.co.c.name} LEECHES HEALTH!")
+
+        elif isinstance(event, ev.MoveEndEvent):
+            # textbox out, mark ending of turn
+            self.__animateTextbox__(False)
+            self.active_player = -1
+
+        elif isinstance(event, ev.RiskEvaluationEvent):
+            self.__animateTextbox__(True)
+            self.__animateBattleText__(event.text[0], event.text[1])
+            self.__animateBattleText__(event.text[2], event.text[3])
+            self.__animateTextbox__(False)
+
+        # fainting and creatures joining
+        elif isinstance(event, ev.FaintEvent):
+            self.__animateTextbox__(True)
+            self.__animateBattleText__(f"{event.co.c.name} FAINTED!")
+            if not event.has_replacement:
+                self.__animateTextbox__(False)
+
+        elif isinstance(event, ev.JoinEvent):
+            self.__updateCreatureImages__()
+            self.__animateBattleText__(f"{event.co.c.name} JOINS THE BATTLE!")
+            self.__animateTextbox__(False)
+
+        elif isinstance(event, ev.BattleEndEvent):
+            self.__animateTextbox__(True)
+            if event.winner == 0:
+                self.__animateBattleText__("DRAW! NO ONE WINS!")
+            else:
+                self.__animateBattleText__(f"PLAYER {event.winner} WINS!")
+
     def __blitReadiness__(self, p1_move_roll: int, p2_move_roll: int):
         # resolution scaling multiplier
         res_mp = self.gui.DISPLAY_W / 1920
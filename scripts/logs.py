@@ -0,0 +1,65 @@
+import logging
+import logging.handlers
+
+
+# log channels of the game's subsystems, all of them are off by default
+# engine - turns, moves, rolls and statuses (engine.py, creatures.py)
+# ai - how moves are chosen (player.py)
+# gui - battles on screen and the window (battle.py, gui.py)
+# messages are %-style with arguments, i.e. engine.debug("%s takes %d damage!", name, damage),
+# so they are formatted only if their channel is on and a disabled channel costs a level check
+root = logging.getLogger("arena")
+root.setLevel(logging.WARNING)
+engine = logging.getLogger("arena.engine")
+ai = logging.getLogger("arena.ai")
+gui = logging.getLogger("arena.gui")
+channels = {"engine": engine, "ai": ai, "gui": gui}
+
+log_format = "%(name)s %(levelname)s: %(message)s"
+
+
+# format a record's message now and leave nothing to format later
+def freeze(record: logging.LogRecord) -> bool:
+    record.msg = record.getMessage()
+    record.args = None
+    return True
+
+
+# turn channels on at level, all of them if names is None
+# messages go to stderr, or to a file at path through a buffer written every buffer_size messages
+# (and on errors, flush() and exit), so tracing a long simulation doesn't write to disk with every message
+def enable(level: int = logging.DEBUG, names: list[str, ...] = None, path: str = None, buffer_size: int = 1000):
+    if path is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(log_format))
+    else:
+        file_handler = logging.FileHandler(path, "w")
+        file_handler.setFormatter(logging.Formatter(log_format))
+        handler = logging.handlers.MemoryHandler(buffer_size, logging.ERROR, file_handler)
+        # buffered messages are formatted right away, their arguments (i.e. cooldowns) change in the meantime
+        handler.addFilter(freeze)
+    root.addHandler(handler)
+    root.propagate = False
+
+    for name in (names if names is not None else channels):
+        channels[name].setLevel(level)
+
+
+# write out buffered messages (i.e. before a worker process ends, it doesn't run exit handlers)
+def flush():
+    for handler in root.handlers:
+        handler.flush()
+
+
+# --log, --log-level and --log-file options of command line tools
+def add_arguments(parser):
+    parser.add_argument("--log", nargs="+", choices=list(channels), metavar="CHANNEL",
+                        help=f"log these channels ({', '.join(channels)})")
+    parser.add_argument("--log-level", default="DEBUG", choices=["DEBUG", "INFO"],
+                        help="DEBUG logs every roll and score, INFO only turns, results and ai decisions")
+    parser.add_argument("--log-file", help="write the log to this file instead of stderr")
+
+
+def configure(args):
+    if args.log:
+        enable(getattr(logging, args.log_level), args.log, args.log_file)
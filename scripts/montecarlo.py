@@ -0,0 +1,154 @@
+import numpy as np
+
+import scripts.creatures as cr
+
+
+# results of many trials of one move, one value per trial
+# damage is total damage dealt to the target (negative heals), target_health is target's health after the move,
+# status_procs is how many times the status effect was applied,
+# thorn_damage is damage taken by the attacker from thorns (negative means leeched health)
+class MoveDistribution:
+    def __init__(self, trials: int, damage: np.ndarray, target_health: np.ndarray,
+                 status_procs: np.ndarray, thorn_damage: np.ndarray):
+        self.trials = trials
+        self.damage = damage
+        self.target_health = target_health
+        self.status_procs = status_procs
+        self.thorn_damage = thorn_damage
+
+    # probability of each total damage value
+    def __damageDistribution__(self) -> dict[int, float]:
+        values, counts = np.unique(self.damage, return_counts=True)
+        return {int(value): count / self.trials for value, count in zip(values, counts)}
+
+    def __expectedDamage__(self) -> float:
+        return float(self.damage.mean())
+
+    # chance the target is left with no health
+    def __killChance__(self) -> float:
+        return float((self.target_health <= 0).mean())
+
+    # chance the status effect is applied at least once
+    def __statusChance__(self) -> float:
+        return float((self.status_procs > 0).mean())
+
+    # average damage the attacker takes from thorns (leeching not included)
+    def __expectedThornBacklash__(self) -> float:
+        return float(np.maximum(self.thorn_damage, 0).mean())
+
+    # average health leeched by the attacker
+    def __expectedLeech__(self) -> float:
+        return float(-np.minimum(self.thorn_damage, 0).mean())
+
+
+# the same as random.randrange(low, high + 1) if low < high, else high - like in CreatureOccurrence.__makeMove__
+def roll_range(rng: np.random.Generator, low: int, high: int, size) -> np.ndarray:
+    if low < high:
+        return rng.integers(low, high + 1, size=size)
+    return np.full(size, high, dtype=np.int64)
+
+
+# damage modifier never turns damage into healing or healing into damage, zero damage is left alone
+def apply_damage_mod(damage: np.ndarray, damage_mod: int) -> np.ndarray:
+    return np.where(damage < 0, np.minimum(damage + damage_mod, 0),
+                    np.where(damage > 0, np.maximum(damage + damage_mod, 0), damage))
+
+
+# health can't go over max health
+def take_damage(health: np.ndarray, damage: np.ndarray, max_health: int) -> np.ndarray:
+    return np.minimum(health - damage, max_health)
+
+
+# evaluate a move used by attacker against defender over many trials at once
+# follows CreatureOccurrence.__makeMove__ roll for roll, for the creatures' current health and statuses
+# extinguishing is not simulated - modifiers are taken before the move, exactly like the move itself does it
+# i.e. how often does MAGIC BOLTS kill from 12 HP under MAGICAL REINFORCEMENT:
+#   attacker.active_statuses.append(cr.StatusOccurrence(cr.all_status_effects["MAGIC SHIELD"]))
+#   defender.health = 12
+#   resolve_move(attacker, defender, cr.all_moves["MAGIC BOLTS"]).__killChance__()
+def resolve_move(attacker: cr.CreatureOccurrence, defender: cr.CreatureOccurrence, move: cr.Move,
+                 trials: int = 1000000, seed: int = None) -> MoveDistribution:
+    rng = np.random.default_rng(seed)
+    status_procs = np.zeros(trials, dtype=np.int64)
+    thorn_damage = np.zeros(trials, dtype=np.int64)
+
+    # creature targets self
+    if move.target_self:
+        damage_mod = 0
+        so: cr.StatusOccurrence
+        for so in attacker.active_statuses:
+            if so.se.damage_mod_type is None or move.type == so.se.damage_mod_type:
+                damage_mod += so.se.damage_mod
+
+        total_damage = np.zeros(trials, dtype=np.int64)
+        health = np.full(trials, attacker.health, dtype=np.int64)
+        for i in range(0, move.hit_attempts):
+            damage = apply_damage_mod(roll_range(rng, move.damage_low, move.damage_high, trials), damage_mod)
+            status_roll = rng.integers(0, 100, size=trials)
+            if move.status_effect is not None:
+                status_procs += status_roll > 100 - move.status_chance
+            total_damage += damage
+            health = take_damage(health, damage, attacker.c.health)
+
+        return MoveDistribution(trials, total_damage, health, status_procs, thorn_damage)
+
+    # creature targets opponent
+    aim_mod = 0
+    damage_mod = 0
+    defense_mod = 0
+    thorn_mod_low = 0
+    thorn_mod_high = 0
+
+    for so in attacker.active_statuses:
+        aim_mod += so.se.aim_mod
+        if so.se.damage_mod_type is None or move.type == so.se.damage_mod_type:
+            damage_mod += so.se.damage_mod
+    for so in defender.active_statuses:
+        defense_mod += so.se.defense_mod
+        thorn_mod_low += so.se.thorn_damage_low
+        thorn_mod_high += so.se.thorn_damage_high
+
+    hit_chance = move.aim + aim_mod - defender.c.defense - defense_mod
+    if hit_chance < 0:  # fix for double negative
+        hit_chance = 0
+
+    damage_multiplier = defender.__checkTypeRelationship__(move.type)
+    if move.status_effect is not None:
+        status_chance = int(move.status_chance * defender.__checkTypeRelationship__(move.status_effect.type))
+    else:
+        status_chance = 0
+
+    total_damage = np.zeros(trials, dtype=np.int64)
+    health = np.full(trials, defender.health, dtype=np.int64)
+    number_of_not_missed = np.zeros(trials, dtype=np.int64)
+
+    for i in range(0, move.hit_attempts):
+        hit = rng.integers(0, 100, size=trials) > 100 - hit_chance
+
+        # move connects
+        hit_damage = roll_range(rng, move.damage_low, move.damage_high, trials)
+        hit_damage = np.trunc(apply_damage_mod(hit_damage, damage_mod) * damage_multiplier).astype(np.int64)
+
+        # graze or miss
+        if move.damage_low < move.damage_high:
+            graze_damage = rng.integers(move.damage_low, move.damage_high + 1, size=trials) - move.damage_low
+            graze_damage = np.trunc(apply_damage_mod(graze_damage, damage_mod) * damage_multiplier).astype(np.int64)
+        else:
+            graze_damage = np.zeros(trials, dtype=np.int64)
+        # teensy extra miss chance
+        graze_damage -= np.sign(graze_damage)
+
+        damage = np.where(hit, hit_damage, graze_damage)
+        number_of_not_missed += hit | (graze_damage != 0)
+        total_damage += damage
+        health = take_damage(health, damage, defender.c.health)
+
+        # status proc
+        if move.status_effect is not None:
+            status_procs += hit & (rng.integers(0, 100, size=trials) > 100 - status_chance)
+
+    # thorn calculations - damage is always taken, leech only with a hit or a graze
+    thorn = roll_range(rng, thorn_mod_low, thorn_mod_high, trials)
+    thorn_damage = np.where((thorn > 0) | (number_of_not_missed > 0), thorn, 0)
+
+    return MoveDistribution(trials, total_damage, health, status_procs, thorn_damage)
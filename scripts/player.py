@@ -1,83 +1,69 @@
+import math
 import random
-import scripts.creatures as cr
+import threading
+from collections import OrderedDict
+from time import perf_counter
 
-# creature move opponent multiplier
-# scoring modifier for AI - allows better score interpretation of moves when the score may be misleading
-#   for example, using Warmth against Psawarca is a little bit useless due to Wet status effect, but this
-#   is not being accounted for during score calculations normally
-#   other example would be Void Reset, which has thorn for two turns, but that doesn't mean you will deal
-#   twice the damage compared to if it were a one turn move - no one will attack an opponent turn after
-#   it was cast in their right mind unless they have due to obviously massive penalty for attacking
-#       first I will fill the list with multiplier 1 for each move, then I will change it individually
-#       for moves that require different scoring
-
-num_of_creatures = len(cr.all_creatures)
-cr_mo_op_multiplier = [[[1.0 for x in range(num_of_creatures)] for y in range(7)] for z in range(num_of_creatures)]
-
-# now for individual touch...
-
-#   the first move to change is Warmth against Psawarca - it will rarely see full effect of 4 turns
-#   of healing; in fact, Psawarca has two water-based attacks both on 2 turn cooldown, so Warmth,
-#   if Psawarca chooses to use them constantly, will provide 1/4th of benefit, but
-#   maybe he would prefer a different move because he's afraid of Firewall for example, sooo 0.5 multiplier
-cr_mo_op_multiplier[0][2][2] = 0.5
-
-#   the second move that needs special scoring is Reset Void - against anyone, really
-#   the move is only likely to deal thorn damage in the turn of casting, not afterwards
-#   technically any moves that proc status against Shigowi might need special scoring, because
-#   Reset Void can remove any status effect, but because RV is on a 6 turn cooldown and because
-#   it is a worthwhile move only when timed right before an attack, we can assume that will not
-#   happen very often
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[3][4][i] = 0.25
-
-# same for escape to void, except actually worse
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[3][1][i] = 0.15
-
-# health kit / change creature multiplier
-for i in range(0, num_of_creatures):
-    for j in range(0, num_of_creatures):
-        cr_mo_op_multiplier[i][5][j] = 1
-
-# fragonire against psawarca and vice versa
-#cr_mo_op_multiplier[0][5][2] = 1.5
-#cr_mo_op_multiplier[2][5][0] = 0.5
-
-# psawarca against schonips and vice versa
-#cr_mo_op_multiplier[2][5][1] = 1.5
-#cr_mo_op_multiplier[1][5][2] = 0.5
-
-# shigowi against psawarca and vice versa
-#cr_mo_op_multiplier[2][5][1] = 1.3
-#cr_mo_op_multiplier[1][5][2] = 0.7
-
-# bamat might use magical reinforcement too much sometimes...
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[4][4][i] = 0.85
-
-# bites and claws are underappreciated by AI because of their lack of status
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[0][1][i] = 1.2
-    cr_mo_op_multiplier[1][0][i] = 1.1
-    cr_mo_op_multiplier[4][0][i] = 1.2
-
-# physical attack bonus against bamat
-    cr_mo_op_multiplier[0][1][4] = 1.5
-    cr_mo_op_multiplier[1][0][4] = 1.2
-    cr_mo_op_multiplier[4][0][4] = 1.3
-
-# warmth is slightly overappreciated by ai
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[0][2][i] = 0.9
-
-# shed skin is overappreciated by AI, really
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[1][3][i] = 0.7
-
-# same for electrification
-for i in range(0, num_of_creatures):
-    cr_mo_op_multiplier[1][1][i] = 0.8
+import scripts.creatures as cr
+import scripts.events as ev
+import scripts.logs as lg
+
+# creature move opponent multipliers (cr.ai_multipliers) come from the catalog, see "ai_multipliers" in
+# assets/data/catalog.json - scoring modifiers for AI, allowing better score interpretation of moves
+# when the score may be misleading (i.e. Warmth against Psawarca, which puts it out with Wet)
+
+
+# bounded memo of scores, least recently used are evicted when it's full
+# it can be shared with a thinking thread (see MonteCarloSearch), compute() is called outside of the lock
+class ScoreCache:
+    def __init__(self, max_size: int):
+        self.scores = OrderedDict()
+        self.lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # score by key, computed with compute() if not known yet
+    def __getScore__(self, key: tuple, compute):
+        with self.lock:
+            score = self.scores.get(key)
+            if score is not None:
+                self.hits += 1
+                self.scores.move_to_end(key)
+                return score
+            self.misses += 1
+
+        score = compute()
+        with self.lock:
+            self.scores[key] = score
+            if len(self.scores) > self.max_size:
+                self.scores.popitem(last=False)
+                self.evictions += 1
+        return score
+
+    def __hitRate__(self) -> float:
+        if self.hits + self.misses == 0:
+            return 0
+        return self.hits / (self.hits + self.misses)
+
+    # to be called after moves, status effects or ai multipliers are changed
+    def __clear__(self):
+        with self.lock:
+            self.scores.clear()
+
+
+# results of score_se by status effect id and the other arguments
+score_se_cache = ScoreCache(20000)
+# scores of ai's move against each of opponent's moves (see move_scores) by fingerprints of both creatures
+move_scores_cache = ScoreCache(20000)
+
+
+# switch to another catalog (see creatures.use_catalog), scores cached for the old one don't apply anymore
+def use_catalog(path: str = None):
+    if cr.use_catalog(path):
+        score_se_cache.__clear__()
+        move_scores_cache.__clear__()
 
 
 # score status deadliness against opponent
@@ -145,6 +131,10 @@ def score_se(se: cr.StatusEffect, faster: float = 0.5,
 
     return score
 
+# score_se remembered by id of the status effect (se_key) and the other arguments
+def cached_score_se(se: cr.StatusEffect, se_key: int, *args) -> float:
+    return score_se_cache.__getScore__((se_key,) + args, lambda: score_se(se, *args))
+
 # check if extinguishing score applies
 def score_extinguish(ai: cr.CreatureOccurrence, move: cr.Move) -> float:
     score = 0
@@ -159,172 +149,806 @@ def score_extinguish(ai: cr.CreatureOccurrence, move: cr.Move) -> float:
                 score -= 30 * so.stun_d
     return score
 
-def score_move(creatures: list[cr.CreatureOccurrence, cr.CreatureOccurrence],
-               move_indices: list[int, int]) -> (float, float):
-    scores: list[float, float] = [0, 0]
+# scoring of ai's move against any opponent's move, everything that doesn't depend on opponent's move is done once
+# returns a function of opponent's move, only the status score depends on it (on which move is faster
+# and whether the opponent is attacking)
+def move_scorer(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence, move_index: int):
+    move_ai = ai.c.moves[move_index]
+    is_not_stunned = not ai.isStunned
 
-    for index in range(2):
-        opponent = creatures[(index + 1) % 2]
-        move_op = opponent.c.moves[move_indices[(index + 1) % 2]]
-        ai = creatures[index]
-        move_ai = ai.c.moves[move_indices[index]]
-        is_not_stunned = not ai.isStunned
-
-        # rough estimate of how many rounds are left to play before one of the creatures dies
-        # this is to lower status effect's impact on score when it is clear it won't dish out full benefits
-        round_cap = opponent.health
-        if round_cap > ai.health:
-            round_cap = ai.health
-        round_cap /= 5
-
-        # it is relevant to thorn damage if the opponent is attacking or not
-        if move_op.target_self:
-            opponent_attacking = False
-        else:
-            opponent_attacking = True
+    # rough estimate of how many rounds are left to play before one of the creatures dies
+    # this is to lower status effect's impact on score when it is clear it won't dish out full benefits
+    round_cap = opponent.health
+    if round_cap > ai.health:
+        round_cap = ai.health
+    round_cap /= 5
 
-        # which move will be played first will impact each moves' results
-        if move_ai.speed > move_op.speed:
-            faster = 1.0
-        elif move_ai.speed < move_op.speed:
-            faster = 0.0
-        else:
-            faster = 0.5
+    if move_ai.status_effect is not None:
+        se_key = move_ai.status_effect.id
+
+    # SELF-TARGETTING PLAYER MOVE
+    if move_ai.target_self and is_not_stunned:
 
-        # SELF-TARGETTING PLAYER MOVE
-        if move_ai.target_self and is_not_stunned:
+        damage_worth = 60 / ai.c.health
+        thorn_damage_worth = 60 / opponent.c.health
 
-            damage_worth = 60 / ai.c.health
-            thorn_damage_worth = 60 / opponent.c.health
+        # normalized damage score
+        damage = -(move_ai.damage_low + move_ai.damage_high) * move_ai.hit_attempts
+        heal_limit = ai.c.health - ai.health  # max health that can be healed rn
+        if damage > heal_limit:
+            damage = heal_limit
+        damage_score = 5 * damage * damage_worth
 
-            # normalized damage score
-            damage = -(move_ai.damage_low + move_ai.damage_high) * move_ai.hit_attempts
-            heal_limit = ai.c.health - ai.health  # max health that can be healed rn
-            if damage > heal_limit:
-                damage = heal_limit
-            damage_score = 5 * damage * damage_worth
+        # add extinguishing score to damage_score
+        damage_score += score_extinguish(ai, move_ai)
 
-            # add extinguishing score to damage_score
-            damage_score += score_extinguish(ai, move_ai)
+        # there is a status effect to the move
+        if move_ai.status_effect is not None:
+            thorn_mp = opponent.__checkTypeRelationship__(move_ai.status_effect.type)
 
+        multiplier = cr.ai_multipliers[ai.c.id][move_index][opponent.c.id]
+
+        def score(move_op: cr.Move) -> float:
             # there is a status effect to the move
             if move_ai.status_effect is not None:
-                thorn_mp = opponent.__checkTypeRelationship__(move_ai.status_effect.type)
-
                 # normalized status score (inside the score_se function)
                 status_score = \
-                    score_se(move_ai.status_effect, faster, True, opponent_attacking, 1, thorn_mp, round_cap,
-                             damage_worth, thorn_damage_worth, opponent.isStunned) * (move_ai.status_chance / 100) * move_ai.hit_attempts
-
+                    cached_score_se(move_ai.status_effect, se_key, speed_advantage(move_ai, move_op), True,
+                                    not move_op.target_self, 1, thorn_mp, round_cap,
+                                    damage_worth, thorn_damage_worth, opponent.isStunned) * \
+                    (move_ai.status_chance / 100) * move_ai.hit_attempts
             else: # there is no status possible with the move
                 status_score = 0
-            scores[index] = \
-                (damage_score + status_score) * \
-                cr_mo_op_multiplier[ai.c.id][move_indices[index]][opponent.c.id]
 
             # if the move makes AI kill itself, set score to something bad!
             # for instance, shed skin with 1 health or reset void with 4 or less :P
             if ai.health - damage <= 0:
-                scores[index] = -100
-            #print(f"score_move final for {move_ai.name} {scores[index]} with cr_mo_op mp "
-            #  f"{cr_mo_op_multiplier[ai.c.id][move_indices[index]][opponent.c.id]}")
-
-        # ATTACKING MOVE
-        elif is_not_stunned:
-
-            damage_worth = 60 / opponent.c.health
-            thorn_damage_worth = 60 / ai.c.health
-
-            aim_mod = 0
-            damage_mod = 0
-            defense_mod = 0
-            thorn_mod_low = 0
-            thorn_mod_high = 0
-
-            so: cr.StatusOccurrence
-            for so in ai.active_statuses:
-                aim_mod += so.se.aim_mod
-                if so.se.damage_mod_type is None:
-                    damage_mod += so.se.damage_mod
-                elif move_ai.type == so.se.damage_mod_type:
-                    damage_mod += so.se.damage_mod
-            for so in opponent.active_statuses:
-                defense_mod += so.se.defense_mod
-                thorn_mod_low += so.se.thorn_damage_low
-                thorn_mod_high += so.se.thorn_damage_high
-
-            hit_chance = move_ai.aim + aim_mod - opponent.c.defense - defense_mod
-            if hit_chance > 110:
-                hit_chance = 110
-            if hit_chance < 0: # fix for double negative
-                hit_chance = 0
-            damage_mp = opponent.__checkTypeRelationship__(move_ai.type)
-
-            # damage mod gives extra incentive to use that move before the status expires
-            # despite the damage being equal value against opponent's health
-            damage_mod *= 2
-
-            # calculate damage
-            damage = ((((move_ai.damage_low + move_ai.damage_high) / 2)
-                       + damage_mod) * damage_mp)
-            if damage < 0:
-                damage = 0
-
-            damage_score = \
-                damage * (hit_chance / 100) * move_ai.hit_attempts
-
-            # if damage will likely instantly kill opponent, add extra score - this is likely no time to heal yourself
-            if damage_score > opponent.health:
-                damage_score += 5
-
-            # normalized damage score
-            damage_score *= 10 * damage_worth
-
-            # add extinguishing score to damage_score
-            damage_score += score_extinguish(opponent, move_ai)
-
-            # calculate and normalize retaliation/leech
-            thorn_damage = 10 * (thorn_mod_low + thorn_mod_high) / 2
-            heal_limit = ai.c.health - ai.health  # max health that can be leeched rn
-            if thorn_damage < -heal_limit:
-                thorn_damage = -heal_limit * thorn_damage_worth
-
+                return -100
+            return (damage_score + status_score) * multiplier
+
+    # ATTACKING MOVE
+    elif is_not_stunned:
+
+        damage_worth = 60 / opponent.c.health
+        thorn_damage_worth = 60 / ai.c.health
+
+        aim_mod = 0
+        damage_mod = 0
+        defense_mod = 0
+        thorn_mod_low = 0
+        thorn_mod_high = 0
+
+        so: cr.StatusOccurrence
+        for so in ai.active_statuses:
+            aim_mod += so.se.aim_mod
+            if so.se.damage_mod_type is None:
+                damage_mod += so.se.damage_mod
+            elif move_ai.type == so.se.damage_mod_type:
+                damage_mod += so.se.damage_mod
+        for so in opponent.active_statuses:
+            defense_mod += so.se.defense_mod
+            thorn_mod_low += so.se.thorn_damage_low
+            thorn_mod_high += so.se.thorn_damage_high
+
+        hit_chance = move_ai.aim + aim_mod - opponent.c.defense - defense_mod
+        if hit_chance > 110:
+            hit_chance = 110
+        if hit_chance < 0: # fix for double negative
+            hit_chance = 0
+        damage_mp = opponent.__checkTypeRelationship__(move_ai.type)
+
+        # damage mod gives extra incentive to use that move before the status expires
+        # despite the damage being equal value against opponent's health
+        damage_mod *= 2
+
+        # calculate damage
+        damage = ((((move_ai.damage_low + move_ai.damage_high) / 2)
+                   + damage_mod) * damage_mp)
+        if damage < 0:
+            damage = 0
+
+        damage_score = \
+            damage * (hit_chance / 100) * move_ai.hit_attempts
+
+        # if damage will likely instantly kill opponent, add extra score - this is likely no time to heal yourself
+        if damage_score > opponent.health:
+            damage_score += 5
+
+        # normalized damage score
+        damage_score *= 10 * damage_worth
+
+        # add extinguishing score to damage_score
+        damage_score += score_extinguish(opponent, move_ai)
+
+        # calculate and normalize retaliation/leech
+        thorn_damage = 10 * (thorn_mod_low + thorn_mod_high) / 2
+        heal_limit = ai.c.health - ai.health  # max health that can be leeched rn
+        if thorn_damage < -heal_limit:
+            thorn_damage = -heal_limit * thorn_damage_worth
+
+        # there is a status effect with the move
+        if move_ai.status_effect is not None:
+            status_mp = opponent.__checkTypeRelationship__(move_ai.status_effect.type)
+
+        multiplier = cr.ai_multipliers[ai.c.id][move_index][opponent.c.id]
+
+        def score(move_op: cr.Move) -> float:
             # there is a status effect with the move
             if move_ai.status_effect is not None:
-                status_mp = opponent.__checkTypeRelationship__(move_ai.status_effect.type)
                 # normalized status score (inside the score_se function)
                 status_score = \
-                    score_se(move_ai.status_effect, faster, False, opponent_attacking, status_mp, 1,
-                             round_cap, damage_worth, thorn_damage_worth, opponent.isStunned) * \
+                    cached_score_se(move_ai.status_effect, se_key, speed_advantage(move_ai, move_op), False,
+                                    not move_op.target_self, status_mp, 1,
+                                    round_cap, damage_worth, thorn_damage_worth, opponent.isStunned) * \
                     (move_ai.status_chance / 100) * status_mp * \
                     (hit_chance / 100) * move_ai.hit_attempts
             else: # there is no status effect with the move
                 status_score = 0
-            scores[index] = \
-                (damage_score - thorn_damage + status_score) * \
-                cr_mo_op_multiplier[ai.c.id][move_indices[index]][opponent.c.id]
-            #print(f"score_move final for {move_ai.name} {scores[index]} with cr_mo_op mp "
-            #      f"{cr_mo_op_multiplier[ai.c.id][move_indices[index]][opponent.c.id]}")
-        else: # STUNNED
-            scores[index] = 0
+            return (damage_score - thorn_damage + status_score) * multiplier
+
+    else: # STUNNED
+        def score(move_op: cr.Move) -> float:
+            return 0
+
+    return score
+
+# which move will be played first will impact each moves' results
+def speed_advantage(move_ai: cr.Move, move_op: cr.Move) -> float:
+    if move_ai.speed > move_op.speed:
+        return 1.0
+    elif move_ai.speed < move_op.speed:
+        return 0.0
+    else:
+        return 0.5
+
+def score_move(creatures: list[cr.CreatureOccurrence, cr.CreatureOccurrence],
+               move_indices: list[int, int]) -> (float, float):
+    scores: list[float, float] = [0, 0]
+
+    for index in range(2):
+        opponent = creatures[(index + 1) % 2]
+        scores[index] = move_scores(creatures[index], opponent, move_indices[index])[move_indices[(index + 1) % 2]]
 
     return scores[0], scores[1]
 
+# scores of ai's move against each of opponent's 7 moves, remembered by fingerprints of both creatures
+# fingerprints can be passed in when they are already known
+def move_scores(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence, move_index: int,
+                ai_key: tuple = None, opponent_key: tuple = None) -> tuple[float, ...]:
+    if ai_key is None:
+        ai_key = ai.__fingerprint__()
+    if opponent_key is None:
+        opponent_key = opponent.__fingerprint__()
+    cr.get_type_matrix()  # so that type_matrix_version is up to date
+
+    def compute() -> tuple[float, ...]:
+        score = move_scorer(ai, opponent, move_index)
+        return tuple(score(move_op) for move_op in opponent.c.moves)
+
+    return move_scores_cache.__getScore__(
+        (ai_key, opponent_key, move_index, cr.type_matrix_version, cr.testing_wout_type), compute)
+
+# scores of all pairs of ai's and opponent's moves, built in one pass - payoff[ai move index][opponent move index]
+# is the same as the first score of score_move([ai, opponent], [ai move index, opponent move index])
+# only pairs of the given moves are filled in, others are left at 0
+def payoff_matrix(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+                  ai_moves: list[int, ...], opponent_moves: list[int, ...]) -> list[list[float, ...], ...]:
+    ai_key = ai.__fingerprint__()
+    opponent_key = opponent.__fingerprint__()
+    payoff = [[0, 0, 0, 0, 0, 0, 0] for ami in range(0, 7)]
+    for ami in ai_moves:
+        scores = move_scores(ai, opponent, ami, ai_key, opponent_key)
+        for omi in opponent_moves:
+            payoff[ami][omi] = scores[omi]
+    return payoff
+
+# indices of moves that are off cooldown and affordable with current rage
+def legal_moves(co: cr.CreatureOccurrence) -> list[int, ...]:
+    return [i for i in range(0, 7) if co.cooldowns[i] <= 0 and co.rage >= co.c.moves[i].rage_cost]
+
+
+# move used when every move is on cooldown - the one that comes off cooldown first (the rage move is never forced)
+def forced_move(co: cr.CreatureOccurrence) -> int:
+    return min(range(0, 6), key=lambda i: co.cooldowns[i])
+
+
+# LOOKAHEAD (ai levels 11-15)
+# turns are played out on copies of both active creatures, with every random roll of a move
+# (hit, graze or miss of each attempt, status proc) as a chance outcome and damage rolls at their average
+
+# moves creature can choose from, -2 if it's stunned or has no move to make (skips the turn)
+def move_options(co: cr.CreatureOccurrence) -> list[int, ...]:
+    moves = legal_moves(co) if not co.isStunned else []
+    if len(moves) == 0:
+        return [-2]
+    return moves
+
+
+# chance of random.randrange(0, 100) > 100 - chance, the way moves roll
+def roll_chance(chance: int) -> float:
+    return min(max(chance - 1, 0), 100) / 100
+
+
+# damage modifier never turns damage into healing or healing into damage, zero damage is left alone
+def modify_damage(damage: int, damage_mod: int) -> int:
+    if damage < 0:
+        return min(damage + damage_mod, 0)
+    elif damage > 0:
+        return max(damage + damage_mod, 0)
+    return damage
+
+
+# every roll of random.randrange(low, high + 1), or high if low isn't less than high - like in __makeMove__
+def damage_rolls(low: int, high: int) -> range:
+    if low < high:
+        return range(low, high + 1)
+    return range(high, high + 1)
+
+
+# everything about both creatures that the rest of the battle depends on
+def state_key(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence) -> tuple:
+    return (ai.__fingerprint__(), tuple(ai.cooldowns), ai.rage,
+            opponent.__fingerprint__(), tuple(opponent.cooldowns), opponent.rage)
+
+
+# the same as __takeDamage__, without printouts and events
+def take_damage(co: cr.CreatureOccurrence, damage: int):
+    if damage > 0:
+        co.rage += damage
+        if co.rage > co.c.rage:
+            co.rage = co.c.rage
+    co.health -= damage
+    if co.health > co.c.health:
+        co.health = co.c.health
+
+
+# the same as __checkForExtinguishing__, without printouts and events
+def extinguish(co: cr.CreatureOccurrence, type: cr.Type):
+    if type.isAnExtinguisher and not cr.testing_wout_type:
+        co.active_statuses = [so for so in co.active_statuses if not co.__checkTypesWeakness__(so.se.type, type)]
+
+
+# the same as __applyStatus__, without printouts and events
+def apply_status(co: cr.CreatureOccurrence, se: cr.StatusEffect):
+    so = cr.StatusOccurrence(se)
+    so.damage_modifier = co.__checkTypeRelationship__(se.type)
+    co.active_statuses.append(so)
+
+
+# possible results of attacker using move against defender, as (chance, damage to target, status applied,
+# thorn damage to attacker, move connected) - attempts are added up by number of hits, grazes and status procs
+# unlikely results are dropped, the rest is at most max_outcomes most likely results
+def move_outcomes(attacker: cr.CreatureOccurrence, defender: cr.CreatureOccurrence, move: cr.Move,
+                  max_outcomes: int = 4) -> list[(float, int, bool, int, bool), ...]:
+    damage_mod = 0
+    so: cr.StatusOccurrence
+    for so in attacker.active_statuses:
+        if so.se.damage_mod_type is None or move.type == so.se.damage_mod_type:
+            damage_mod += so.se.damage_mod
+
+    # creature targets self - every attempt connects, only status procs are random
+    if move.target_self:
+        rolls = damage_rolls(move.damage_low, move.damage_high)
+        damage = round(move.hit_attempts * sum(modify_damage(d, damage_mod) for d in rolls) / len(rolls))
+        if move.status_effect is None:
+            return [(1, damage, False, 0, True)]
+        proc_chance = 1 - (1 - roll_chance(move.status_chance)) ** move.hit_attempts
+        outcomes = [(proc_chance, damage, True, 0, True), (1 - proc_chance, damage, False, 0, True)]
+        return [outcome for outcome in outcomes if outcome[0] > 0]
+
+    # creature targets opponent
+    aim_mod = 0
+    defense_mod = 0
+    thorn_mod_low = 0
+    thorn_mod_high = 0
+    for so in attacker.active_statuses:
+        aim_mod += so.se.aim_mod
+    for so in defender.active_statuses:
+        defense_mod += so.se.defense_mod
+        thorn_mod_low += so.se.thorn_damage_low
+        thorn_mod_high += so.se.thorn_damage_high
+
+    hit_chance = roll_chance(move.aim + aim_mod - defender.c.defense - defense_mod)
+    damage_multiplier = defender.__checkTypeRelationship__(move.type)
+    if move.status_effect is not None:
+        proc_chance = roll_chance(int(move.status_chance * defender.__checkTypeRelationship__(move.status_effect.type)))
+    else:
+        proc_chance = 0
+
+    rolls = damage_rolls(move.damage_low, move.damage_high)
+    hit_damage = sum(int(modify_damage(d, damage_mod) * damage_multiplier) for d in rolls) / len(rolls)
+
+    # graze damage, with the teensy extra miss chance
+    grazes = []
+    if move.damage_low < move.damage_high:
+        for d in rolls:
+            graze = int(modify_damage(d - move.damage_low, damage_mod) * damage_multiplier)
+            graze -= (graze > 0) - (graze < 0)
+            if graze != 0:
+                grazes.append(graze)
+    graze_chance = (1 - hit_chance) * len(grazes) / len(rolls)
+    graze_damage = sum(grazes) / len(grazes) if grazes else 0
+
+    # thorn damage is always taken, leech only with a hit or a graze
+    thorn_rolls = damage_rolls(thorn_mod_low, thorn_mod_high)
+    thorn_damage = sum(max(t, 0) for t in thorn_rolls) / len(thorn_rolls)
+    leech = sum(min(t, 0) for t in thorn_rolls) / len(thorn_rolls)
+
+    # (hits, grazes, status applied) after each attempt
+    attempts = {(0, 0, False): 1}
+    for i in range(0, move.hit_attempts):
+        after = {}
+        for (hits, grazes_n, proc), chance in attempts.items():
+            for key, key_chance in (((hits + 1, grazes_n, True), hit_chance * proc_chance),
+                                    ((hits + 1, grazes_n, proc), hit_chance * (1 - proc_chance)),
+                                    ((hits, grazes_n + 1, proc), graze_chance),
+                                    ((hits, grazes_n, proc), 1 - hit_chance - graze_chance)):
+                if key_chance > 0:
+                    after[key] = after.get(key, 0) + chance * key_chance
+        attempts = after
+
+    outcomes = {}
+    for (hits, grazes_n, proc), chance in attempts.items():
+        connected = hits + grazes_n > 0
+        key = (round(hits * hit_damage + grazes_n * graze_damage), proc,
+               round(thorn_damage + (leech if connected else 0)), hits > 0)
+        outcomes[key] = outcomes.get(key, 0) + chance
+
+    # keep the most likely results
+    outcomes = [(key, chance) for key, chance in sorted(outcomes.items(), key=lambda item: -item[1])[:max_outcomes]
+                if chance >= 0.02]
+    kept = sum(chance for key, chance in outcomes)
+    return [(chance / kept,) + key for key, chance in outcomes]
+
+
+# play out one result of a move (see move_outcomes) on creatures in place
+def apply_outcome(attacker: cr.CreatureOccurrence, defender: cr.CreatureOccurrence, move: cr.Move,
+                  outcome: (float, int, bool, int, bool)):
+    chance, damage, status_applied, thorn_damage, connected = outcome
+    attacker.rage -= move.rage_cost
+    if move.target_self:
+        if status_applied:
+            apply_status(attacker, move.status_effect)
+            extinguish(attacker, move.status_effect.type)
+        take_damage(attacker, damage)
+        extinguish(attacker, move.type)
+    else:
+        take_damage(defender, damage)
+        if connected:
+            extinguish(defender, move.type)
+        if status_applied:
+            apply_status(defender, move.status_effect)
+            extinguish(defender, move.status_effect.type)
+        take_damage(attacker, thorn_damage)
+
+
+# the same as __tickStatus__, with average tick damage
+def tick_statuses(co: cr.CreatureOccurrence):
+    statuses = co.active_statuses
+    co.active_statuses = []
+    for so in statuses:
+        if so.status_d <= 0:
+            continue
+        co.active_statuses.append(so)
+        so.status_d -= 1
+        if so.stun_d >= 0:
+            so.stun_d -= 1
+        rolls = damage_rolls(so.se.damage_low, so.se.damage_high)
+        take_damage(co, round(sum(int(d * so.damage_modifier) if d > 0 else d for d in rolls) / len(rolls)))
+
+
+# status ticks, stun checks and cooldown ticks like Engine.__startTurn__
+def start_next_turn(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence):
+    tick_statuses(ai)
+    tick_statuses(opponent)
+    for co in (ai, opponent):
+        co.__checkIfStunned__()
+        for i in range(0, 7):
+            if co.cooldowns[i] >= 1:
+                co.cooldowns[i] -= 1
+
+
+# who moves when ai and opponent make their moves (-2 for stunned), as (chance, order) with 0 for ai
+# and 1 for opponent - like Engine.__resolveTurn__, with both orders for moves of equal speed
+def move_orders(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+                ai_move: int, opponent_move: int) -> list[(float, tuple[int, ...]), ...]:
+    if ai_move == -2 and opponent_move == -2:
+        return [(1, ())]
+    elif opponent_move == -2:
+        return [(1, (0,))]
+    elif ai_move == -2:
+        return [(1, (1,))]
+    elif ai.c.moves[ai_move].speed > opponent.c.moves[opponent_move].speed:
+        return [(1, (0, 1))]
+    elif ai.c.moves[ai_move].speed < opponent.c.moves[opponent_move].speed:
+        return [(1, (1, 0))]
+    return [(0.5, (0, 1)), (0.5, (1, 0))]
+
+
+# possible states after ai and opponent make their moves (-2 for stunned) and the next turn starts,
+# as (chance, ai, opponent)
+def turn_outcomes(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+                  ai_move: int, opponent_move: int) -> list[(float, cr.CreatureOccurrence, cr.CreatureOccurrence), ...]:
+    results = []
+    for order_chance, order in move_orders(ai, opponent, ai_move, opponent_move):
+        states = [(order_chance, ai.__clone__(), opponent.__clone__())]
+        for position, side in enumerate(order):
+            after = []
+            for chance, state_ai, state_opponent in states:
+                attacker, defender = (state_ai, state_opponent) if side == 0 else (state_opponent, state_ai)
+                move_index = ai_move if side == 0 else opponent_move
+
+                # moving second means creature could have been stunned out of it's move
+                if position == 1:
+                    attacker.__checkIfStunned__()
+                    if attacker.isStunned:
+                        after.append((chance, state_ai, state_opponent))
+                        continue
+
+                move = attacker.c.moves[move_index]
+                outcomes = move_outcomes(attacker, defender, move)
+                for i, outcome in enumerate(outcomes):
+                    if i < len(outcomes) - 1:
+                        next_ai, next_opponent = state_ai.__clone__(), state_opponent.__clone__()
+                    else:  # last outcome can have the state itself
+                        next_ai, next_opponent = state_ai, state_opponent
+                    next_attacker, next_defender = (next_ai, next_opponent) if side == 0 else (next_opponent, next_ai)
+                    apply_outcome(next_attacker, next_defender, move, outcome)
+                    next_attacker.cooldowns[move_index] = move.cooldown + 1
+                    after.append((chance * outcome[0], next_ai, next_opponent))
+            states = after
+        results.extend(states)
+
+    for chance, state_ai, state_opponent in results:
+        if state_ai.health > 0 and state_opponent.health > 0:
+            start_next_turn(state_ai, state_opponent)
+    return results
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+# expectimax search for ai levels 11-15 - ai's moves are max nodes, opponent's replies min nodes
+# and rolls of both moves chance nodes, states after max_depth turns are scored with score_move heuristics
+# it searches one turn deeper at a time until the time budget (in seconds) runs out, and it can think
+# in slices (i.e. a little every frame) - searched states stay in the transposition table,
+# so an interrupted depth continues quickly with the next slice
+class ExpectimaxSearch:
+    def __init__(self, max_depth: int, budget: float):
+        self.max_depth = max_depth
+        self.budget = budget
+        # values of searched states by (state_key, depth)
+        self.table = ScoreCache(50000)
+
+        self.thinking = False
+        self.ai = None
+        self.opponent = None
+        self.thinking_time = 0
+        self.depth = 0  # deepest fully searched depth
+        self.best_move = -1  # best move of the deepest fully searched depth
+        self.deadline = 0
+        self.nodes = 0
+
+    # think for at most time_slice seconds (the whole budget if None), returns True when the move is decided
+    # a new decision starts with the first call after the previous one was decided
+    def __think__(self, ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence, time_slice: float = None) -> bool:
+        if time_slice is None:
+            time_slice = self.budget
+        if not self.thinking:
+            self.thinking = True
+            self.ai = ai.__clone__()
+            self.opponent = opponent.__clone__()
+            self.thinking_time = 0
+            self.depth = 0
+            self.best_move = -1
+            self.nodes = 0
+
+        start = perf_counter()
+        self.deadline = start + min(time_slice, self.budget - self.thinking_time)
+        try:
+            while self.depth < self.max_depth:
+                self.best_move = self.__searchRoot__(self.depth + 1)
+                self.depth += 1
+        except SearchTimeout:
+            pass
+        self.thinking_time += perf_counter() - start
+
+        if self.depth >= self.max_depth or self.thinking_time >= self.budget:
+            self.thinking = False
+            lg.ai.info("searched %d turns ahead (%d states, %.3fs, table hit rate %.2f), best move %d",
+                       self.depth, self.nodes, self.thinking_time, self.table.__hitRate__(), self.best_move)
+        return not self.thinking
+
+    def __searchRoot__(self, depth: int) -> int:
+        ai_moves = move_options(self.ai)
+        # best move of the previous depth first, it most likely stays the best
+        if self.best_move in ai_moves:
+            ai_moves.remove(self.best_move)
+            ai_moves.insert(0, self.best_move)
+
+        best_move = ai_moves[0]
+        best_value = float("-inf")
+        for ai_move in ai_moves:
+            value = self.__moveValue__(self.ai, self.opponent, ai_move, depth, best_value)
+            if value > best_value:
+                best_move = ai_move
+                best_value = value
+        return best_move
+
+    # value of ai's move - opponent replies with it's best move, stops early once it's no better than alpha
+    def __moveValue__(self, ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+                      ai_move: int, depth: int, alpha: float) -> float:
+        worst = float("inf")
+        for opponent_move in move_options(opponent):
+            value = 0
+            for chance, next_ai, next_opponent in turn_outcomes(ai, opponent, ai_move, opponent_move):
+                value += chance * self.__value__(next_ai, next_opponent, depth - 1)
+            if value < worst:
+                worst = value
+                if worst <= alpha:
+                    break
+        return worst
+
+    def __value__(self, ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence, depth: int) -> float:
+        if perf_counter() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+
+        if ai.health <= 0 or opponent.health <= 0:
+            return evaluate_state(ai, opponent)
+
+        def compute() -> float:
+            if depth == 0:
+                return evaluate_state(ai, opponent)
+            best = float("-inf")
+            for ai_move in move_options(ai):
+                best = max(best, self.__moveValue__(ai, opponent, ai_move, depth, best))
+            return best
+
+        return self.table.__getScore__((state_key(ai, opponent), depth), compute)
+
+
+# value of a state for ai - health of both creatures, a faint and ai's best average (safe) move
+# from the payoff matrices of the state, in the units of score_move
+# a faint ends the lookahead, replacements are not taken into account
+def evaluate_state(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence) -> float:
+    value = 600 * (max(ai.health, 0) / ai.c.health - max(opponent.health, 0) / opponent.c.health)
+    if ai.health <= 0 or opponent.health <= 0:
+        if ai.health <= 0:
+            value -= 300
+        if opponent.health <= 0:
+            value += 300
+        return value
+
+    ai_moves = legal_moves(ai)
+    opponent_moves = legal_moves(opponent)
+    if len(ai_moves) == 0 or len(opponent_moves) == 0:
+        return value
+    return value + best_average_move(ai, opponent, ai_moves, opponent_moves)[1]
+
+
+# ai's move with the best average score against all of opponent's moves, as (move index, reward)
+def best_average_move(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+                      ai_moves: list[int, ...], opponent_moves: list[int, ...]) -> (int, float):
+    payoff_ai = payoff_matrix(ai, opponent, ai_moves, opponent_moves)
+    payoff_opponent = payoff_matrix(opponent, ai, opponent_moves, ai_moves)
+    best_move = -1
+    best_reward = float("-inf")
+    for ami in ai_moves:
+        reward = 0
+        for omi in opponent_moves:
+            reward += payoff_ai[ami][omi] - payoff_opponent[omi][ami]
+        reward /= len(opponent_moves)
+        if reward > best_reward:
+            best_move = ami
+            best_reward = reward
+    return best_move, best_reward
+
+
+# MONTE CARLO TREE SEARCH
+# battles are played out on copies of both active creatures over and over, with one outcome of every random roll
+# picked at random, and the move that was tried the most is chosen
+
+# play one turn out on ai and opponent in place (moves -2 for stunned), with every roll picked by rng
+# like turn_outcomes, but following only one of the outcomes
+def play_turn(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+              ai_move: int, opponent_move: int, rng: random.Random):
+    orders = move_orders(ai, opponent, ai_move, opponent_move)
+    order = orders[0][1] if len(orders) == 1 else rng.choice(orders)[1]
+    for position, side in enumerate(order):
+        attacker, defender = (ai, opponent) if side == 0 else (opponent, ai)
+        move_index = ai_move if side == 0 else opponent_move
+
+        # moving second means creature could have been stunned out of it's move
+        if position == 1:
+            attacker.__checkIfStunned__()
+            if attacker.isStunned:
+                continue
+
+        move = attacker.c.moves[move_index]
+        outcomes = move_outcomes(attacker, defender, move)
+        outcome = rng.choices(outcomes, weights=[outcome[0] for outcome in outcomes])[0]
+        apply_outcome(attacker, defender, move, outcome)
+        attacker.cooldowns[move_index] = move.cooldown + 1
+
+    if ai.health > 0 and opponent.health > 0:
+        start_next_turn(ai, opponent)
+
+
+# move of creature in a playout - mostly it's best average move if guided, else a random one
+def playout_move(co: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence,
+                 rng: random.Random, guided: bool) -> int:
+    moves = move_options(co)
+    if moves[0] == -2:
+        return -2
+    if guided and rng.random() < 0.75:
+        opponent_moves = legal_moves(opponent)
+        if len(opponent_moves) > 0:
+            return best_average_move(co, opponent, moves, opponent_moves)[0]
+    return rng.choice(moves)
+
+
+# result of a playout for ai - 1 for a win, 0 for a loss, by health left if it was cut short
+def playout_result(ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence) -> float:
+    if ai.health <= 0 and opponent.health <= 0:
+        return 0.5
+    elif opponent.health <= 0:
+        return 1
+    elif ai.health <= 0:
+        return 0
+    return 0.5 + 0.5 * (ai.health / ai.c.health - opponent.health / opponent.c.health)
+
+
+# node of the search tree, reached by a sequence of move pairs
+# the same moves can lead to different states (rolls, stuns, rage), so options of both creatures
+# are rated on their own, each by it's own creature's results
+class MonteCarloNode:
+    def __init__(self):
+        self.ai_visits = {}
+        self.ai_results = {}
+        self.opponent_visits = {}
+        self.opponent_results = {}
+        self.children = {}  # by (ai move, opponent move)
+
+    # option with the best upper confidence bound, options that weren't tried yet go first
+    @staticmethod
+    def __select__(options: list[int, ...], visits: dict, results: dict,
+                   exploration: float, rng: random.Random) -> int:
+        untried = [option for option in options if option not in visits]
+        if len(untried) > 0:
+            return rng.choice(untried)
+        log_total = math.log(sum(visits[option] for option in options))
+        return max(options, key=lambda option: results[option] / visits[option] +
+                   exploration * math.sqrt(log_total / visits[option]))
+
+    def __update__(self, ai_move: int, opponent_move: int, result: float):
+        self.ai_visits[ai_move] = self.ai_visits.get(ai_move, 0) + 1
+        self.ai_results[ai_move] = self.ai_results.get(ai_move, 0) + result
+        self.opponent_visits[opponent_move] = self.opponent_visits.get(opponent_move, 0) + 1
+        self.opponent_results[opponent_move] = self.opponent_results.get(opponent_move, 0) + 1 - result
+
+
+# monte carlo tree search - an alternative to ExpectimaxSearch (see Player), with the same way of thinking
+# playouts are played in a worker thread, so the battle screen keeps animating while it runs,
+# until either budget runs out - playouts or milliseconds (None for no limit, one of them is needed)
+# playouts last at most playout_turns turns and are guided by score_move heuristics if guided is True
+class MonteCarloSearch:
+    def __init__(self, playouts: int = 2000, milliseconds: int = 500, playout_turns: int = 10,
+                 guided: bool = True, exploration: float = 1.4, seed: int = None):
+        if playouts is None and milliseconds is None:
+            raise ValueError("monte carlo search needs a budget of playouts or milliseconds")
+        self.playouts = playouts
+        self.budget = milliseconds / 1000 if milliseconds is not None else None
+        self.playout_turns = playout_turns
+        self.guided = guided
+        self.exploration = exploration
+        # own random numbers, the thread doesn't touch the rolls of the battle
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+
+        self.worker = None
+        self.error = None  # exception the worker stopped with, raised again by __think__
+        self.ai = None
+        self.opponent = None
+        self.root = None
+        self.playouts_done = 0
+        self.thinking_time = 0
+        self.best_move = -1
+
+    # wait for the worker at most time_slice seconds (until it's done if None), returns True when the move is decided
+    # a new decision starts with the first call after the previous one was decided
+    def __think__(self, ai: cr.CreatureOccurrence, opponent: cr.CreatureOccurrence, time_slice: float = None) -> bool:
+        if self.worker is None:
+            self.ai = ai.__clone__()
+            self.opponent = opponent.__clone__()
+            self.root = MonteCarloNode()
+            self.playouts_done = 0
+            self.best_move = -1
+            self.worker = threading.Thread(target=self.__run__, daemon=True)
+            self.worker.start()
+
+        self.worker.join(time_slice)
+        if self.worker.is_alive():
+            return False
+        self.worker = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+        # the most tried move is the most trusted one
+        if len(self.root.ai_visits) > 0:
+            self.best_move = max(self.root.ai_visits, key=lambda move: self.root.ai_visits[move])
+        lg.ai.info("played out %d battles (%.3fs), best move %d tried %d times",
+                   self.playouts_done, self.thinking_time, self.best_move, self.root.ai_visits.get(self.best_move, 0))
+        return True
+
+    def __run__(self):
+        start = perf_counter()
+        try:
+            while (self.playouts is None or self.playouts_done < self.playouts) and \
+                    (self.budget is None or perf_counter() - start < self.budget):
+                self.__playout__()
+                self.playouts_done += 1
+        except Exception as error:
+            self.error = error
+        self.thinking_time = perf_counter() - start
+
+    # one pass - down the tree to a new node, a playout from there and it's result to every node on the way
+    def __playout__(self):
+        ai = self.ai.__clone__()
+        opponent = self.opponent.__clone__()
+        node = self.root
+        path = []
+        turns = 0
+
+        while node is not None and ai.health > 0 and opponent.health > 0 and turns < self.playout_turns:
+            ai_move = node.__select__(move_options(ai), node.ai_visits, node.ai_results, self.exploration, self.rng)
+            opponent_move = node.__select__(move_options(opponent), node.opponent_visits, node.opponent_results,
+                                            self.exploration, self.rng)
+            path.append((node, ai_move, opponent_move))
+            play_turn(ai, opponent, ai_move, opponent_move, self.rng)
+            turns += 1
+
+            node = node.children.get((ai_move, opponent_move))
+            if node is None:
+                path[-1][0].children[(ai_move, opponent_move)] = MonteCarloNode()
+
+        while ai.health > 0 and opponent.health > 0 and turns < self.playout_turns:
+            play_turn(ai, opponent, playout_move(ai, opponent, self.rng, self.guided),
+                      playout_move(opponent, ai, self.rng, self.guided), self.rng)
+            turns += 1
+
+        result = playout_result(ai, opponent)
+        for node, ai_move, opponent_move in path:
+            node.__update__(ai_move, opponent_move, result)
+
 
 class Player:
-    def __init__(self, id: int, creatures: list[cr.CreatureOccurrence, ...], ai: int = -1):
+    def __init__(self, id: int, creatures: list[cr.CreatureOccurrence, ...], ai: int = -1, search=None,
+                 rng: random.Random = None):
         self.id = id
+        # random numbers for choosing moves, the global ones if None until it joins a battle (see __joinBattle__)
+        self.rng = rng if rng is not None else random
         self.creatures = creatures  # player's creatures
         self.ac_index = 0
         self.ac = creatures[self.ac_index]  # active creature
         self.ai = ai  # ai difficulty (-1 means Player is controlled by a human)
-        if self.ai > 10:
-            self.ai = 10
+        if self.ai > 15:
+            self.ai = 15
+        # ai levels 11-15 look 2 to 4 turns ahead, thinking longer with higher levels
+        # any ai can be given a search to choose moves with instead (i.e. MonteCarloSearch)
+        if search is not None:
+            self.search = search
+        elif self.ai > 10:
+            self.search = ExpectimaxSearch(2 + (self.ai - 11) // 2, 0.2 * (self.ai - 10))
+        else:
+            self.search = None
         # how much ai appreciates own score against enemy move score
         # 0.5 means equally, 1 means it will do a safe move, 0 means it will make a risky move half the time
-        self.risk_aversion_factor = random.uniform(0.2, 0.9)
+        # it's drawn from the battle's random numbers when the player joins one
+        self.risk_aversion_factor = 0.5
         # 0.5 means equally, 1 means it assumes a bold opponent move half the time, 0 means it assumes safe move
-        self.assume_blunder_factor = random.uniform(0.1, 0.8)
+        self.assume_blunder_factor = 0.5
         # max cap for random score factor (AI can make mistakes in calculations that add randomness)
         self.random_score_factor_cap = 0.25 - float(self.ai / 20)
         if self.random_score_factor_cap < 0:
@@ -333,6 +957,13 @@ class Player:
         # if cooldown is high, modifier increases more slowly
         self.novelty_factor = [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
 
+    # the player chooses moves with rng (split off the battle's seed) from now on
+    # the factors are drawn from it too, so the same seed plays the same battle however the player was made
+    def __joinBattle__(self, rng: random.Random):
+        self.rng = rng
+        self.risk_aversion_factor = self.rng.uniform(0.2, 0.9)
+        self.assume_blunder_factor = self.rng.uniform(0.1, 0.8)
+
     # was guess correct?
     def risk_evaluation(self, op_assumed: int, op_assumed_name: str, op_roll: int, counter_mode: str):
 
@@ -347,8 +978,8 @@ class Player:
                 text[0] = f"PLAYER {self.id} THOUGHT IT'S OPPONENT WILL MAKE"
                 text[1] = f'A RISKY MOVE OF "{op_assumed_name}"...'
 
-            print(f"pre-round raf and baf for {self.ac.c.name} "
-                  f"{self.risk_aversion_factor} {self.assume_blunder_factor}")
+            lg.ai.debug("pre-round raf and baf for %s %s %s",
+                        self.ac.c.name, self.risk_aversion_factor, self.assume_blunder_factor)
             if op_assumed == op_roll: # it was correct
                 text[2] = f"PLAYER {self.id} WAS RIGHT!"
                 text[3] = "BEHAVIOUR REINFORCED!"
@@ -373,14 +1004,10 @@ class Player:
                     self.assume_blunder_factor -= 0.2
                     if self.assume_blunder_factor < 0.1:
                         self.assume_blunder_factor = 0.1
-            print(f"post-round raf and baf for {self.ac.c.name} "
-                  f"{self.risk_aversion_factor} {self.assume_blunder_factor}")
+            lg.ai.debug("post-round raf and baf for %s %s %s",
+                        self.ac.c.name, self.risk_aversion_factor, self.assume_blunder_factor)
 
-            if self.ac.bs is not None:
-                self.ac.bs.__animateTextbox__(True)
-                self.ac.bs.__animateBattleText__(text[0], text[1])
-                self.ac.bs.__animateBattleText__(text[2], text[3])
-                self.ac.bs.__animateTextbox__(False)
+            self.ac.__emit__(ev.RiskEvaluationEvent(self.id, text))
 
     def __calculateNoveltyFactors__(self, move_roll: int):
         for ind in range(0, 7):
@@ -402,121 +1029,132 @@ class Player:
                     self.novelty_factor[ind] = 1.65 - 0.1 * ai_lvl
             else:
                 self.novelty_factor[ind] = 1
-        print(f"p{self.id} novelty factors {self.novelty_factor}")
+        lg.ai.debug("p%d novelty factors %s", self.id, self.novelty_factor)
 
     # returns move index and assumed opponent move if risking, else -1, and a string code "" "c" or "cc"
     # "" stands for normal move, "c" for "countermove" and "cc" for "counter-countermove"
-    def __calculateMove__(self, opponent: cr.CreatureOccurrence) -> (int, int, str):
+    # searching ai thinks for at most time_slice seconds per call (until it's decided if None)
+    # and returns move index -1 until it's decided
+    def __calculateMove__(self, opponent: cr.CreatureOccurrence, time_slice: float = None) -> (int, int, str):
+
+        if self.search is not None:  # ai looks a few turns ahead
+            if not self.search.__think__(self.ac, opponent, time_slice):
+                return -1, -1, ""
+            if self.search.best_move >= 0:
+                self.__calculateNoveltyFactors__(self.search.best_move)
+                return self.search.best_move, -1, ""
+            # not even one turn was searched in time, calculate rewards below instead
+
+        # every move is on cooldown - one is used anyway, the engine would take move -1 (the rage move)
+        # without enough rage otherwise, rage would go negative and the battle would never end
+        if len(legal_moves(self.ac)) == 0:
+            move_roll = forced_move(self.ac)
+            self.__calculateNoveltyFactors__(move_roll)
+            return move_roll, -1, ""
 
         if self.ai <= 0:  # dumb ai makes random moves
-            move_roll = random.randrange(0, 7)
+            move_roll = self.rng.randrange(0, 7)
             while self.ac.cooldowns[move_roll] >= 1 or self.ac.rage < self.ac.c.moves[move_roll].rage_cost:
-                move_roll = random.randrange(0, 7)
+                move_roll = self.rng.randrange(0, 7)
 
         else:  # ai calculates rewards of each move in every possible scenario
 
-            move_ai_score_sum = [0, 0, 0, 0, 0, 0, 0]
-            opponent_score_sum = [0, 0, 0, 0, 0, 0, 0]
-            rewards_ai = [0, 0, 0, 0, 0, 0, 0]
+            # moves to take into account - off cooldown and with enough rage
+            ai_moves = legal_moves(self.ac)
+            # an opponent with every move on cooldown is forced to use one of them (no move would be chosen otherwise)
+            opponent_moves = legal_moves(opponent) or [forced_move(opponent)]
+
+            # scores of move pairs - ai's are [ai move][opponent move], opponent's are [opponent move][ai move]
+            payoff_ai = payoff_matrix(self.ac, opponent, ai_moves, opponent_moves)
+            payoff_opponent = payoff_matrix(opponent, self.ac, opponent_moves, ai_moves)
+
+            # mistake in calculations by novice ai
+            for ami in ai_moves:
+                for omi in opponent_moves:
+                    random_factor = self.rng.uniform(0, self.random_score_factor_cap)
+                    payoff_ai[ami][omi] *= 1 - random_factor
+                    payoff_opponent[omi][ami] *= 1 - random_factor
+
+            # figure out own average (safe) move - rows of the matrices
             best_avg_moves_ai_0, best_avg_moves_ai_1 = -1, -1
             best_avg_rewards_ai_0, best_avg_rewards_ai_1 = -100000, -100000
-
-            move_opponent_score_sum = [0, 0, 0, 0, 0, 0, 0]
-            ai_score_sum = [0, 0, 0, 0, 0, 0, 0]
-            n_opponent = [0, 0, 0, 0, 0, 0, 0]
-            rewards_opponent = [0, 0, 0, 0, 0, 0, 0]
+            # best counter-moves to each of your moves
+            move_ai_best_opponent_counter_move = [-1, -1, -1, -1, -1, -1, -1]
+            if len(opponent_moves) > 0:
+                for ami in ai_moves:
+                    move_ai_score_sum = 0
+                    opponent_score_sum = 0
+                    reward = 0
+                    best_counter_score = -100000
+                    for omi in opponent_moves:
+                        a = payoff_ai[ami][omi]
+                        b = payoff_opponent[omi][ami]
+                        move_ai_score_sum += a * self.novelty_factor[ami] # include novelty factor
+                        opponent_score_sum += b
+                        reward += move_ai_score_sum - opponent_score_sum
+                        if b - a > best_counter_score:
+                            best_counter_score = b - a
+                            move_ai_best_opponent_counter_move[ami] = omi
+
+                    reward /= len(opponent_moves)
+                    lg.ai.debug("%s rewards[%d] = %s", self.ac.c.name, ami, reward)
+                    if reward > best_avg_rewards_ai_0:
+                        best_avg_moves_ai_1 = best_avg_moves_ai_0
+                        best_avg_rewards_ai_1 = best_avg_rewards_ai_0
+                        best_avg_moves_ai_0 = ami
+                        best_avg_rewards_ai_0 = reward
+                    elif reward > best_avg_rewards_ai_1:
+                        best_avg_moves_ai_1 = ami
+                        best_avg_rewards_ai_1 = reward
+
+            # figure out opponent's best average (safe) move - columns of the matrices
             best_avg_move_opponent = -1
             best_avg_move_opponent_reward = -100000
-
+            # best counter-moves to each opponent move
             move_opponent_best_ai_counter_move = [-1, -1, -1, -1, -1, -1, -1]
-            move_opponent_best_ai_counter_move_score = [-100000, -100000, -100000, -100000, -100000, -100000, -100000]
-
-            move_ai_best_opponent_counter_move = [-1, -1, -1, -1, -1, -1, -1]
-            move_ai_best_opponent_counter_move_score = [-100000, -100000, -100000, -100000, -100000, -100000, -100000]
-
-            ami = 0
-            while ami < 7:
-                n = 0
-                if self.ac.cooldowns[ami] <= 0 and self.ac.rage >= self.ac.c.moves[ami].rage_cost:  # ai move to take into account
-                    omi = 0
-                    while omi < 7:
-                        if opponent.cooldowns[omi] <= 0 and opponent.rage >= opponent.c.moves[omi].rage_cost:  # opponent move to take into account
-
-                            # calculate move score for moves in pairs
-                            a, b = score_move([self.ac, opponent], [ami, omi])
-
-                            # mistake in calculations by novice ai
-                            random_factor = random.uniform(0, self.random_score_factor_cap)
-                            a *= 1 - random_factor
-                            b *= 1 - random_factor
-
-                            # increment divisors
-                            n += 1
-                            n_opponent[omi] += 1
-
-                            # figure out own average (safe) move
-                            move_ai_score_sum[ami] += a * self.novelty_factor[ami] # include novelty factor
-                            opponent_score_sum[ami] += b
-                            rewards_ai[ami] += move_ai_score_sum[ami] - opponent_score_sum[ami]
-
-                            # figure out opponent's best average (safe) move
-                            move_opponent_score_sum[omi] += b
-                            ai_score_sum[omi] += a
-                            rewards_opponent[omi] += move_opponent_score_sum[omi] - ai_score_sum[omi]
-
-                            # track best counter-moves to each opponent move
-                            if a - b > move_opponent_best_ai_counter_move_score[omi]:
-                                move_opponent_best_ai_counter_move_score[omi] = a - b
-                                move_opponent_best_ai_counter_move[omi] = ami
-                            # track best counter-moves to each of your moves
-                            if b - a > move_ai_best_opponent_counter_move_score[ami]:
-                                move_ai_best_opponent_counter_move_score[ami] = b - a
-                                move_ai_best_opponent_counter_move[ami] = omi
-
-                        omi += 1
-                    if n > 0: # figure out own average reward of average (safe) move
-                        rewards_ai[ami] /= n
-                        print(f"{self.ac.c.name} rewards[{ami}] = {rewards_ai[ami]}")
-                        if rewards_ai[ami] > best_avg_rewards_ai_0:
-                            best_avg_moves_ai_1 = best_avg_moves_ai_0
-                            best_avg_rewards_ai_1 = best_avg_rewards_ai_0
-                            best_avg_moves_ai_0 = ami
-                            best_avg_rewards_ai_0 = rewards_ai[ami]
-                        elif rewards_ai[ami] > best_avg_rewards_ai_1:
-                            best_avg_moves_ai_1 = ami
-                            best_avg_rewards_ai_1 = rewards_ai[ami]
-                ami += 1
-
-            # figure out opponent average reward of average (safe) move
-            for ind in range(0, 7):
-                if n_opponent[ind] != 0: # relevant moves only (off-cooldown)
-                    rewards_opponent[ind] /= n_opponent[ind]
-                    if rewards_opponent[ind] > best_avg_move_opponent_reward:
-                        best_avg_move_opponent = ind
-                        best_avg_move_opponent_reward = rewards_opponent[ind]
+            if len(ai_moves) > 0:
+                for omi in opponent_moves:
+                    move_opponent_score_sum = 0
+                    ai_score_sum = 0
+                    reward = 0
+                    best_counter_score = -100000
+                    for ami in ai_moves:
+                        a = payoff_ai[ami][omi]
+                        b = payoff_opponent[omi][ami]
+                        move_opponent_score_sum += b
+                        ai_score_sum += a
+                        reward += move_opponent_score_sum - ai_score_sum
+                        if a - b > best_counter_score:
+                            best_counter_score = a - b
+                            move_opponent_best_ai_counter_move[omi] = ami
+
+                    reward /= len(ai_moves)
+                    if reward > best_avg_move_opponent_reward:
+                        best_avg_move_opponent = omi
+                        best_avg_move_opponent_reward = reward
 
             best_risky_move_opponent = move_ai_best_opponent_counter_move[best_avg_moves_ai_0]
-            print(f"best_risky_move_op {best_risky_move_opponent}")
-            print(f"best_average_move_op {best_avg_move_opponent}")
+            lg.ai.debug("best_risky_move_op %d", best_risky_move_opponent)
+            lg.ai.debug("best_average_move_op %d", best_avg_move_opponent)
 
             # risk move
-            risk_roll = random.uniform(-1, 1)
+            risk_roll = self.rng.uniform(-1, 1)
             if not opponent.isStunned and \
                     risk_roll > self.risk_aversion_factor and best_avg_move_opponent != -1:
                 # take a risk - assume enemy will make the best average move
                 # counter it with the best move in that situation
-                print(f"{self.ac.c.name} is taking risks against {best_avg_move_opponent} with "
-                      f"{move_opponent_best_ai_counter_move[best_avg_move_opponent]}")
+                lg.ai.info("%s is taking risks against %d with %d", self.ac.c.name, best_avg_move_opponent,
+                           move_opponent_best_ai_counter_move[best_avg_move_opponent])
                 move_roll = move_opponent_best_ai_counter_move[best_avg_move_opponent]
                 self.__calculateNoveltyFactors__(move_roll)
                 return move_roll, best_avg_move_opponent, "c"
 
             # counter a risk move
-            counter_roll = random.uniform(0, 2)
+            counter_roll = self.rng.uniform(0, 2)
             if not opponent.isStunned and \
                     counter_roll < self.assume_blunder_factor and best_risky_move_opponent != -1:
-                print(f"{self.ac.c.name} assumes blunder of {best_risky_move_opponent}, uses "
-                      f"{move_opponent_best_ai_counter_move[best_risky_move_opponent]}")
+                lg.ai.info("%s assumes blunder of %d, uses %d", self.ac.c.name, best_risky_move_opponent,
+                           move_opponent_best_ai_counter_move[best_risky_move_opponent])
                 move_roll = move_opponent_best_ai_counter_move[best_risky_move_opponent]
                 self.__calculateNoveltyFactors__(move_roll)
                 return move_roll, best_risky_move_opponent, "cc"
@@ -541,7 +1179,7 @@ class Player:
                 score1 += abs_score1
                 #print(f"score0, score1 {score0}, {score1}")
                 #print(f"moves {best_moves[0]} {best_moves[1]}")
-                randomized = random.choices([0, 1], weights = [score0, score1])
+                randomized = self.rng.choices([0, 1], weights = [score0, score1])
                 if randomized == [1]:
                     move_roll = best_avg_moves_ai_1
                 else:
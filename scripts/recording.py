@@ -0,0 +1,184 @@
+import mmap
+import os
+import struct
+
+import scripts.creatures as cr
+import scripts.engine as en
+import scripts.player as pl
+
+
+# replay files - battles as compact binary records, enough to play them again roll for roll:
+# the seed of the battle's rolls, both rosters, ai levels and the moves of every turn
+# (and optionally health of both active creatures after every turn, to check a replay against)
+#
+# file:  header, then match records one after another (a file can be appended to)
+# header:  magic b"PCAR", format version (uint16)
+# match record:  match_header, creature ids of player 1 and 2 (uint8 each), turns x turn_struct,
+#                turns x outcome_struct if flags has HAS_OUTCOMES
+# all numbers are little-endian, a record's length is known from it's header, so a file can be scanned
+# (i.e. memory-mapped) without reading turns of matches that are not needed
+MAGIC = b"PCAR"
+VERSION = 1
+file_header = struct.Struct("<4sH")
+# seed, p1 ai, p2 ai, p1 creatures, p2 creatures, flags, winner, turns
+match_header = struct.Struct("<QbbBBBBH")
+# p1 move, p1's guess of p2's move, p1's guess mode, p2 move, p2's guess of p1's move, p2's guess mode
+turn_struct = struct.Struct("<bbBbbB")
+# health of p1 and p2 active creatures after the moves
+outcome_struct = struct.Struct("<hh")
+
+HAS_OUTCOMES = 1
+# guess modes (see Player.__calculateMove__) by their number in a record
+modes = ("", "c", "cc")
+
+
+# one recorded battle
+# turns are (p1 move, p1's guess, p1's guess mode, p2 move, p2's guess, p2's guess mode), outcomes are
+# (p1 health, p2 health) or None if they were not recorded
+class MatchRecord:
+    def __init__(self, seed: int, creatures: list[list[int, ...], list[int, ...]], ai: list[int, int],
+                 turns: list[tuple, ...], outcomes: list[(int, int), ...] = None, winner: int = 0):
+        self.seed = seed
+        self.creatures = creatures  # creature ids of both players
+        self.ai = ai
+        self.turns = turns
+        self.outcomes = outcomes
+        self.winner = winner
+
+    def __pack__(self) -> bytes:
+        flags = HAS_OUTCOMES if self.outcomes is not None else 0
+        parts = [match_header.pack(self.seed, self.ai[0], self.ai[1], len(self.creatures[0]), len(self.creatures[1]),
+                                   flags, self.winner, len(self.turns)),
+                 bytes(self.creatures[0]), bytes(self.creatures[1])]
+        for m1, g1, mode1, m2, g2, mode2 in self.turns:
+            parts.append(turn_struct.pack(m1, g1, modes.index(mode1), m2, g2, modes.index(mode2)))
+        if self.outcomes is not None:
+            for outcome in self.outcomes:
+                parts.append(outcome_struct.pack(*outcome))
+        return b"".join(parts)
+
+    # record at offset of buffer and the offset right after it
+    @staticmethod
+    def __unpack__(buffer, offset: int) -> ("MatchRecord", int):
+        seed, ai1, ai2, n1, n2, flags, winner, turns_n = match_header.unpack_from(buffer, offset)
+        offset += match_header.size
+        creatures = [list(buffer[offset:offset + n1]), list(buffer[offset + n1:offset + n1 + n2])]
+        offset += n1 + n2
+
+        turns = []
+        for m1, g1, mode1, m2, g2, mode2 in turn_struct.iter_unpack(buffer[offset:offset + turns_n * turn_struct.size]):
+            turns.append((m1, g1, modes[mode1], m2, g2, modes[mode2]))
+        offset += turns_n * turn_struct.size
+
+        outcomes = None
+        if flags & HAS_OUTCOMES:
+            outcomes = list(outcome_struct.iter_unpack(buffer[offset:offset + turns_n * outcome_struct.size]))
+            offset += turns_n * outcome_struct.size
+
+        return MatchRecord(seed, creatures, [ai1, ai2], turns, outcomes, winner), offset
+
+
+# record of a battle played by engine (see Engine.history)
+def record_match(engine: en.Engine, outcomes: bool = True) -> MatchRecord:
+    turns = [turn[:6] for turn in engine.history]
+    return MatchRecord(engine.seed, [[co.c.id for co in engine.p1.creatures], [co.c.id for co in engine.p2.creatures]],
+                       [engine.p1.ai, engine.p2.ai], turns,
+                       [turn[6:] for turn in engine.history] if outcomes else None, engine.__winner__())
+
+
+# appends match records to a replay file, the header is written if the file is new
+class ReplayWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(file_header.pack(MAGIC, VERSION))
+        self.matches = 0
+
+    def __write__(self, record: MatchRecord):
+        self.file.write(record.__pack__())
+        self.matches += 1
+
+    # records packed elsewhere (i.e. by simulation workers)
+    def __writePacked__(self, packed: bytes, matches: int):
+        self.file.write(packed)
+        self.matches += matches
+
+    def __close__(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.__close__()
+
+
+# memory-mapped replay file - records are read only when they are needed
+class ReplayFile:
+    def __init__(self, path: str):
+        if os.path.getsize(path) < file_header.size:
+            raise ValueError(f"{path} is not a replay file")
+        self.file = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = file_header.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.__close__()
+            raise ValueError(f"{path} is not a replay file of version {VERSION}")
+        self.offsets = None  # where each record starts, found by the first scan
+
+    # (offset, seed, ai levels, winner, turns) of every match, only headers are read
+    def __scan__(self):
+        offset = file_header.size
+        while offset < len(self.buffer):
+            seed, ai1, ai2, n1, n2, flags, winner, turns_n = match_header.unpack_from(self.buffer, offset)
+            yield offset, seed, (ai1, ai2), winner, turns_n
+            offset += match_header.size + n1 + n2 + turns_n * turn_struct.size
+            if flags & HAS_OUTCOMES:
+                offset += turns_n * outcome_struct.size
+
+    def __len__(self) -> int:
+        return len(self.__offsets__())
+
+    def __offsets__(self) -> list[int, ...]:
+        if self.offsets is None:
+            self.offsets = [match[0] for match in self.__scan__()]
+        return self.offsets
+
+    def __getMatch__(self, index: int) -> MatchRecord:
+        return MatchRecord.__unpack__(self.buffer, self.__offsets__()[index])[0]
+
+    def __iter__(self):
+        offset = file_header.size
+        while offset < len(self.buffer):
+            record, offset = MatchRecord.__unpack__(self.buffer, offset)
+            yield record
+
+    def __close__(self):
+        self.buffer.close()
+        self.file.close()
+
+
+# players of a recorded match, as they were at the start of it
+def build_players(record: MatchRecord) -> (pl.Player, pl.Player):
+    return (pl.Player(1, [cr.CreatureOccurrence(cr.all_creatures[i]) for i in record.creatures[0]], record.ai[0]),
+            pl.Player(2, [cr.CreatureOccurrence(cr.all_creatures[i]) for i in record.creatures[1]], record.ai[1]))
+
+
+# play a recorded match again without gui, instantly - moves are taken from the record, rolls from it's seed
+# raises ValueError if the record has outcomes and the battle doesn't match them
+def replay_match(record: MatchRecord, listener=None) -> en.Engine:
+    p1, p2 = build_players(record)
+    engine = en.Engine(p1, p2, listener, record.seed)
+    engine.__startBattle__()
+
+    for i, (m1, g1, mode1, m2, g2, mode2) in enumerate(record.turns):
+        if engine.__isOver__():
+            break
+        engine.__startTurn__()
+        engine.__resolveTurn__(m1, m2, g1, mode1, g2, mode2)
+        if record.outcomes is not None and tuple(engine.history[-1][6:]) != tuple(record.outcomes[i]):
+            raise ValueError(f"replay of seed {record.seed} differs from the record in turn {i + 1}")
+        engine.__endTurn__()
+
+    engine.__finishBattle__()
+    return engine
@@ -0,0 +1,180 @@
+import concurrent.futures
+import os
+import random
+
+import scripts.creatures as cr
+import scripts.engine as en
+import scripts.logs as lg
+import scripts.player as pl
+import scripts.recording as rec
+
+
+# aggregated results of many ai vs ai matches
+class SimulationResult:
+    def __init__(self):
+        self.matches = 0
+        self.wins = [0, 0, 0]  # draws, player 1 wins, player 2 wins
+        self.turns = 0
+        # move usage by move index, the same as Engine.move_count
+        self.move_count = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0]]
+        # move usage by move name, more useful when rosters are mixed or random
+        self.move_usage = [{}, {}]
+        self.total_damage_healed = [0, 0]
+        # packed match records (see recording.py) of matches not written to a replay file yet, if recording
+        self.replays = b""
+
+    def __addMatch__(self, engine: en.Engine, winner: int):
+        self.matches += 1
+        self.wins[winner] += 1
+        # turn counter is already pointing at the next turn
+        self.turns += engine.turn_counter - 1
+
+        for p in (engine.p1, engine.p2):
+            i = p.id - 1
+            for move_index in range(0, 7):
+                self.move_count[i][move_index] += engine.move_count[i][move_index]
+
+            co: cr.CreatureOccurrence
+            for co in p.creatures:
+                self.total_damage_healed[i] += co.total_damage_healed
+
+            for name, count in engine.move_usage[i].items():
+                self.move_usage[i][name] = self.move_usage[i].get(name, 0) + count
+
+    def __merge__(self, other):
+        self.matches += other.matches
+        self.turns += other.turns
+        for i in range(0, 3):
+            self.wins[i] += other.wins[i]
+        for i in (0, 1):
+            for move_index in range(0, 7):
+                self.move_count[i][move_index] += other.move_count[i][move_index]
+            for name, count in other.move_usage[i].items():
+                self.move_usage[i][name] = self.move_usage[i].get(name, 0) + count
+            self.total_damage_healed[i] += other.total_damage_healed[i]
+
+    def __winRate__(self, winner: int) -> float:
+        if self.matches == 0:
+            return 0
+        return self.wins[winner] / self.matches
+
+    def __averageTurns__(self) -> float:
+        if self.matches == 0:
+            return 0
+        return self.turns / self.matches
+
+    def __report__(self) -> str:
+        lines = [f"MATCHES: {self.matches}",
+                 f"PLAYER 1 WIN RATE: {self.__winRate__(1):.3f}",
+                 f"PLAYER 2 WIN RATE: {self.__winRate__(2):.3f}",
+                 f"DRAW RATE: {self.__winRate__(0):.3f}",
+                 f"AVERAGE TURNS: {self.__averageTurns__():.2f}"]
+        for i in (0, 1):
+            lines.append(f"PLAYER {i + 1} move count & health healed: "
+                         f"{self.move_count[i]} & {self.total_damage_healed[i]}")
+            for name, count in sorted(self.move_usage[i].items(), key=lambda item: -item[1]):
+                lines.append(f"    {name}: {count}")
+        return "\n".join(lines)
+
+
+# creature indices work like in MatchSettingsScene - -1 is a random creature (picked by rng), -2 is no creature
+def build_creatures(creature_indices: list[int, ...], rng: random.Random = random) -> list[cr.CreatureOccurrence, ...]:
+    creatures = []
+    for index in creature_indices:
+        if index == -2:
+            continue
+        if index == -1:
+            index = rng.randrange(0, len(cr.all_creatures))
+        creatures.append(cr.CreatureOccurrence(cr.all_creatures[index]))
+    return creatures
+
+
+# monte carlo search from (playouts, milliseconds) budgets, None for the usual ai of the level
+def build_search(mcts: (int, int), rng: random.Random) -> pl.MonteCarloSearch:
+    if mcts is None:
+        return None
+    return pl.MonteCarloSearch(mcts[0], mcts[1], seed=rng.getrandbits(64))
+
+
+# play a single match with every random roll from one stream seeded with seed, so the same seed always gives
+# the same match, no matter what else runs in the process
+# (except for searches bounded by time - ai levels 11-15 and monte carlo search with a millisecond budget
+# search as far as they get before their clock runs out, which depends on the load)
+def play_match(seed: int, p1_creatures: list[int, ...], p2_creatures: list[int, ...],
+               p1_ai: int, p2_ai: int, p1_mcts: (int, int) = None, p2_mcts: (int, int) = None) -> (en.Engine, int):
+    rng = random.Random(seed)
+    player1 = pl.Player(1, build_creatures(p1_creatures, rng), p1_ai, build_search(p1_mcts, rng), rng)
+    player2 = pl.Player(2, build_creatures(p2_creatures, rng), p2_ai, build_search(p2_mcts, rng), rng)
+    engine = en.Engine(player1, player2, seed=rng.getrandbits(64))
+    winner = engine.__playAIBattle__()
+    return engine, winner
+
+
+# worker job - a chunk of matches with consecutive seeds, played with the catalog at catalog_path (the default one if None)
+def simulate_chunk(first_seed: int, matches: int, p1_creatures: list[int, ...], p2_creatures: list[int, ...],
+                   p1_ai: int, p2_ai: int, p1_mcts: (int, int) = None, p2_mcts: (int, int) = None,
+                   record: bool = False, catalog_path: str = None) -> SimulationResult:
+    # a worker loads the catalog once, from it's cache (see catalog.py)
+    pl.use_catalog(catalog_path)
+    result = SimulationResult()
+    replays = []
+    for seed in range(first_seed, first_seed + matches):
+        engine, winner = play_match(seed, p1_creatures, p2_creatures, p1_ai, p2_ai, p1_mcts, p2_mcts)
+        result.__addMatch__(engine, winner)
+        if record:
+            replays.append(rec.record_match(engine).__pack__())
+    result.replays = b"".join(replays)
+    # worker processes end without writing out what's left in log buffers
+    lg.flush()
+    return result
+
+
+# run many matches on all cpu cores (or the given number of workers)
+# match i is always seeded with seed + i, so results don't depend on the number of workers
+# (as long as no search is bounded by time, see play_match)
+# p1_mcts and p2_mcts are (playouts, milliseconds) budgets of monte carlo search used instead of the usual ai
+# with record_path, every match is appended to that replay file (in order of seeds)
+# catalog_path is a catalog of creatures, moves and ai multipliers to play with instead of the default one
+def simulate(matches: int, p1_creatures: list[int, ...], p2_creatures: list[int, ...],
+             p1_ai: int = 5, p2_ai: int = 5, seed: int = 0, workers: int = None,
+             chunk_size: int = 50, p1_mcts: (int, int) = None, p2_mcts: (int, int) = None,
+             record_path: str = None, catalog_path: str = None) -> SimulationResult:
+    if p1_ai < 0 or p2_ai < 0:
+        raise ValueError("both players have to be controlled by ai (ai level 0-15)")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    result = SimulationResult()
+    chunks = []
+    for first in range(0, matches, chunk_size):
+        chunks.append((seed + first, min(chunk_size, matches - first)))
+
+    writer = rec.ReplayWriter(record_path) if record_path is not None else None
+    record = writer is not None
+
+    # chunk's matches are written down as soon as it's done, they are not kept in memory
+    def collect(chunk_result: SimulationResult):
+        if writer is not None:
+            writer.__writePacked__(chunk_result.replays, chunk_result.matches)
+            chunk_result.replays = b""
+        result.__merge__(chunk_result)
+
+    try:
+        if workers <= 1:
+            for first_seed, n in chunks:
+                collect(simulate_chunk(first_seed, n, p1_creatures, p2_creatures, p1_ai, p2_ai,
+                                       p1_mcts, p2_mcts, record, catalog_path))
+            return result
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(simulate_chunk, first_seed, n, p1_creatures, p2_creatures, p1_ai, p2_ai,
+                                       p1_mcts, p2_mcts, record, catalog_path)
+                       for first_seed, n in chunks]
+            for future in futures:
+                collect(future.result())
+    finally:
+        if writer is not None:
+            writer.__close__()
+
+    return result
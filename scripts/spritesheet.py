@@ -3,24 +3,89 @@ import os
 import json
 
 # for parsing images from sprite sheets
+# frames are subsurfaces of the sheet, parsing one doesn't copy any pixels
+# image and data can be given already decoded and parsed (see assets.AssetLoader), only converting is left then
 class SpriteSheet:
-    def __init__(self, filepath):
+    def __init__(self, filepath, image=None, data=None):
         dirname = os.path.dirname(__file__)
         sprite_path = os.path.join(dirname, filepath)
-        self.sprite_sheet = pygame.image.load(sprite_path).convert()
-        meta_data_path = sprite_path.replace('png', 'json')
-        with open(meta_data_path) as f:
-            self.data = json.load(f)
-        f.close()
+        if image is None:
+            image = pygame.image.load(sprite_path)
+        self.sprite_sheet = image.convert()
+        # black is see-through, subsurfaces share the colorkey of the sheet
+        self.sprite_sheet.set_colorkey((0,0,0))
+        if data is None:
+            data = load_data(sprite_path)
+        self.data = data
+
+        self.frames = {}
+        for name in self.data['frames']:
+            s = self.data['frames'][name]
+            self.frames[name] = self.get_image_from_sprite(s["x"], s["y"], s["w"], s["h"])
 
     def get_image_from_sprite(self, x, y, w, h):
-        image = pygame.Surface((w, h))
-        image.set_colorkey((0,0,0))
-        image.blit(self.sprite_sheet,(0, 0),(x, y, w, h))
-        return image
+        return self.sprite_sheet.subsurface((x, y, w, h))
 
     def parse_sprite(self, name):
-        s = self.data['frames'][name]
-        x, y, w, h = s["x"], s["y"], s["w"], s["h"]
-        image = self.get_image_from_sprite(x, y, w, h)
-        return image
\ No newline at end of file
+        return self.frames[name]
+
+
+# frame positions of a sprite sheet, from the json file next to it
+def load_data(sprite_path):
+    meta_data_path = sprite_path.replace('png', 'json')
+    with open(meta_data_path) as f:
+        data = json.load(f)
+    f.close()
+    return data
+
+
+# paths of the same file are the same key, letter case doesn't matter where file names don't
+def path_key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def surface_bytes(image: pygame.Surface) -> int:
+    return image.get_width() * image.get_height() * image.get_bytesize()
+
+
+# sprite sheets loaded once (ahead of time by assets.AssetLoader, if it got to them) and their frames in banks -
+# all frames of a sheet scaled to one size (and flipped or not), made the first time they're needed at that size
+# and kept, so creatures joining a battle or a window resized back cost a lookup
+class SpriteAtlas:
+    def __init__(self):
+        self.sheets = {}  # by path
+        self.banks = {}  # {frame name: image} by (path, size, flip)
+        self.bytes = 0  # memory of all sheets and banks, counted as they're added
+
+    # image and data are the decoded sheet and it's parsed json, if they're at hand already
+    def __loadSheet__(self, path: str, image: pygame.Surface = None, data: dict = None) -> SpriteSheet:
+        key = path_key(path)
+        sheet = self.sheets.get(key)
+        if sheet is None:
+            sheet = SpriteSheet(path, image, data)
+            self.sheets[key] = sheet
+            self.bytes += surface_bytes(sheet.sprite_sheet)
+        return sheet
+
+    # frames of a sheet scaled to size (original size if None, whole pixels) and flipped horizontally if needed
+    def __getBank__(self, path: str, size: (int, int) = None, flip: bool = False) -> dict:
+        key = (path_key(path), size, flip)
+        bank = self.banks.get(key)
+        if bank is not None:
+            return bank
+
+        bank = {}
+        for name, frame in self.__loadSheet__(path).frames.items():
+            if size is not None and size != frame.get_size():
+                image = pygame.transform.scale(frame, size)
+            else:
+                # subsurfaces blit a lot slower than surfaces of their own
+                image = frame.copy()
+            if flip:
+                image = pygame.transform.flip(image, True, False)
+            # frames are only blitted, run-length encoding makes it faster
+            image.set_colorkey((0,0,0), pygame.RLEACCEL)
+            bank[name] = image
+            self.bytes += surface_bytes(image)
+        self.banks[key] = bank
+        return bank
\ No newline at end of file
@@ -0,0 +1,126 @@
+import sys
+from time import perf_counter
+
+import scripts.logs as lg
+
+# when the game started, the interpreter's own startup isn't counted
+started = perf_counter()
+
+# seconds from starting the game to the main menu being on screen and taking keys,
+# anything slower is logged as a warning (gui channel is always on for warnings)
+budget = 1.0
+
+
+# times every module imported while it's installed at the front of sys.meta_path
+# self time leaves out the modules it imports, total time counts them in (like python -X importtime)
+class ImportTimer:
+    def __init__(self):
+        # module name: (self seconds, total seconds)
+        self.times = {}
+        # seconds spent importing nested modules, for every module being imported
+        self.nested = []
+
+    def __install__(self):
+        sys.meta_path.insert(0, self)
+
+    def __uninstall__(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    # the other finders find the module, it's loader is wrapped to be timed
+    # (looking for the module in all of sys.path takes a while too, so it's counted to the module)
+    def find_spec(self, name, path=None, target=None):
+        return self.__time__(name, self.__findSpec__, name, path, target)
+
+    def __findSpec__(self, name, path, target):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    # call f and count the time it took to it's module
+    def __time__(self, name: str, f, *args):
+        start = perf_counter()
+        self.nested.append(0.0)
+        try:
+            return f(*args)
+        finally:
+            total = perf_counter() - start
+            nested = self.nested.pop()
+            if self.nested:
+                self.nested[-1] += total
+            self_time, total_time = self.times.get(name, (0.0, 0.0))
+            self.times[name] = (self_time + total - nested, total_time + total)
+
+    # the slowest imports by self time, as (name, self seconds, total seconds)
+    def __slowest__(self, count: int) -> list[(str, float, float), ...]:
+        slowest = sorted(self.times.items(), key=lambda item: -item[1][0])[:count]
+        return [(name, self_time, total_time) for name, (self_time, total_time) in slowest]
+
+
+class TimedLoader:
+    def __init__(self, loader, timer: ImportTimer):
+        self.loader = loader
+        self.timer = timer
+
+    # extension modules (i.e. pygame's) do most of their work here
+    def create_module(self, spec):
+        if not hasattr(self.loader, "create_module"):
+            return None
+        return self.timer.__time__(spec.name, self.loader.create_module, spec)
+
+    def exec_module(self, module):
+        # the module only ever sees it's own loader
+        module.__spec__.loader = module.__loader__ = self.loader
+        self.timer.__time__(module.__name__, self.loader.exec_module, module)
+
+
+# phases of starting the game up to the first frame of the main menu, checked against the budget
+# with profile_imports, every import is timed and a report is printed once the menu is up
+class StartupProfile:
+    def __init__(self, profile_imports: bool = False, budget_seconds: float = budget):
+        self.budget = budget_seconds
+        # (phase, perf_counter at it's end)
+        self.phases = []
+        self.timer = None
+        if profile_imports:
+            self.timer = ImportTimer()
+            self.timer.__install__()
+
+    # the phase that started with the previous one's end has ended
+    def __mark__(self, phase: str):
+        self.phases.append((phase, perf_counter()))
+
+    def __elapsed__(self) -> float:
+        if not self.phases:
+            return 0
+        return self.phases[-1][1] - started
+
+    # the first frame is on screen
+    def __finish__(self):
+        self.__mark__("first frame")
+        if self.timer is not None:
+            self.timer.__uninstall__()
+            print(self.__report__())
+
+        if self.__elapsed__() > self.budget:
+            lg.gui.warning("startup took %.3f s, over the budget of %.3f s", self.__elapsed__(), self.budget)
+
+    def __report__(self, imports: int = 25) -> str:
+        over = " - OVER BUDGET" if self.__elapsed__() > self.budget else ""
+        lines = [f"STARTUP: {self.__elapsed__() * 1000:.1f} ms (BUDGET {self.budget * 1000:.0f} ms){over}"]
+        before = started
+        for phase, end in self.phases:
+            lines.append(f"    {phase}: {(end - before) * 1000:.1f} ms")
+            before = end
+
+        if self.timer is not None:
+            lines.append(f"SLOWEST IMPORTS (self & total ms) OF {len(self.timer.times)}:")
+            for name, self_time, total_time in self.timer.__slowest__(imports):
+                lines.append(f"    {name}: {self_time * 1000:.1f} & {total_time * 1000:.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,42 @@
+import argparse
+
+import scripts.logs as lg
+import scripts.simulation as sim
+
+
+# run many ai vs ai matches without gui on all cpu cores, i.e. for balancing
+# creatures are indices into creatures.all_creatures (-1 for random, -2 for none) like in match settings
+def main():
+    parser = argparse.ArgumentParser(description="Simulate AI vs AI matches without GUI.")
+    parser.add_argument("-n", "--matches", type=int, default=1000, help="number of matches")
+    parser.add_argument("--p1", type=int, nargs="+", default=[-1], help="player 1 creature indices")
+    parser.add_argument("--p2", type=int, nargs="+", default=[-1], help="player 2 creature indices")
+    parser.add_argument("--ai1", type=int, default=5, help="player 1 ai level (0-15)")
+    parser.add_argument("--ai2", type=int, default=5, help="player 2 ai level (0-15)")
+    parser.add_argument("--mcts1", type=int, nargs=2, metavar=("PLAYOUTS", "MS"), default=None,
+                        help="player 1 uses monte carlo search with these budgets (0 for no limit on one of them)")
+    parser.add_argument("--mcts2", type=int, nargs=2, metavar=("PLAYOUTS", "MS"), default=None,
+                        help="player 2 uses monte carlo search with these budgets (0 for no limit on one of them)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match")
+    parser.add_argument("--record", type=str, default=None, help="append every match to this replay file")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (all cores by default)")
+    parser.add_argument("--catalog", type=str, default=None,
+                        help="play with this catalog of creatures and moves (assets/data/catalog.json by default)")
+    lg.add_arguments(parser)
+    args = parser.parse_args()
+    lg.configure(args)
+
+    mcts = [None, None]
+    for i, budgets in enumerate((args.mcts1, args.mcts2)):
+        if budgets is not None:
+            # a search without any budget would never stop
+            if all(budget <= 0 for budget in budgets):
+                parser.error(f"--mcts{i + 1} needs a limit of playouts or milliseconds, not both 0")
+            mcts[i] = tuple(budget if budget > 0 else None for budget in budgets)
+
+    result = sim.simulate(args.matches, args.p1, args.p2, args.ai1, args.ai2, args.seed, args.workers,
+                          p1_mcts=mcts[0], p2_mcts=mcts[1], record_path=args.record, catalog_path=args.catalog)
+    print(result.__report__())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import threading
+
+import pygame
+
+import scripts.assets as assets
+
+
+def make_images(tmp_path, count: int) -> list[str, ...]:
+    paths = []
+    for i in range(count):
+        path = str(tmp_path / f"{i}.png")
+        pygame.image.save(pygame.Surface((4 + i, 4)), path)
+        paths.append(path)
+    return paths
+
+
+def test_image_taken_before_decoding_is_decoded_once(tmp_path, monkeypatch):
+    paths = make_images(tmp_path, 2)
+    loads = []
+    release = threading.Event()
+    load = pygame.image.load
+
+    # the loader thread waits on the first file until the second one was taken by the main thread
+    def counted_load(path):
+        loads.append(path)
+        if path == paths[0] and threading.current_thread() is not threading.main_thread():
+            release.wait(5)
+        return load(path)
+
+    monkeypatch.setattr(pygame.image, "load", counted_load)
+    store = assets.AssetStore()
+    store.__preload__(paths)
+    image = store.__loadImage__(paths[1])
+    release.set()
+    store.loader.queue.join()
+
+    assert loads.count(paths[1]) == 1
+    assert list(store.loader.decoded) == [paths[0]]
+    assert store.loader.__progress__() == (1, 2)
+    store.__convertLoaded__(1)
+    assert store.__loadImage__(paths[1]) is image
+    assert store.images[paths[0]].get_size() == (4, 4)
+    assert loads.count(paths[0]) == 1
+    assert store.loader.__progress__() == (2, 2)
+
+
+def test_decoded_image_is_taken_not_loaded_again(tmp_path, monkeypatch):
+    paths = make_images(tmp_path, 3)
+    loads = []
+    load = pygame.image.load
+
+    def counted_load(path):
+        loads.append(path)
+        return load(path)
+
+    monkeypatch.setattr(pygame.image, "load", counted_load)
+    store = assets.AssetStore()
+    store.__preload__(paths)
+    store.loader.queue.join()
+    for path in paths:
+        store.__getImage__(path, (8, 8), True)
+
+    assert sorted(loads) == sorted(paths)
+    assert store.loader.decoded == {}
+    assert store.loader.__progress__() == (3, 3)
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+import scripts.balance as bl
+import scripts.player as pl
+
+
+@pytest.fixture(autouse=True)
+def default_catalog():
+    # a sweep without workers plays it's candidates in this process, switching catalogs
+    yield
+    pl.use_catalog()
+
+
+def sweep_settings() -> bl.SweepSettings:
+    return bl.SweepSettings(None, ["multiplier:FRAGONIRE:WARMTH", "creature:BAMAT:health"], [0, 1, 4],
+                            matches=20, ai=3, seed=0, chunk_size=10)
+
+
+def state(sweep: bl.BalanceSweep) -> tuple:
+    return sweep.values, sweep.steps, sweep.index, sweep.best.key, sweep.best.loss, sorted(sweep.known)
+
+
+def result_keys(run_dir: str) -> list[str, ...]:
+    with open(os.path.join(run_dir, "results.jsonl")) as f:
+        return [json.loads(line)["key"] for line in f]
+
+
+def test_resumed_sweep_ends_like_uninterrupted_one(tmp_path):
+    whole_dir = str(tmp_path / "whole")
+    whole = bl.BalanceSweep(whole_dir, sweep_settings(), workers=1)
+    whole.__run__()
+    assert whole.__isDone__()
+
+    resumed_dir = str(tmp_path / "resumed")
+    first = bl.BalanceSweep(resumed_dir, sweep_settings(), workers=1)
+    first.__run__(max_evaluations=3)
+    assert not first.__isDone__()
+    played = len(first.known)
+    # a crash while a result was written leaves half a line
+    with open(os.path.join(resumed_dir, "results.jsonl"), "a") as f:
+        f.write('{"key": "0123')
+
+    # the run directory's settings are used, not the ones given
+    other = bl.SweepSettings(None, ["creature:SCHONIPS:health"], [2, 3], matches=5)
+    resumed = bl.BalanceSweep(resumed_dir, other, workers=1)
+    assert resumed.settings.__toJson__() == first.settings.__toJson__()
+    assert len(resumed.known) == played
+    resumed.__run__()
+
+    assert state(resumed) == state(whole)
+    # candidates played before resuming are not played again
+    assert sorted(result_keys(resumed_dir)) == sorted(result_keys(whole_dir))
+    with open(os.path.join(resumed_dir, "best.json")) as f, open(os.path.join(whole_dir, "best.json")) as g:
+        assert json.load(f) == json.load(g)
+
+
+def test_nothing_to_resume(tmp_path):
+    with pytest.raises(ValueError, match="no sweep to resume"):
+        bl.BalanceSweep(str(tmp_path), workers=1)
+
+
+def test_searching_ai_levels_are_rejected():
+    # they think until a clock runs out, so candidates would differ by how busy the machine was
+    for ai in (-1, 11, 15):
+        with pytest.raises(ValueError, match="ai level of 0-10"):
+            bl.SweepSettings(None, ["creature:BAMAT:health"], [0, 1], ai=ai)
+    assert bl.SweepSettings(None, ["creature:BAMAT:health"], [0, 1], ai=10).ai == 10
+
+
+def test_parameter_specs():
+    with open(bl.ca.default_path) as f:
+        data = json.load(f)
+    multiplier = bl.Parameter("multiplier:FRAGONIRE:WARMTH", data)
+    assert not multiplier.is_int and multiplier.value == 0.9
+    health = bl.Parameter("creature:BAMAT:health", data)
+    assert health.is_int and health.__moved__(1, -1) is None
+    for spec in ("multiplier:FRAGONIRE", "multiplier:NOBODY:WARMTH", "multiplier:FRAGONIRE:SPLASH",
+                 "creature:BAMAT:name", "move:SPLASH:speed"):
+        with pytest.raises(ValueError):
+            bl.Parameter(spec, data)
@@ -0,0 +1,191 @@
+import json
+import os
+
+import pytest
+
+import scripts.catalog as ca
+import scripts.creatures as cr
+
+
+def default_catalog() -> dict:
+    with open(ca.default_path) as f:
+        return json.load(f)
+
+
+def test_default_catalog_is_valid():
+    checked = ca.validate(default_catalog(), ca.default_path)
+    assert [c["name"] for c in checked["creatures"]] == [c.name for c in cr.all_creatures]
+    # defaults are filled in
+    assert all("cooldown" in move for move in checked["moves"].values())
+
+
+def set_field(section: str, name, field: str, value):
+    def change(data: dict):
+        data[section][name][field] = value
+    return change
+
+
+def delete_field(section: str, name, field: str):
+    def change(data: dict):
+        del data[section][name][field]
+    return change
+
+
+def set_section(section: str, value):
+    def change(data: dict):
+        data[section] = value
+    return change
+
+
+def delete_section(section: str):
+    def change(data: dict):
+        del data[section]
+    return change
+
+
+# a change of the default catalog and a part of the error it causes
+invalid_changes = [
+    (set_section("sounds", {}), "unknown section 'sounds'"),
+    (delete_section("moves"), "is missing 'moves'"),
+    (set_section("moves", []), "'moves' is not an object"),
+    (set_field("types", "FIRE", "shade", 1), "type 'FIRE' has an unknown field 'shade'"),
+    (delete_field("types", "FIRE", "color"), "type 'FIRE' is missing 'color'"),
+    (set_field("types", "FIRE", "color", [255, 0]), "color is not [r, g, b]"),
+    (set_field("types", "FIRE", "weaknesses", ["STEAM"]), "unknown type 'STEAM'"),
+    (set_field("types", "FIRE", "immunities", ["WATER"]), "more than one relationship"),
+    (set_field("status_effects", "BURNING", "damage_low", True), "'damage_low' has a wrong type (bool)"),
+    (set_field("status_effects", "BURNING", "damage_low", 99), "'damage_low' is higher than 'damage_high'"),
+    (set_field("moves", "HEALTH KIT", "status_effect", "SOAKED"), "unknown status effect 'SOAKED'"),
+    (set_field("moves", "HEALTH KIT", "hit_attempts", 0), "hit attempts have to be at least 1"),
+    (set_field("moves", "HEALTH KIT", "speed", 2.5), "'speed' has a wrong type (float)"),
+    (delete_section("creatures"), "is missing 'creatures'"),
+    (set_section("creatures", []), "not a list of at least one creature"),
+    (set_field("creatures", 1, "name", "FRAGONIRE"), "another creature named 'FRAGONIRE'"),
+    (set_field("creatures", 0, "types", []), "creature 0 has no types"),
+    (set_field("creatures", 0, "rage_move", "SPLASH"), "unknown move 'SPLASH'"),
+    (set_section("ai_multipliers", {}), "'ai_multipliers' is not a list"),
+    (set_field("ai_multipliers", 0, "opponent", "NOBODY"), "unknown creature 'NOBODY'"),
+    (set_field("ai_multipliers", 0, "multiplier", "2"), "'multiplier' has a wrong type (str)"),
+]
+
+
+@pytest.mark.parametrize("change, error", invalid_changes)
+def test_invalid_catalog(change, error):
+    data = default_catalog()
+    change(data)
+    with pytest.raises(ValueError) as raised:
+        ca.validate(data, "catalog.json")
+    assert error in str(raised.value)
+    assert str(raised.value).startswith("catalog.json")
+
+
+def test_required_entries():
+    data = default_catalog()
+    del data["status_effects"]["AI MODIFIER 1"]
+    with pytest.raises(ValueError, match="missing a required status effect"):
+        ca.validate(data, "catalog.json")
+
+    data = default_catalog()
+    del data["moves"]["HEALTH KIT"]
+    with pytest.raises(ValueError, match="missing a required move"):
+        ca.validate(data, "catalog.json")
+
+    data = default_catalog()
+    data["creatures"][0]["moves"].pop()
+    with pytest.raises(ValueError, match="doesn't have 5 moves"):
+        ca.validate(data, "catalog.json")
+
+
+def test_catalog_without_multipliers():
+    data = default_catalog()
+    del data["ai_multipliers"]
+    assert ca.validate(data, "catalog.json")["ai_multipliers"] == []
+
+
+def test_building_a_catalog_leaves_the_one_in_use_alone():
+    matrix = cr.get_type_matrix()
+    modified = cr.all_status_effects["AI MODIFIER 1"].__modified__(damage_mod=1)
+    catalog = cr.build_catalog(ca.validate(default_catalog(), ca.default_path))
+    assert cr.get_type_matrix() is matrix
+    # status effects made later don't get ids of the catalog's
+    assert cr.all_status_effects["AI MODIFIER 1"].__modified__(damage_mod=2).id > modified.id
+    assert [se.id for se in catalog["status_effects"].values()] == [se.id for se in cr.all_status_effects.values()]
+
+
+# builds the names of the creatures and counts how many times it's called
+class CountingBuild:
+    def __init__(self):
+        self.builds = 0
+
+    def __call__(self, data: dict) -> list[str, ...]:
+        self.builds += 1
+        return [c["name"] for c in data["creatures"]]
+
+
+def write_catalog(path: str, data: dict):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_cache_is_rebuilt_when_catalog_changes(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    data = default_catalog()
+    write_catalog(path, data)
+    build = CountingBuild()
+
+    names = ca.load(path, build.__call__)
+    assert build.builds == 1
+    assert os.path.exists(ca.cache_path(path))
+    assert ca.load(path, build.__call__) == names
+    assert build.builds == 1
+
+    data["creatures"][0]["name"] = "FRAGONIRE II"
+    for rule in data["ai_multipliers"]:
+        for field in ("creature", "opponent"):
+            if rule.get(field) == "FRAGONIRE":
+                rule[field] = "FRAGONIRE II"
+    write_catalog(path, data)
+    assert ca.load(path, build.__call__)[0] == "FRAGONIRE II"
+    assert build.builds == 2
+    assert ca.load(path, build.__call__)[0] == "FRAGONIRE II"
+    assert build.builds == 2
+
+
+def test_broken_cache_is_rebuilt(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    write_catalog(path, default_catalog())
+    build = CountingBuild()
+    names = ca.load(path, build.__call__)
+
+    with open(ca.cache_path(path), "r+b") as f:
+        f.seek(len(ca.MAGIC) + 32)
+        f.write(b"not a pickle")
+    assert ca.load(path, build.__call__) == names
+    assert build.builds == 2
+
+    with open(ca.cache_path(path), "r+b") as f:
+        f.write(b"XXXX")
+    assert ca.load(path, build.__call__) == names
+    assert build.builds == 3
+
+
+def test_cache_is_rebuilt_when_building_code_changes(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    write_catalog(path, default_catalog())
+    with open(path, "rb") as f:
+        content = f.read()
+    # a build function of another file has another digest, as if the code building the catalog was edited
+    assert ca.digest(content, cr.build_catalog) != ca.digest(content, CountingBuild().__call__)
+
+    catalog = ca.load(path, cr.build_catalog)
+    assert [c.name for c in catalog["creatures"]] == [c.name for c in cr.all_creatures]
+    build = CountingBuild()
+    assert ca.load(path, build.__call__) == [c.name for c in cr.all_creatures]
+    assert build.builds == 1
+
+
+def test_invalid_json(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text("{\"types\": ")
+    with pytest.raises(ValueError, match="is not valid json"):
+        ca.load(str(path), CountingBuild().__call__)
@@ -0,0 +1,115 @@
+import concurrent.futures
+import pickle
+import random
+import threading
+
+import scripts.creatures as cr
+import scripts.engine as en
+import scripts.player as pl
+import scripts.simulation as sim
+
+
+# the catalog's entries as bytes, changing any stat of any entry changes them
+def catalog_state() -> bytes:
+    return pickle.dumps((cr.all_types, cr.all_status_effects, cr.all_moves, cr.all_creatures, cr.ai_multipliers))
+
+
+def test_battles_leave_catalog_as_it_is():
+    before = catalog_state()
+    for seed, p1_ai, p2_ai in ((1, 0, 10), (2, 5, 5), (3, 10, 1), (4, 11, 4)):
+        sim.play_match(seed, [0, 1], [2, 3], p1_ai, p2_ai)
+    assert catalog_state() == before
+
+
+def test_clone_is_independent():
+    engine, winner = sim.play_match(5, [0], [1], 5, 5)
+    co = engine.p1.ac
+    co.active_statuses.append(cr.StatusOccurrence(cr.all_status_effects["BURNING"]))
+    clone = co.__clone__()
+    assert clone.__fingerprint__() == co.__fingerprint__()
+    assert clone.engine is None
+
+    clone.health -= 1
+    clone.cooldowns[0] += 1
+    clone.active_statuses[0].status_d += 1
+    assert clone.__fingerprint__() != co.__fingerprint__()
+    assert clone.cooldowns != co.cooldowns
+    assert co.active_statuses[0].status_d != clone.active_statuses[0].status_d
+
+
+# searching ai levels (11-15) think until a time budget runs out, so how far they get depends on the load
+# this clock moves on by a fixed step every time it's read, and every match starts it from 0,
+# so they search the same states in every run
+class StepClock:
+    def __init__(self, step: float):
+        self.step = step
+        self.local = threading.local()
+
+    def __reset__(self):
+        self.local.now = 0.0
+
+    def __call__(self) -> float:
+        self.local.now += self.step
+        return self.local.now
+
+
+def test_parallel_battles_match_serial_ones(monkeypatch):
+    clock = StepClock(2 ** -10)
+    monkeypatch.setattr(pl, "perf_counter", clock)
+    # every ai level 0-15, each battle with a different pair
+    levels = [(ai, 15 - ai) for ai in range(0, 16)]
+    modifiers = pickle.dumps((cr.all_status_effects["AI MODIFIER 1"], cr.all_status_effects["AI MODIFIER 2"]))
+
+    def play(seed: int, p1_ai: int, p2_ai: int) -> (list, int):
+        clock.__reset__()
+        engine, winner = sim.play_match(seed, [0, 1], [2, 3], p1_ai, p2_ai)
+        return engine.history, winner
+
+    serial = [play(seed, p1_ai, p2_ai) for seed, (p1_ai, p2_ai) in enumerate(levels)]
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(play, seed, p1_ai, p2_ai) for seed, (p1_ai, p2_ai) in enumerate(levels)]
+        parallel = [future.result() for future in futures]
+
+    assert parallel == serial
+    assert pickle.dumps((cr.all_status_effects["AI MODIFIER 1"], cr.all_status_effects["AI MODIFIER 2"])) == modifiers
+
+
+# players made like in match settings, without random numbers of their own
+def ai_battle(seed: int, p1_ai: int, p2_ai: int) -> en.Engine:
+    p1 = pl.Player(1, [cr.CreatureOccurrence(cr.all_creatures[i]) for i in (0, 1)], p1_ai)
+    p2 = pl.Player(2, [cr.CreatureOccurrence(cr.all_creatures[i]) for i in (2, 3)], p2_ai)
+    engine = en.Engine(p1, p2, seed=seed)
+    engine.__playAIBattle__()
+    return engine
+
+
+def test_same_seed_same_battle():
+    for seed, p1_ai, p2_ai in ((1, 5, 5), (2, 3, 8), (3, 10, 10)):
+        random.seed(1)
+        first = ai_battle(seed, p1_ai, p2_ai)
+        random.seed(2)
+        second = ai_battle(seed, p1_ai, p2_ai)
+        assert first.history == second.history
+        assert first.__winner__() == second.__winner__()
+
+
+# ai modifier the player's first creature was given
+def modifier(p: pl.Player) -> cr.StatusEffect:
+    return next(so.se for so in p.creatures[0].active_statuses if so.se.name == f"AI MODIFIER {p.id}")
+
+
+def test_same_ai_levels_share_modifiers():
+    first, winner = sim.play_match(7, [0, 1], [2, 3], 5, 5)
+    second, winner = sim.play_match(8, [1], [4], 5, 2)
+    # players of level 5 get the same copy of their catalog entry, level 2 gets another one
+    assert modifier(first.p1) is modifier(second.p1)
+    assert modifier(first.p2) is not modifier(second.p2)
+    assert modifier(first.p1) is not cr.all_status_effects["AI MODIFIER 1"]
+
+
+def test_identical_battle_reuses_memoized_scores():
+    sim.play_match(7, [0, 1], [2, 3], 5, 5)
+    hits, misses = pl.move_scores_cache.hits, pl.move_scores_cache.misses
+    sim.play_match(7, [0, 1], [2, 3], 5, 5)
+    assert pl.move_scores_cache.misses == misses
+    assert pl.move_scores_cache.hits > hits
@@ -0,0 +1,111 @@
+import pytest
+
+import scripts.creatures as cr
+import scripts.player as pl
+
+
+# active creatures of both players, a few turns into a battle
+def battle_state(ai_index: int, opponent_index: int) -> (cr.CreatureOccurrence, cr.CreatureOccurrence):
+    ai = cr.CreatureOccurrence(cr.all_creatures[ai_index])
+    opponent = cr.CreatureOccurrence(cr.all_creatures[opponent_index])
+    ai.health -= 15
+    ai.rage = ai.c.rage
+    opponent.health -= 5
+    opponent.active_statuses.append(cr.StatusOccurrence(cr.all_status_effects["BURNING"]))
+    return ai, opponent
+
+
+pairs = [(ai, opponent) for ai in range(len(cr.all_creatures)) for opponent in range(len(cr.all_creatures))]
+
+
+@pytest.mark.parametrize("ai_index, opponent_index", pairs)
+def test_outcome_chances_add_up(ai_index, opponent_index):
+    ai, opponent = battle_state(ai_index, opponent_index)
+    for move in ai.c.moves:
+        for max_outcomes in (1, 4, 100):
+            outcomes = pl.move_outcomes(ai, opponent, move, max_outcomes)
+            assert len(outcomes) <= max(max_outcomes, 2)
+            assert sum(outcome[0] for outcome in outcomes) == pytest.approx(1)
+            assert all(outcome[0] > 0 for outcome in outcomes)
+
+    for ai_move in pl.move_options(ai) + [-2]:
+        for opponent_move in pl.move_options(opponent) + [-2]:
+            outcomes = pl.turn_outcomes(ai, opponent, ai_move, opponent_move)
+            assert sum(chance for chance, next_ai, next_opponent in outcomes) == pytest.approx(1)
+            # the creatures searched from are left as they are
+            assert pl.state_key(ai, opponent) == pl.state_key(*battle_state(ai_index, opponent_index))
+
+
+def test_search_returns_legal_move(monkeypatch):
+    # the clock stands still, so every depth is searched to the end however long it takes
+    monkeypatch.setattr(pl, "perf_counter", lambda: 0.0)
+    for ai_index, opponent_index in ((0, 1), (2, 3), (4, 0)):
+        ai, opponent = battle_state(ai_index, opponent_index)
+        search = pl.ExpectimaxSearch(2, 1.0)
+        assert search.__think__(ai, opponent)
+        assert search.depth == 2
+        assert search.best_move in pl.move_options(ai)
+        assert not search.thinking
+
+
+def test_search_out_of_time_has_no_move(monkeypatch):
+    # every reading of the clock is a second later, the budget runs out before the first state
+    clock = iter(range(0, 1000))
+    monkeypatch.setattr(pl, "perf_counter", lambda: float(next(clock)))
+    ai, opponent = battle_state(0, 1)
+    search = pl.ExpectimaxSearch(2, 0.5)
+    assert search.__think__(ai, opponent)
+    assert search.depth == 0
+    assert search.best_move == -1
+
+
+def test_table_hit_has_value_of_fresh_search():
+    ai, opponent = battle_state(1, 3)
+    fresh = pl.ExpectimaxSearch(2, 1.0)
+    fresh.deadline = float("inf")
+    value = fresh.__value__(ai, opponent, 2)
+    misses = fresh.table.misses
+
+    # the same state again is taken from the table
+    hits = fresh.table.hits
+    assert fresh.__value__(ai, opponent, 2) == value
+    assert fresh.table.hits == hits + 1
+    assert fresh.table.misses == misses
+
+    # a search that filled it's table while thinking about the same state gets the same value
+    thought = pl.ExpectimaxSearch(2, float("inf"))
+    assert thought.__think__(ai, opponent)
+    hits = thought.table.hits
+    thought.deadline = float("inf")
+    assert thought.__value__(ai, opponent, 2) == value
+    assert thought.table.hits > hits
+
+
+def test_forced_move_when_every_move_is_on_cooldown():
+    ai, opponent = battle_state(0, 1)
+    ai.rage = 0
+    ai.cooldowns = [3, 2, 4, 1, 5, 2, 9]
+    assert pl.legal_moves(ai) == []
+    assert pl.move_options(ai) == [-2]
+    assert pl.forced_move(ai) == 3
+
+    # the search has no move to choose, the player uses the one off cooldown first
+    player = pl.Player(1, [ai], 12)
+    assert player.__calculateMove__(opponent)[0] == 3
+    assert player.search.best_move == -2
+
+
+def test_state_values():
+    ai, opponent = battle_state(0, 1)
+    ahead = pl.evaluate_state(ai, opponent)
+    ai.health = ai.c.health
+    assert pl.evaluate_state(ai, opponent) > ahead
+
+    # a faint is worth more than the health it took
+    opponent.health = 1
+    alive = pl.evaluate_state(ai, opponent)
+    opponent.health = 0
+    assert pl.evaluate_state(ai, opponent) == pytest.approx(600 * (1 - 0) + 300)
+    assert pl.evaluate_state(ai, opponent) > alive
+    ai.health, opponent.health = 0, opponent.c.health
+    assert pl.evaluate_state(ai, opponent) == pytest.approx(-600 - 300)
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import scripts.creatures as cr
+import scripts.montecarlo as mc
+
+
+# attacker and defender of a move, with statuses changing the aim, damage and thorns of it
+def duel(attacker_index: int, defender_index: int, thorns: str) -> (cr.CreatureOccurrence, cr.CreatureOccurrence):
+    attacker = cr.CreatureOccurrence(cr.all_creatures[attacker_index])
+    defender = cr.CreatureOccurrence(cr.all_creatures[defender_index])
+    attacker.health -= 20
+    attacker.active_statuses.append(cr.StatusOccurrence(cr.all_status_effects["MAGIC SHIELD"]))
+    attacker.active_statuses.append(cr.StatusOccurrence(cr.all_status_effects["TRIPPED"]))
+    defender.health = 12
+    defender.active_statuses.append(cr.StatusOccurrence(cr.all_status_effects[thorns]))
+    return attacker, defender
+
+
+# the move made by __makeMove__ over and over, as (target's health, status applied, attacker's health lost) per trial
+# applied holds the creatures __applyStatus__ was called on
+def made_moves(attacker: cr.CreatureOccurrence, defender: cr.CreatureOccurrence, move: cr.Move,
+               trials: int, seed: int, applied: list) -> list[(int, bool, int), ...]:
+    rng = random.Random(seed)
+    results = []
+    for i in range(trials):
+        made_attacker, made_defender = attacker.__clone__(), defender.__clone__()
+        made_attacker.rng = rng
+        target = made_attacker if move.target_self else made_defender
+        applied.clear()
+        made_attacker.__makeMove__(made_defender, move)
+        results.append((target.health, target in applied, attacker.health - made_attacker.health))
+    return results
+
+
+@pytest.mark.parametrize("attacker_index, defender_index, thorns",
+                         [(0, 1, "ELECTRIC FORTIFICATION"), (1, 2, "VAMPIRIC PHEROMONES"),
+                          (2, 3, "ELECTRIC FORTIFICATION"), (3, 4, "VAMPIRIC PHEROMONES"),
+                          (4, 0, "ELECTRIC FORTIFICATION")])
+def test_resolved_move_matches_made_moves(attacker_index, defender_index, thorns, monkeypatch):
+    # statuses are counted instead of applied, like resolve_move does it
+    applied = []
+    monkeypatch.setattr(cr.CreatureOccurrence, "__applyStatus__", lambda co, se: applied.append(co))
+    trials = 4000
+    attacker, defender = duel(attacker_index, defender_index, thorns)
+    for move in attacker.c.moves:
+        resolved = mc.resolve_move(attacker, defender, move, trials=100000, seed=1)
+        made = made_moves(attacker, defender, move, trials, 1, applied)
+        health = np.array([result[0] for result in made])
+
+        # frequencies of a few thousand moves are within a few standard errors of the resolved ones
+        def close(frequency: float, chance: float):
+            assert abs(frequency - chance) <= 5 * max(chance * (1 - chance), 0.01) ** 0.5 / trials ** 0.5
+
+        close((health <= 0).mean(), resolved.__killChance__())
+        close(np.mean([result[1] for result in made]), resolved.__statusChance__())
+        spread = max(float(resolved.target_health.std()), 1.0)
+        assert abs(health.mean() - resolved.target_health.mean()) <= 5 * spread / trials ** 0.5
+        if not move.target_self:
+            lost = np.array([result[2] for result in made])
+            spread = max(float(resolved.thorn_damage.std()), 1.0)
+            assert abs(lost.mean() - resolved.thorn_damage.mean()) <= 5 * spread / trials ** 0.5
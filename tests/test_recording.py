@@ -0,0 +1,72 @@
+import pytest
+
+import scripts.recording as rec
+import scripts.simulation as sim
+
+
+def record_fields(record: rec.MatchRecord) -> tuple:
+    return record.seed, record.creatures, record.ai, record.turns, record.outcomes, record.winner
+
+
+# matches of different rosters and ai levels, recorded with and without outcomes
+def recorded_matches() -> list[rec.MatchRecord, ...]:
+    records = []
+    for seed, p1_creatures, p2_creatures, p1_ai, p2_ai in ((1, [0], [1], 5, 5), (2, [0, 1, 2], [3, 4], 0, 10),
+                                                            (3, [4, 3], [2], 8, 3)):
+        engine, winner = sim.play_match(seed, p1_creatures, p2_creatures, p1_ai, p2_ai)
+        records.append(rec.record_match(engine, outcomes=seed != 3))
+    return records
+
+
+def test_replay_file_round_trip(tmp_path):
+    path = str(tmp_path / "matches.rpl")
+    records = recorded_matches()
+    with rec.ReplayWriter(path) as writer:
+        writer.__write__(records[0])
+    # a second writer appends without another header
+    with rec.ReplayWriter(path) as writer:
+        writer.__write__(records[1])
+        writer.__writePacked__(records[2].__pack__(), 1)
+
+    replays = rec.ReplayFile(path)
+    try:
+        assert len(replays) == 3
+        assert [record_fields(record) for record in replays] == [record_fields(record) for record in records]
+        assert record_fields(replays.__getMatch__(2)) == record_fields(records[2])
+        assert replays.__getMatch__(2).outcomes is None
+        for (offset, seed, ai, winner, turns), record in zip(replays.__scan__(), records):
+            assert (seed, list(ai), winner, turns) == (record.seed, record.ai, record.winner, len(record.turns))
+    finally:
+        replays.__close__()
+
+
+def test_replay_plays_the_same_battle():
+    for record in recorded_matches():
+        engine = rec.replay_match(record)
+        assert [turn[:6] for turn in engine.history] == record.turns
+        assert engine.__winner__() == record.winner
+
+
+def test_replay_differing_from_record_is_an_error():
+    record = recorded_matches()[0]
+    health = record.outcomes[0]
+    record.outcomes[0] = (health[0] + 1, health[1])
+    with pytest.raises(ValueError):
+        rec.replay_match(record)
+
+
+def test_simulation_records_like_writer():
+    result = sim.simulate_chunk(10, 4, [0, 1], [2], 5, 3, record=True)
+    packed = b"".join(rec.record_match(sim.play_match(seed, [0, 1], [2], 5, 3)[0]).__pack__()
+                      for seed in range(10, 14))
+    assert result.replays == packed
+
+
+def test_not_a_replay_file(tmp_path):
+    path = tmp_path / "other.rpl"
+    path.write_bytes(b"PCAC" + bytes(40))
+    with pytest.raises(ValueError):
+        rec.ReplayFile(str(path))
+    path.write_bytes(b"PC")
+    with pytest.raises(ValueError):
+        rec.ReplayFile(str(path))
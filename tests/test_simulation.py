@@ -0,0 +1,30 @@
+import pytest
+
+import scripts.simulation as sim
+
+
+def test_results_dont_depend_on_workers(tmp_path):
+    serial_path = str(tmp_path / "serial.rpl")
+    parallel_path = str(tmp_path / "parallel.rpl")
+    serial = sim.simulate(60, [0, -1], [-1, 3], 4, 6, seed=5, workers=1, chunk_size=7, record_path=serial_path)
+    parallel = sim.simulate(60, [0, -1], [-1, 3], 4, 6, seed=5, workers=3, chunk_size=13, record_path=parallel_path)
+
+    assert serial.matches == 60
+    assert parallel.__report__() == serial.__report__()
+    with open(serial_path, "rb") as f, open(parallel_path, "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_match_is_played_by_its_seed_alone():
+    first = sim.simulate_chunk(20, 5, [-1, -1], [-1], 2, 9)
+    again = sim.SimulationResult()
+    for seed in (22, 20, 24, 21, 23):
+        engine, winner = sim.play_match(seed, [-1, -1], [-1], 2, 9)
+        again.__addMatch__(engine, winner)
+    # move usage is compared as dicts, ties of the report's order depend on which match came first
+    assert vars(again) == vars(first)
+
+
+def test_human_players_cant_be_simulated():
+    with pytest.raises(ValueError):
+        sim.simulate(10, [0], [1], -1, 5)